@@ -0,0 +1,58 @@
+"""
+Derived label columns: the old row-wise Series.apply / pd.cut versions vs
+the vectorized np.select / np.searchsorted Categorical builders.
+
+    python -m benchmarks.bench_labels --rows 10000000
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from src.etl.transform import _quality_label
+from src.features.feature_engineering import PHBucket
+
+
+def _quality_label_apply(quality: pd.Series):
+    return quality.apply(lambda q: "low" if q <= 4 else ("high" if q >= 7 else "medium"))
+
+
+def _ph_bucket_cut(df: pd.DataFrame):
+    return pd.cut(df["pH"], bins=[0, 3, 3.5, 4, 10], labels=["very_acidic", "acidic", "neutral", "basic"])
+
+
+def _timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=10_000_000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    df = pd.DataFrame({
+        "quality": np.clip(rng.normal(5.8, 0.9, args.rows).round(), 3, 9).astype("int64"),
+        "pH": np.abs(rng.normal(3.22, 0.16, args.rows)),
+    })
+
+    t_old, old = _timed(_quality_label_apply, df["quality"])
+    t_new, new = _timed(_quality_label, df["quality"])
+    assert (new.astype(str) == old).all()
+    print(
+        f"quality_label  apply: {t_old:7.3f} s ({old.memory_usage(deep=True) / 2**20:7.1f} MiB)   "
+        f"np.select: {t_new:7.3f} s ({new.memory_usage(deep=True) / 2**20:7.1f} MiB)   ({t_old / t_new:5.1f}x)"
+    )
+
+    t_old, old = _timed(_ph_bucket_cut, df)
+    t_new, new = _timed(lambda d: PHBucket().transform(d, inplace=True)["pH_bucket"], df)
+    pd.testing.assert_series_equal(new, old, check_names=False)
+    print(f"pH_bucket      pd.cut: {t_old:7.3f} s   np.searchsorted: {t_new:7.3f} s   ({t_old / t_new:5.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,38 @@
+"""
+Per-request cost of the fitted ETL pipeline: NumPy array path
+(Pipeline.transform_arrays) vs building a one-row DataFrame.
+
+    python -m benchmarks.bench_online_transform
+"""
+import argparse
+import timeit
+
+import pandas as pd
+
+from benchmarks.synthetic import generate_wine
+from src.etl.transform import FeatureEngineering, ImputeMedian, Pipeline, RemoveOutliersIQR
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, nargs="+", default=[1, 16])
+    parser.add_argument("--number", type=int, default=2000)
+    args = parser.parse_args()
+
+    train = generate_wine(50_000)
+    cols = [c for c in train.columns if c not in ("type", "quality")]
+    pipe = Pipeline([ImputeMedian(cols=cols), RemoveOutliersIQR(cols=cols), FeatureEngineering()])
+    pipe.fit(train)
+
+    for n in args.rows:
+        batch = generate_wine(n, seed=1).drop(columns=["quality"])
+        arrays = {c: batch[c].to_numpy() for c in batch.columns}
+        records = batch.to_dict(orient="list")
+
+        t_arr = timeit.timeit(lambda: pipe.transform_arrays(arrays), number=args.number) / args.number
+        t_df = timeit.timeit(lambda: pipe.transform(pd.DataFrame(records)), number=args.number // 10) / (args.number // 10)
+        print(f"rows={n:4d}  arrays: {t_arr * 1e6:8.1f} us   DataFrame: {t_df * 1e6:8.1f} us   ({t_df / t_arr:5.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
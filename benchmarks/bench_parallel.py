@@ -0,0 +1,77 @@
+"""
+Scaling of the parallel executor from 1 to N workers: per-column IQR
+quantiles + range violations (map_columns) and per-chunk pipeline
+transforms (map_chunks), for the thread and process backends. Every run
+is checked against the serial result.
+
+    python -m benchmarks.bench_parallel --rows 2000000 --max-workers 8
+"""
+import argparse
+import os
+import time
+
+import numpy as np
+
+from benchmarks.synthetic import generate_wine
+from src.etl.transform import FeatureEngineering, ImputeMedian, Pipeline, RemoveOutliersIQR
+from src.utils.parallel import count_outside, map_chunks, map_columns, nan_quantiles, shutdown_pools
+
+
+def _column_stats(df, cols, **kw):
+    q = map_columns(nan_quantiles, df, cols, [0.25, 0.75], **kw)
+    ranges = {c: (q1 - 3 * (q3 - q1), q3 + 3 * (q3 - q1)) for c, (q1, q3) in q.items()}
+    counts = map_columns(count_outside, df, cols, per_column=ranges, **kw)
+    return q, counts
+
+
+def _chunk_transform(pipe, chunks, **kw):
+    return sum(len(out) for out in map_chunks(pipe.transform, chunks, **kw))
+
+
+def _best(fn, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - start)
+    return min(times), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=2_000_000)
+    parser.add_argument("--chunksize", type=int, default=100_000)
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count())
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    os.environ["ETL__PARALLEL__MIN_ROWS"] = "0"
+
+    df = generate_wine(args.rows)
+    cols = [c for c in df.columns if c not in ("type", "quality")]
+    chunks = [df.iloc[i:i + args.chunksize] for i in range(0, len(df), args.chunksize)]
+    pipe = Pipeline([ImputeMedian(cols=cols), RemoveOutliersIQR(cols=cols), FeatureEngineering()])
+    pipe.fit(df)
+
+    t_stats, expected = _best(lambda: _column_stats(df, cols, backend="serial"), args.repeat)
+    t_chunks, _ = _best(lambda: _chunk_transform(pipe, chunks, backend="serial"), args.repeat)
+    print(f"cpus={os.cpu_count()}  rows={args.rows}  cols={len(cols)}  chunks={len(chunks)}")
+    print(f"{'serial':>8} {1:3d}  column stats {t_stats:7.3f} s          chunk transform {t_chunks:7.3f} s")
+
+    for backend in ("thread", "process"):
+        for workers in range(1, args.max_workers + 1):
+            kw = dict(backend=backend, workers=workers)
+            # Warm the pool so worker start-up is not timed
+            _column_stats(df.head(1000), cols, **kw)
+            t_s, result = _best(lambda: _column_stats(df, cols, **kw), args.repeat)
+            t_c, _ = _best(lambda: _chunk_transform(pipe, chunks, **kw), args.repeat)
+            assert all(np.array_equal(result[0][c], expected[0][c]) for c in cols)
+            assert result[1] == expected[1]
+            print(
+                f"{backend:>8} {workers:3d}  column stats {t_s:7.3f} s ({t_stats / t_s:4.1f}x)  "
+                f"chunk transform {t_c:7.3f} s ({t_chunks / t_c:4.1f}x)"
+            )
+    shutdown_pools()
+
+
+if __name__ == "__main__":
+    main()
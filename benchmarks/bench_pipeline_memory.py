@@ -0,0 +1,65 @@
+"""
+Peak-RSS of run_pipeline() with copying vs in-place steps.
+
+    python -m benchmarks.bench_pipeline_memory --rows 2000000
+
+Each mode runs in a fresh subprocess so ru_maxrss is not shared.
+"""
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+from benchmarks.synthetic import write_wine_csv
+
+
+def _child(raw: str, out: str, inplace: bool):
+    # Measure the computation, not the on-disk cache or the saved artifact
+    os.environ["ETL__PIPELINE__ARTIFACT_PATH"] = "null"
+    from src.etl.pipeline import run_pipeline
+
+    run_pipeline(raw_path=raw, processed_path=out, inplace=inplace, use_cache=False)
+    # ru_maxrss is in KiB on Linux
+    peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(json.dumps({"inplace": inplace, "peak_rss_mb": round(peak_mb, 1)}))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--raw")
+    parser.add_argument("--out")
+    parser.add_argument("--inplace", type=int, default=1)
+    args = parser.parse_args()
+
+    if args.child:
+        _child(args.raw, args.out, bool(args.inplace))
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        raw = Path(tmp) / "wine.csv"
+        write_wine_csv(raw, args.rows)
+
+        results = {}
+        for inplace in (0, 1):
+            proc = subprocess.run(
+                [sys.executable, "-m", "benchmarks.bench_pipeline_memory", "--child",
+                 "--raw", str(raw), "--out", str(Path(tmp) / "out.csv"), "--inplace", str(inplace)],
+                check=True, capture_output=True, text=True,
+            )
+            results[inplace] = json.loads(proc.stdout.strip().splitlines()[-1])["peak_rss_mb"]
+
+    copy_mb, inplace_mb = results[0], results[1]
+    print(f"rows={args.rows}")
+    print(f"copying steps : {copy_mb:8.1f} MB peak RSS")
+    print(f"in-place steps: {inplace_mb:8.1f} MB peak RSS")
+    print(f"reduction     : {copy_mb - inplace_mb:8.1f} MB ({100 * (1 - inplace_mb / copy_mb):.1f}%)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+Load test for /predict: micro-batched vs one predict call per request.
+
+    python -m benchmarks.bench_predict_load --requests 2000 --concurrency 64
+
+Requests go through the ASGI app in-process (httpx ASGITransport), so the
+numbers measure server-side cost without network noise. The model is a
+RandomForestRegressor with the config/train.yaml hyperparameters, fitted on
+synthetic wine features unless --model points at a trained artifact.
+"""
+import argparse
+import asyncio
+import time
+
+import httpx
+import numpy as np
+
+from benchmarks.synthetic import generate_wine
+from src.api.app import app
+from src.models.model_loader import load_model, load_train_config
+from src.utils.config import load_config
+
+FEATURES = ["fixed acidity", "volatile acidity", "residual sugar", "pH", "sulphates", "alcohol"]
+
+
+def _fit_model():
+    from sklearn.ensemble import RandomForestRegressor
+
+    training = load_train_config().get("training", {})
+    df = generate_wine(20_000).dropna()
+    return RandomForestRegressor(
+        n_estimators=training.get("n_estimators", 300),
+        max_depth=training.get("max_depth", 12),
+        n_jobs=1,
+        random_state=0,
+    ).fit(df[FEATURES], df["quality"])
+
+
+async def _run(model, micro_batching: bool, n_requests: int, concurrency: int):
+    payloads = generate_wine(n_requests, seed=1).fillna(0)[FEATURES].to_dict(orient="records")
+    latencies = []
+    sem = asyncio.Semaphore(concurrency)
+
+    async with app.router.lifespan_context(app):
+        app.state.model = model
+        if not micro_batching and app.state.batcher is not None:
+            await app.state.batcher.stop()
+            app.state.batcher = None
+
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            async def one(payload):
+                async with sem:
+                    t = time.perf_counter()
+                    r = await client.post("/predict", json={"features": payload})
+                    r.raise_for_status()
+                    latencies.append(time.perf_counter() - t)
+
+            start = time.perf_counter()
+            await asyncio.gather(*(one(p) for p in payloads))
+            elapsed = time.perf_counter() - start
+
+    ms = np.array(latencies) * 1000
+    return {
+        "p50_ms": float(np.percentile(ms, 50)),
+        "p99_ms": float(np.percentile(ms, 99)),
+        "rps": n_requests / elapsed,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--model", help="path to a trained joblib model")
+    args = parser.parse_args()
+
+    model = load_model(args.model) if args.model else _fit_model()
+    serving = load_config().serving
+    print(f"requests={args.requests} concurrency={args.concurrency} "
+          f"max_batch_size={serving.max_batch_size} max_wait_ms={serving.max_wait_ms}")
+
+    for label, micro_batching in (("one-at-a-time", False), ("micro-batched", True)):
+        res = asyncio.run(_run(model, micro_batching, args.requests, args.concurrency))
+        print(f"{label:14s} p50={res['p50_ms']:8.2f} ms  p99={res['p99_ms']:8.2f} ms  throughput={res['rps']:8.1f} req/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""
+Startup cost of the ETL package: import time of src.etl.pipeline, how many
+times config.yaml is parsed during that import, and per-call cost of
+load_config() with and without the cache.
+
+    python -m benchmarks.bench_startup
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import timeit
+
+_CHILD = """
+import json, time, yaml
+parses = 0
+_safe_load = yaml.safe_load
+def counting_safe_load(*args, **kwargs):
+    global parses
+    parses += 1
+    return _safe_load(*args, **kwargs)
+yaml.safe_load = counting_safe_load
+t = time.perf_counter()
+import src.etl.pipeline
+print(json.dumps({"import_s": time.perf_counter() - t, "yaml_parses": parses}))
+"""
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    runs = []
+    for _ in range(args.repeat):
+        proc = subprocess.run([sys.executable, "-c", _CHILD], check=True, capture_output=True, text=True)
+        runs.append(json.loads(proc.stdout.strip().splitlines()[-1]))
+
+    from src.utils.config import load_config, reload_config
+
+    load_config()
+    n = 10_000
+    cached_us = timeit.timeit(load_config, number=n) / n * 1e6
+    uncached_us = timeit.timeit(reload_config, number=200) / 200 * 1e6
+
+    print(f"import src.etl.pipeline : {statistics.median(r['import_s'] for r in runs) * 1000:8.1f} ms (median of {args.repeat})")
+    print(f"config.yaml parses      : {runs[0]['yaml_parses']:8d}")
+    print(f"load_config() cached    : {cached_us:8.2f} us/call")
+    print(f"load_config() reload    : {uncached_us:8.2f} us/call")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Compare two results files written by benchmarks.run_benchmarks.
+
+    python -m benchmarks.compare benchmarks/results/<old>.json benchmarks/results/<new>.json
+
+A case regresses when its best time grows by more than --threshold (and
+by more than --min-seconds, so millisecond noise is ignored). The exit
+status is 1 if any case regressed, so the script can gate CI.
+"""
+import argparse
+import json
+import sys
+
+
+def _index(path):
+    with open(path) as f:
+        data = json.load(f)
+    return data["meta"], {(r["name"], r["rows"]): r for r in data["results"]}
+
+
+def compare(base: dict, new: dict, threshold: float = 0.10, min_seconds: float = 0.005):
+    """Rows of (name, rows, base, new, time ratio, status) for cases in both runs."""
+    rows = []
+    for key in base:
+        if key not in new:
+            continue
+        b, n = base[key], new[key]
+        ratio = n["best_s"] / b["best_s"] if b["best_s"] else float("inf")
+        delta = n["best_s"] - b["best_s"]
+        if ratio > 1 + threshold and delta > min_seconds:
+            status = "REGRESSED"
+        elif ratio < 1 / (1 + threshold) and -delta > min_seconds:
+            status = "improved"
+        else:
+            status = ""
+        rows.append((*key, b, n, ratio, status))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("base")
+    parser.add_argument("new")
+    parser.add_argument("--threshold", type=float, default=0.10, help="allowed relative slowdown")
+    parser.add_argument("--min-seconds", type=float, default=0.005)
+    args = parser.parse_args()
+
+    base_meta, base = _index(args.base)
+    new_meta, new = _index(args.new)
+    print(f"base {base_meta['commit']} ({base_meta['timestamp']})  ->  new {new_meta['commit']} ({new_meta['timestamp']})")
+    if base_meta.get("cpus") != new_meta.get("cpus"):
+        print(f"warning: runs used different machines ({base_meta.get('cpus')} vs {new_meta.get('cpus')} cpus)")
+
+    rows = compare(base, new, args.threshold, args.min_seconds)
+    print(f"{'case':<42} {'rows':>11}  {'base s':>9} {'new s':>9} {'ratio':>6}  {'base MiB':>9} {'new MiB':>9}")
+    for name, n_rows, b, n, ratio, status in rows:
+        print(
+            f"{name:<42} {n_rows:>11,}  {b['best_s']:9.4f} {n['best_s']:9.4f} {ratio:6.2f}  "
+            f"{b['peak_alloc_mb']:9.1f} {n['peak_alloc_mb']:9.1f}  {status}"
+        )
+    for key in sorted(set(base) ^ set(new)):
+        print(f"{key[0]:<42} {key[1]:>11,}  only in {'base' if key in base else 'new'}")
+
+    regressed = [r for r in rows if r[-1] == "REGRESSED"]
+    if regressed:
+        print(f"{len(regressed)} case(s) regressed by more than {args.threshold:.0%}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
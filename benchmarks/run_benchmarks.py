@@ -0,0 +1,178 @@
+"""
+Time and memory baseline for the ETL hot paths on synthetic wine data:
+extract, the validation functions, fit and transform of each pipeline
+step, load in every output format, and the full run_pipeline().
+
+    python -m benchmarks.run_benchmarks --rows 1M,10M --repeat 3
+    python -m benchmarks.compare benchmarks/results/<old>.json benchmarks/results/<new>.json
+
+Each case is timed `repeat` times (best and mean wall time), then run once
+more under tracemalloc for the peak of NumPy/Python allocations. Arrow's
+own memory pool is not traced. Inputs are prepared outside the timed
+region. Results go to benchmarks/results/<commit>.json by default.
+Generated CSVs are kept in --data-dir and reused across runs.
+"""
+import argparse
+import json
+import logging
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.synthetic import cached_wine_csv, parse_rows
+from src.etl.extract import extract
+from src.etl.load import load
+from src.etl.pipeline import _build_pipeline, _numeric_cols, run_pipeline
+from src.utils.config import clear_config_cache, load_config
+from src.utils.validation import (
+    compute_iqr_ranges,
+    validate_frame,
+    validate_numeric_ranges,
+    validate_required_columns,
+)
+
+ROOT = Path(__file__).resolve().parent.parent
+LOAD_FORMATS = ("csv", "parquet", "feather", "npy")
+
+
+def _measure(fn, repeat: int):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {
+        "best_s": round(min(times), 6),
+        "mean_s": round(sum(times) / len(times), 6),
+        "runs": len(times),
+        "peak_alloc_mb": round(peak / 2 ** 20, 2),
+    }
+
+
+def _cases(raw: Path, out_dir: Path):
+    """Yield (name, fn) pairs; the frames they use are built here, untimed."""
+    cfg = load_config()
+    k = cfg.pipeline.outlier_k
+
+    yield "extract", lambda: extract(str(raw))
+
+    df = extract(str(raw))
+    cols = _numeric_cols(df)
+    ranges = compute_iqr_ranges(df, cols, k)
+
+    # Frames are bound as defaults, not closed over, so the `del` below
+    # only drops this generator's references
+    yield "validation.validate_required_columns", lambda df=df: validate_required_columns(
+        df, cfg.validation.required_columns
+    )
+    yield "validation.compute_iqr_ranges", lambda df=df: compute_iqr_ranges(df, cols, k)
+    yield "validation.validate_numeric_ranges", lambda df=df: validate_numeric_ranges(
+        df, ranges, max_allowed_violations=len(df)
+    )
+    yield "validation.validate_frame", lambda df=df: validate_frame(
+        df, cfg.validation.required_columns, cols, k, max_allowed_violations=len(df)
+    )
+
+    # Each step is timed on the output of the steps before it
+    frame = df
+    for step in _build_pipeline(cols, k).steps:
+        name = type(step).__name__
+        yield f"transform.{name}.fit", lambda step=step, frame=frame: step.fit(frame)
+        step.fit(frame)
+        yield f"transform.{name}.transform", lambda step=step, frame=frame: step.transform(frame)
+        frame = step.transform(frame)
+    processed = frame
+
+    for fmt in LOAD_FORMATS:
+        path = out_dir / f"processed.{fmt}"
+        yield f"load.{fmt}", lambda fmt=fmt, path=path, processed=processed: load(
+            processed, str(path), fmt=fmt, partition_by=()
+        )
+
+    del df, frame, processed
+    yield "run_pipeline", lambda: run_pipeline(
+        raw_path=str(raw), processed_path=str(out_dir / "pipeline.csv"), use_cache=False
+    )
+
+
+def _git_commit():
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, check=True, capture_output=True, text=True
+        )
+        return out.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def _meta(args):
+    return {
+        "commit": _git_commit(),
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "parallel_backend": load_config().parallel.backend,
+        "repeat": args.repeat,
+        "seed": args.seed,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", default="1M", help="comma-separated sizes, e.g. 1M,10M,50M")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--only", help="run only cases whose name contains this string")
+    parser.add_argument("--data-dir", default=str(ROOT / ".cache" / "bench"))
+    parser.add_argument("--out", help="results JSON (default benchmarks/results/<commit>.json)")
+    args = parser.parse_args()
+
+    # Measure the computation, not the on-disk cache or the saved artifact
+    os.environ["ETL__CACHE__ENABLED"] = "false"
+    os.environ["ETL__PIPELINE__ARTIFACT_PATH"] = "null"
+    clear_config_cache()
+    logging.disable(logging.INFO)
+
+    meta = _meta(args)
+    results = []
+    for n_rows in (parse_rows(r) for r in args.rows.split(",")):
+        raw = cached_wine_csv(args.data_dir, n_rows, seed=args.seed)
+        with tempfile.TemporaryDirectory() as tmp:
+            for name, fn in _cases(raw, Path(tmp)):
+                if args.only and args.only not in name:
+                    continue
+                result = {"name": name, "rows": n_rows, **_measure(fn, args.repeat)}
+                results.append(result)
+                print(
+                    f"{name:<42} {n_rows:>11,} rows  best {result['best_s']:9.4f} s  "
+                    f"mean {result['mean_s']:9.4f} s  peak {result['peak_alloc_mb']:9.1f} MiB",
+                    flush=True,
+                )
+
+    out = Path(args.out) if args.out else ROOT / "benchmarks" / "results" / f"{meta['commit']}.json"
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps({"meta": meta, "results": results}, indent=2))
+    print(f"Wrote {len(results)} results to {out}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
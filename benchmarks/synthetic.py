@@ -0,0 +1,86 @@
+"""
+Synthetic data shaped like winequalityN.csv, for benchmarks.
+
+    python -m benchmarks.synthetic --rows 10M --out data/raw/wine_10m.csv
+"""
+import argparse
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# (mean, std) per feature, roughly matching the public wine quality dataset
+WINE_FEATURES = {
+    "fixed acidity": (7.2, 1.3),
+    "volatile acidity": (0.34, 0.16),
+    "citric acid": (0.32, 0.15),
+    "residual sugar": (5.4, 4.8),
+    "chlorides": (0.056, 0.035),
+    "free sulfur dioxide": (30.5, 17.7),
+    "total sulfur dioxide": (115.7, 56.5),
+    "density": (0.9947, 0.003),
+    "pH": (3.22, 0.16),
+    "sulphates": (0.53, 0.15),
+    "alcohol": (10.5, 1.2),
+}
+
+
+def generate_wine(n_rows: int, seed: int = 0, null_rate: float = 0.001):
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({"type": rng.choice(["white", "red"], n_rows, p=[0.75, 0.25])})
+    for col, (mean, std) in WINE_FEATURES.items():
+        values = np.abs(rng.normal(mean, std, n_rows)).round(4)
+        values[rng.random(n_rows) < null_rate] = np.nan
+        df[col] = values
+    df["quality"] = np.clip(rng.normal(5.8, 0.9, n_rows).round(), 3, 9).astype("int64")
+    return df
+
+
+def write_wine_csv(path, n_rows: int, seed: int = 0, chunk_rows: int = 1_000_000):
+    """Write `n_rows` synthetic rows to `path` without holding them all in memory."""
+    written = 0
+    chunk = 0
+    while written < n_rows:
+        n = min(chunk_rows, n_rows - written)
+        generate_wine(n, seed=seed + chunk).to_csv(
+            path, mode="w" if chunk == 0 else "a", header=chunk == 0, index=False
+        )
+        written += n
+        chunk += 1
+    return path
+
+
+_UNITS = {"k": 1_000, "m": 1_000_000, "b": 1_000_000_000}
+
+
+def parse_rows(value: str):
+    """'50000', '500k', '10M' -> number of rows."""
+    value = str(value).strip().lower().replace("_", "")
+    if value[-1:] in _UNITS:
+        return int(float(value[:-1]) * _UNITS[value[-1]])
+    return int(value)
+
+
+def cached_wine_csv(data_dir, n_rows: int, seed: int = 0):
+    """Path of a synthetic CSV with `n_rows` rows in `data_dir`, generated on first use."""
+    path = Path(data_dir) / f"wine_{n_rows}_{seed}.csv"
+    if not path.exists():
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f".{path.name}.tmp")
+        write_wine_csv(tmp, n_rows, seed=seed)
+        tmp.replace(path)
+    return path
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=parse_rows, default=1_000_000, help="e.g. 1M, 10M, 50M")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", required=True)
+    args = parser.parse_args()
+    write_wine_csv(args.out, args.rows, seed=args.seed)
+    print(f"Wrote {args.rows} rows to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,17 +1,143 @@
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+from typing import Dict, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+from fastapi import FastAPI, HTTPException
 from pydantic import BaseModel
+from starlette.concurrency import run_in_threadpool
+
+from ..models.model_loader import load_model, load_pipeline
+from ..utils.config import load_config
+from ..utils.logger import get_logger
+from .batching import MicroBatcher
+
+logger = get_logger(__name__)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Load the model once per worker, not per request
+    try:
+        app.state.model = load_model()
+    except FileNotFoundError as e:
+        logger.warning(f"Serving without a model: {e}")
+        app.state.model = None
+    try:
+        app.state.pipeline = load_pipeline()
+    except FileNotFoundError as e:
+        logger.warning(f"Serving without the ETL pipeline (features must be pre-computed): {e}")
+        app.state.pipeline = None
+
+    serving = load_config().serving
+    app.state.batcher = None
+    if serving.micro_batching:
+        # Looks the model up per batch so a reloaded model is picked up
+        app.state.batcher = await MicroBatcher(
+            lambda X: _predict(app.state.model, X),
+            max_batch_size=serving.max_batch_size,
+            max_wait_ms=serving.max_wait_ms,
+            n_features=lambda: getattr(app.state.model, "n_features_in_", None),
+        ).start()
+    yield
+    if app.state.batcher is not None:
+        await app.state.batcher.stop()
+
+
+app = FastAPI(lifespan=lifespan)
+
+
+Value = Optional[Union[float, str]]
+
+
+class Features(BaseModel):
+    """One raw row: column name -> value (null is imputed)."""
+    features: Dict[str, Value]
+
+
+class BatchFeatures(BaseModel):
+    """Columnar batch: column name -> one value per row."""
+    columns: Dict[str, List[Value]]
 
-app = FastAPI()
 
-class Item(BaseModel):
-    name: str
-    value: float
+def _get_model():
+    model = getattr(app.state, "model", None)
+    if model is None:
+        raise HTTPException(status_code=503, detail="Model not loaded")
+    return model
+
+
+def _to_arrays(columns: Dict[str, list]):
+    arrays = {}
+    for name, values in columns.items():
+        if any(isinstance(v, str) for v in values):
+            arrays[name] = np.asarray(values, dtype=object)
+        else:
+            # None -> NaN, so the fitted imputer fills it
+            arrays[name] = np.asarray(values, dtype=float)
+    return arrays
+
+
+def _features(model, columns: Dict[str, list]):
+    """Raw request columns -> model matrix, through the fitted ETL pipeline if loaded."""
+    arrays = _to_arrays(columns)
+    pipeline = getattr(app.state, "pipeline", None)
+    if pipeline is not None:
+        arrays = pipeline.transform_arrays(arrays)
+    return _to_matrix(model, arrays, pipeline)
+
+
+def _feature_names(model, columns: Dict[str, np.ndarray], pipeline=None):
+    """Training column order: the model's feature names, else the fitted pipeline's output order."""
+    names = getattr(model, "feature_names_in_", None)
+    if names is not None:
+        return list(names)
+    fitted = getattr(pipeline, "columns", None)
+    if fitted is None:
+        raise HTTPException(
+            status_code=503, detail="Feature order unknown: model has no feature names and no fitted pipeline"
+        )
+    return [n for n in fitted if n in columns]
+
+
+def _to_matrix(model, columns: Dict[str, np.ndarray], pipeline=None):
+    """Stack columns into a 2-D float array in the order the model was trained on."""
+    names = _feature_names(model, columns, pipeline)
+    missing = [n for n in names if n not in columns]
+    if missing:
+        raise HTTPException(status_code=422, detail=f"Missing features: {missing}")
+    lengths = {len(columns[n]) for n in names}
+    if len(lengths) > 1:
+        raise HTTPException(status_code=422, detail="All feature columns must have the same length")
+    return np.column_stack([np.asarray(columns[n], dtype=float) for n in names])
+
+
+def _predict(model, X: np.ndarray):
+    """predict() on a frame named like the training data, so sklearn can check the names."""
+    names = getattr(model, "feature_names_in_", None)
+    if names is not None:
+        X = pd.DataFrame(X, columns=names, copy=False)
+    return model.predict(X)
+
 
 @app.get("/")
 def root():
     return {"status": "ok"}
 
+
 @app.post("/predict")
-def predict(item: Item):
-    # Fake prediction for testing
-    return {"result": item.value * 2}
+async def predict(item: Features):
+    model = _get_model()
+    X = _features(model, {k: [v] for k, v in item.features.items()})
+    batcher = getattr(app.state, "batcher", None)
+    if batcher is not None:
+        return {"prediction": float(await batcher.submit(X[0]))}
+    return {"prediction": float((await run_in_threadpool(_predict, model, X))[0])}
+
+
+@app.post("/predict/batch")
+def predict_batch(batch: BatchFeatures):
+    model = _get_model()
+    X = _features(model, batch.columns)
+    # One vectorized predict for the whole batch
+    return {"predictions": _predict(model, X).tolist()}
@@ -0,0 +1,94 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from ..utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class MicroBatcher:
+    """
+    Collects concurrent single-row requests and answers them with one
+    batched call. A batch is flushed when it reaches `max_batch_size` rows
+    or `max_wait_ms` after its first row arrived, whichever comes first.
+    Inference runs in a thread pool so the event loop keeps accepting requests.
+    `n_features` (an int, or a callable returning one for a reloadable
+    model) is the row width checked in submit(), so a malformed row fails
+    only its own request.
+    """
+
+    def __init__(self, predict_fn, max_batch_size: int = 64, max_wait_ms: float = 2.0, workers: int = 1,
+                 n_features=None):
+        self.predict_fn = predict_fn
+        self.n_features = n_features
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="predict")
+        self._queue = None
+        self._task = None
+
+    async def start(self):
+        self._queue = asyncio.Queue()
+        self._task = asyncio.create_task(self._run())
+        return self
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._executor.shutdown(wait=False)
+
+    def _check_row(self, row):
+        row = np.asarray(row)
+        if row.ndim != 1 or row.dtype.kind not in "biuf":
+            raise ValueError(f"Expected a 1-D numeric row, got shape {row.shape} of {row.dtype}")
+        width = self.n_features() if callable(self.n_features) else self.n_features
+        if width is not None and len(row) != width:
+            raise ValueError(f"Expected {width} features, got {len(row)}")
+        return row.astype(float, copy=False)
+
+    async def submit(self, row: np.ndarray):
+        """Queue one feature row and wait for its prediction."""
+        row = self._check_row(row)
+        fut = asyncio.get_running_loop().create_future()
+        await self._queue.put((row, fut))
+        return await fut
+
+    async def _collect(self):
+        loop = asyncio.get_running_loop()
+        batch = [await self._queue.get()]
+        deadline = loop.time() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = await self._collect()
+            try:
+                # Rows were checked in submit(); anything still wrong fails
+                # this batch, not the loop that serves every later request
+                X = np.vstack([row for row, _ in batch])
+                preds = await loop.run_in_executor(self._executor, self.predict_fn, X)
+            except Exception as e:
+                logger.error(f"Batched predict failed for {len(batch)} rows: {e}")
+                for _, fut in batch:
+                    if not fut.done():
+                        fut.set_exception(e)
+                continue
+            for (_, fut), pred in zip(batch, preds):
+                # The client may have gone away (cancelled future)
+                if not fut.done():
+                    fut.set_result(pred)
@@ -0,0 +1,189 @@
+import hashlib
+import json
+import os
+import pickle
+import shutil
+import sys
+import uuid
+from pathlib import Path
+
+import pandas as pd
+
+from ..utils import helpers, parallel, validation
+from ..utils.config import load_config, resolve_path
+from ..utils.logger import get_logger
+from . import extract
+
+logger = get_logger(__name__)
+
+# ---------------------------------------------------
+# KEYS
+# ---------------------------------------------------
+# A step's key chains the key of its input (the previous step, or the raw
+# file fingerprint for the first step) with the step's class, parameters
+# and the source of the module that defines it. Changing a parameter or
+# the code of one step therefore invalidates that step and everything
+# after it, but not the steps before it. The source key also covers the
+# code every step depends on (reader, validation report, column kernels),
+# so editing it invalidates the whole chain.
+
+_code_hashes = {}
+
+# Read the raw frame, build the ValidationReport steps are fitted from,
+# and run the column kernels behind both
+SOURCE_MODULES = (extract, helpers, validation, parallel)
+
+
+def _digest(*parts):
+    h = hashlib.sha256()
+    for part in parts:
+        h.update(str(part).encode())
+        h.update(b"\0")
+    return h.hexdigest()
+
+
+def _module_hash(module):
+    h = _code_hashes.get(module.__name__)
+    if h is None:
+        h = _code_hashes[module.__name__] = hashlib.sha256(Path(module.__file__).read_bytes()).hexdigest()
+    return h
+
+
+def _code_hash(step):
+    return _module_hash(sys.modules[type(step).__module__])
+
+
+def source_key(path, *extra):
+    """
+    Fingerprint of an input file (path, size, mtime), of the code in
+    SOURCE_MODULES, plus anything in `extra`.
+    """
+    full = Path(path).resolve()
+    st = full.stat()
+    code = [_module_hash(m) for m in SOURCE_MODULES]
+    return _digest("source", full, st.st_size, st.st_mtime_ns, *code, *extra)
+
+
+def step_key(prev_key: str, step):
+    params = step.get_params() if hasattr(step, "get_params") else vars(step)
+    return _digest(
+        prev_key,
+        type(step).__qualname__,
+        json.dumps(params, sort_keys=True, default=repr),
+        _code_hash(step),
+    )
+
+
+def chain_keys(key: str, steps: list):
+    keys = []
+    for step in steps:
+        key = step_key(key, step)
+        keys.append(key)
+    return keys
+
+
+# ---------------------------------------------------
+# STORE
+# ---------------------------------------------------
+
+class StepCache:
+    """
+    On-disk cache of fitted steps and their outputs, one directory per key
+    holding `state.pkl` (the pickled fitted step) and `output.parquet`.
+    Entries are written to a temporary directory and renamed into place,
+    so readers never see a partial entry. When the cache grows past
+    `max_bytes` the least recently used entries are evicted. The entry of
+    a source key holds `columns.json`, the numeric columns of its full read.
+    """
+    STATE = "state.pkl"
+    OUTPUT = "output.parquet"
+    COLUMNS = "columns.json"
+
+    def __init__(self, root, max_bytes: int = 2 * 1024 ** 3):
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+
+    @classmethod
+    def from_config(cls):
+        cfg = load_config().cache
+        return cls(resolve_path(cfg.dir), cfg.max_bytes)
+
+    def _entry(self, key: str):
+        return self.root / key
+
+    def has(self, key: str):
+        entry = self._entry(key)
+        return (entry / self.STATE).exists() and (entry / self.OUTPUT).exists()
+
+    def load_state(self, key: str):
+        entry = self._entry(key)
+        # Directory mtime marks the last use for LRU eviction
+        os.utime(entry)
+        with open(entry / self.STATE, "rb") as f:
+            return pickle.load(f)
+
+    def load_output(self, key: str):
+        return pd.read_parquet(self._entry(key) / self.OUTPUT)
+
+    def load_columns(self, key: str):
+        path = self._entry(key) / self.COLUMNS
+        return json.loads(path.read_text()) if path.exists() else None
+
+    def put_columns(self, key: str, columns: list):
+        entry = self._entry(key)
+        entry.mkdir(parents=True, exist_ok=True)
+        tmp = entry / f".{self.COLUMNS}.{uuid.uuid4().hex[:8]}"
+        try:
+            tmp.write_text(json.dumps(list(columns)))
+            os.replace(tmp, entry / self.COLUMNS)
+        finally:
+            tmp.unlink(missing_ok=True)
+
+    def put(self, key: str, step, output: pd.DataFrame):
+        entry = self._entry(key)
+        if entry.exists():
+            return
+        tmp = self.root / f".tmp-{uuid.uuid4().hex}"
+        tmp.mkdir(parents=True)
+        try:
+            # Uncompressed, no dictionary pages: fastest to write, and cache
+            # entries are local and short-lived
+            output.to_parquet(tmp / self.OUTPUT, compression=None, use_dictionary=False)
+            with open(tmp / self.STATE, "wb") as f:
+                pickle.dump(step, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, entry)
+        except OSError as e:
+            # Another run stored the same key first
+            logger.warning(f"Could not store cache entry {key[:12]}: {e}")
+        finally:
+            shutil.rmtree(tmp, ignore_errors=True)
+        self.evict(keep=key)
+
+    def size(self):
+        return sum(size for _, size, _ in self._entries())
+
+    def _entries(self):
+        if not self.root.exists():
+            return []
+        entries = []
+        for entry in self.root.iterdir():
+            if entry.is_dir() and not entry.name.startswith("."):
+                size = sum(f.stat().st_size for f in entry.iterdir())
+                entries.append((entry.stat().st_mtime, size, entry))
+        return entries
+
+    def evict(self, keep: str = None):
+        """Drop least recently used entries until the cache fits in max_bytes."""
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _ in entries)
+        for _, size, entry in entries:
+            if total <= self.max_bytes:
+                break
+            if entry.name == keep:
+                continue
+            shutil.rmtree(entry, ignore_errors=True)
+            total -= size
+            logger.info(f"Evicted cache entry {entry.name[:12]} ({size} bytes)")
+
+    def clear(self):
+        shutil.rmtree(self.root, ignore_errors=True)
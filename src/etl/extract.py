@@ -1,34 +1,285 @@
+import io
+import json
+import numpy as np
 import pandas as pd
 from pathlib import Path
-from ..utils.logger import get_logger, load_config
+from ..utils.helpers import MANIFEST, NPY_SCHEMA, downcast, filter_mask, infer_format, with_format_suffix
+from ..utils.config import load_config, resolve_path
+from ..utils.logger import get_logger
 
 logger = get_logger(__name__)
 
-def extract(path: str = None):
-    cfg = load_config()
-    raw_path = path or cfg.get("raw_path")
+
+def _resolve_raw_path(path: str = None):
+    raw_path = path or load_config().raw_path
 
     if not raw_path:
         raise ValueError("Raw path not configured in config.yaml")
 
     # Build absolute path relative to project root
-    project_root = Path(__file__).resolve().parents[3]
-    full = (project_root / raw_path).resolve()
-
-    logger.info(f"Extracting data from: {full}")
+    full = resolve_path(raw_path)
 
     if not full.exists():
         raise FileNotFoundError(f"Raw data file not found: {full}")
 
-    df = pd.read_csv(full)
+    return full
 
-    # Parse any date columns (just in case)
+
+def _parse_dates(df: pd.DataFrame):
+    # Parse any date columns the schema did not declare (just in case)
     for col in df.columns:
-        if "date" in col.lower():
+        if "date" in col.lower() and (df[col].dtype == object or pd.api.types.is_string_dtype(df[col])):
             try:
                 df[col] = pd.to_datetime(df[col])
             except Exception:
                 pass
+    return df
+
+
+# ---------------------------------------------------
+# READ SCHEMA
+# ---------------------------------------------------
+# Declared dtypes let the CSV parser build float32 / int8 / category
+# columns directly instead of inferring float64 / int64 / str and
+# converting afterwards. Dtypes for columns that are not in the file are
+# ignored, so one schema serves projected reads too.
+
+def _csv_options(columns: list = None):
+    schema = load_config().schema
+    usecols = list(columns or schema.usecols) or None
+    parse_dates = [c for c in schema.parse_dates if usecols is None or c in usecols]
+    return {
+        "usecols": usecols,
+        "dtype": dict(schema.dtypes) if schema.dtypes else None,
+        "parse_dates": parse_dates or None,
+    }
+
+
+def _read_csv(source, columns: list = None, engine: str = None, integers: bool = True, **kwargs):
+    schema = load_config().schema
+    df = pd.read_csv(source, engine=engine or schema.engine, **_csv_options(columns), **kwargs)
+    if schema.downcast:
+        downcast(df, integers=integers)
+    return _parse_dates(df)
+
+
+def _arrow_dataset(full: Path, fmt: str):
+    import pyarrow.dataset as ds
+
+    return ds.dataset(full, format="ipc" if fmt == "feather" else fmt)
+
+
+def _arrow_filter(filters: list):
+    if not filters:
+        return None
+    import pyarrow.parquet as pq
+
+    return pq.filters_to_expression(filters)
+
+
+def extract(path: str = None, columns: list = None, filters: list = None, schema: bool = True):
+    """
+    Read a CSV, Parquet, Feather (Arrow IPC) or npy dataset into a DataFrame.
+
+    `columns` projects the read onto a subset of columns and `filters`
+    ([(col, op, value), ...], AND-ed) selects rows. For Parquet/Feather both
+    are pushed down to the reader, so skipped columns and row groups are
+    never decoded. CSVs are parsed with the `schema` section of config.yaml
+    unless `schema` is False.
+    """
+    full = _resolve_raw_path(path)
+    fmt = infer_format(full)
+    logger.info(f"Extracting data from: {full}")
+
+    if fmt == "csv":
+        if schema:
+            df = _read_csv(full, columns)
+        else:
+            df = _parse_dates(pd.read_csv(full, usecols=columns))
+        if filters:
+            df = df[filter_mask(df, filters)].reset_index(drop=True)
+    elif fmt == "npy":
+        df = read_npy(full, columns=columns, filters=filters)
+    else:
+        table = _arrow_dataset(full, fmt).to_table(columns=columns, filter=_arrow_filter(filters))
+        df = table.to_pandas()
 
     logger.info(f"Extracted {df.shape[0]} rows and {df.shape[1]} columns")
     return df
+
+
+def peek(path: str = None, rows: int = 1000):
+    """First `rows` rows of the raw file, enough to learn its columns and dtypes."""
+    full = _resolve_raw_path(path)
+    fmt = infer_format(full)
+    if fmt == "csv":
+        # The pyarrow engine has no nrows
+        return _read_csv(full, engine="c", nrows=rows)
+    return _arrow_dataset(full, fmt).head(rows).to_pandas()
+
+
+def iter_extract(path: str = None, chunksize: int = None, columns: list = None):
+    """
+    Stream the raw file as DataFrame chunks of at most `chunksize` rows.
+    Only one chunk is held in memory at a time. CSV chunks use the read
+    schema, but integers are not downcast so every chunk gets the same dtypes.
+    """
+    chunksize = chunksize or load_config().pipeline.chunksize or 100_000
+
+    full = _resolve_raw_path(path)
+    fmt = infer_format(full)
+    logger.info(f"Streaming data from: {full} (chunksize={chunksize})")
+
+    rows = 0
+    if fmt == "csv":
+        schema = load_config().schema
+        # The pyarrow engine has no chunksize
+        with pd.read_csv(full, chunksize=chunksize, engine="c", **_csv_options(columns)) as reader:
+            for chunk in reader:
+                rows += len(chunk)
+                if schema.downcast:
+                    downcast(chunk, integers=False)
+                yield _parse_dates(chunk)
+    else:
+        for batch in _arrow_dataset(full, fmt).to_batches(columns=columns, batch_size=chunksize):
+            if batch.num_rows:
+                rows += batch.num_rows
+                yield batch.to_pandas()
+
+    logger.info(f"Streamed {rows} rows")
+
+
+def extract_appended(path: str = None, offset: int = 0):
+    """
+    Read the rows of an append-only CSV that start at byte `offset`
+    (0 = first data row), up to the last complete line, so a batch that is
+    still being written is left for the next call. Returns (df, end_offset);
+    the next call should start at end_offset.
+    """
+    full = _resolve_raw_path(path)
+    if infer_format(full) != "csv":
+        raise ValueError(f"Incremental extraction needs an append-only CSV, got: {full}")
+
+    with open(full, "rb") as f:
+        header = f.readline()
+        start = max(offset, len(header))
+        f.seek(start)
+        data = f.read()
+    end = data.rfind(b"\n") + 1
+
+    # Integers are not downcast, so every batch gets the same dtypes
+    df = _read_csv(io.BytesIO(header + data[:end]), integers=False)
+    logger.info(f"Extracted {len(df)} new rows from: {full} (bytes {start}-{start + end})")
+    return df, start + end
+
+
+def read_dataset(root, columns: list = None, filters: list = None):
+    """
+    Read a partitioned directory dataset written by load(partition_by=...).
+    Only the files listed in its manifest are read, and partitions whose
+    values fail the `filters` on partition columns are skipped unopened.
+    """
+    root = Path(root)
+    manifest = json.loads((root / MANIFEST).read_text())
+    parts = manifest["partitions"]
+    fmt = manifest["format"]
+
+    pruning = [f for f in filters or [] if f[0] in manifest["partition_by"]]
+    if pruning and parts:
+        keep = filter_mask(pd.DataFrame([p["values"] for p in parts]), pruning)
+        parts = [p for p, k in zip(parts, keep) if k]
+    logger.info(f"Reading {len(parts)} of {len(manifest['partitions'])} partitions from: {root}")
+
+    if not parts:
+        return pd.DataFrame(columns=columns or manifest["columns"])
+    files = [root / p["path"] for p in parts]
+    if fmt == "csv":
+        # Filter columns are read even when projected away
+        usecols = None if columns is None else list(dict.fromkeys([*columns, *(f[0] for f in filters or [])]))
+        df = pd.concat([pd.read_csv(f, usecols=usecols) for f in files], ignore_index=True)
+        if filters:
+            df = df[filter_mask(df, filters)].reset_index(drop=True)
+        return df if columns is None else df[columns]
+    dataset = _arrow_dataset([str(f) for f in files], fmt)
+    return dataset.to_table(columns=columns, filter=_arrow_filter(filters)).to_pandas()
+
+
+def read_npy(root, columns: list = None, filters: list = None):
+    """
+    Open an npy directory written by load(fmt="npy") without copying it:
+    each column is a read-only memory map of its .npy file, so processes
+    reading the same dataset share its pages through the OS page cache.
+    Writes to the frame copy the touched column first (copy-on-write).
+    `filters` are evaluated in memory and the matching rows copied.
+    """
+    root = Path(root)
+    schema = json.loads((root / NPY_SCHEMA).read_text())
+    by_name = {c["name"]: c for c in schema["columns"]}
+    names = list(by_name) if columns is None else list(columns)
+    missing = [c for c in names if c not in by_name]
+    if missing:
+        raise KeyError(f"Columns not in {root}: {missing}")
+    # Filter columns are read even when projected away
+    read = list(dict.fromkeys([*names, *(f[0] for f in filters or [])]))
+
+    # Empty files cannot be mapped
+    mmap_mode = "r" if schema["rows"] else None
+    data = {}
+    for name in read:
+        col = by_name[name]
+        values = np.load(root / col["file"], mmap_mode=mmap_mode)
+        if "categories" in col:
+            values = pd.Categorical.from_codes(values, col["categories"])
+        data[name] = values
+    df = pd.DataFrame(data, copy=False)
+    logger.info(f"Mapped {len(df)} rows and {len(read)} columns from: {root}")
+
+    if filters:
+        df = df[filter_mask(df, filters)].reset_index(drop=True)
+    return df[names] if len(read) > len(names) else df
+
+
+def _processed_location(path: str = None):
+    """(processed file path, manifest path of its partitioned dataset or None)."""
+    if path is None:
+        cfg = load_config()
+        path = cfg.processed_path
+        if not path:
+            raise ValueError("Processed path not configured")
+        path = with_format_suffix(path, cfg.io.format)
+
+    full = resolve_path(path)
+    manifest = full.with_suffix("") / MANIFEST
+    if manifest.exists() and (not full.exists() or manifest.stat().st_mtime >= full.stat().st_mtime):
+        return full, manifest
+    return full, None
+
+
+def read_processed(columns: list = None, filters: list = None, path: str = None):
+    """
+    Read the processed dataset written by load(), in the configured format.
+    Consumers such as the trainer pass `columns` to load only what they need;
+    with io.format npy the columns are memory-mapped, not parsed. If load()
+    wrote a partitioned dataset, it is read instead of the single file,
+    unless the single file is newer.
+    """
+    full, manifest = _processed_location(path)
+    if manifest is not None:
+        return read_dataset(manifest.parent, columns=columns, filters=filters)
+    # The raw read schema does not describe processed columns
+    return extract(str(full), columns=columns, filters=filters, schema=False)
+
+
+def processed_columns(path: str = None):
+    """Column names of the dataset read_processed() reads, from its header, schema or manifest."""
+    full, manifest = _processed_location(path)
+    if manifest is not None:
+        return json.loads(manifest.read_text())["columns"]
+    if not full.exists():
+        raise FileNotFoundError(f"Processed data not found: {full}")
+    fmt = infer_format(full)
+    if fmt == "csv":
+        return list(pd.read_csv(full, nrows=0).columns)
+    if fmt == "npy":
+        return [c["name"] for c in json.loads((full / NPY_SCHEMA).read_text())["columns"]]
+    return _arrow_dataset(full, fmt).schema.names
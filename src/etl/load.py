@@ -1,15 +1,311 @@
+import json
+import os
+import uuid
+from functools import partial
 from pathlib import Path
-from ..utils.logger import get_logger, load_config
+from urllib.parse import quote
+
+import numpy as np
+import pandas as pd
+
+from ..utils.helpers import MANIFEST, NPY_SCHEMA, infer_format, with_format_suffix
+from ..utils.config import load_config, resolve_path
+from ..utils.logger import get_logger
+from ..utils.parallel import map_chunks
 
 logger = get_logger(__name__)
 
-def load(df, path: str = None):
+
+def _resolve_processed_path(path: str = None, fmt: str = None):
+    """Return (absolute output path, format) for an explicit or configured path."""
     cfg = load_config()
-    path = path or cfg.get("processed_path")
-    if not path:
-        raise ValueError("Processed path not configured")
-    full = (Path(__file__).resolve().parents[3] / path).resolve()
+    if path:
+        fmt = fmt or infer_format(path, default=cfg.io.format)
+    else:
+        path = cfg.processed_path
+        if not path:
+            raise ValueError("Processed path not configured")
+        fmt = fmt or cfg.io.format
+    full = resolve_path(with_format_suffix(path, fmt))
     full.parent.mkdir(parents=True, exist_ok=True)
+    return full, fmt
+
+
+def _arrow_options():
+    io_cfg = load_config().io
+    return io_cfg.compression, io_cfg.row_group_size
+
+
+def _to_table(df, schema=None):
+    import pyarrow as pa
+
+    return pa.Table.from_pandas(df, schema=schema, preserve_index=False)
+
+
+class _ArrowWriter:
+    """Incremental Parquet / Arrow IPC writer with a fixed schema."""
+
+    def __init__(self, full: Path, fmt: str, schema):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        compression, self.row_group_size = _arrow_options()
+        self.schema = schema
+        if fmt == "parquet":
+            self._writer = pq.ParquetWriter(full, schema, compression=compression)
+        else:
+            options = pa.ipc.IpcWriteOptions(compression=compression)
+            self._writer = pa.ipc.new_file(str(full), schema, options=options)
+
+    def write(self, table):
+        self._writer.write_table(table, self.row_group_size)
+
+    def close(self):
+        self._writer.close()
+
+
+# ---------------------------------------------------
+# ATOMIC WRITES
+# ---------------------------------------------------
+# Every file is written under a temporary name in its final directory and
+# renamed into place, so readers see either the old or the new file, never
+# a partial one.
+
+def _temp_path(full: Path):
+    return full.with_name(f".{full.name}.{uuid.uuid4().hex[:8]}.tmp")
+
+
+def _write_json(path: Path, obj):
+    tmp = _temp_path(path)
+    try:
+        tmp.write_text(json.dumps(obj, indent=2))
+        os.replace(tmp, path)
+    finally:
+        tmp.unlink(missing_ok=True)
+
+
+def _read_json(path: Path):
+    return json.loads(path.read_text()) if path.exists() else None
+
+
+def _remove_stale(root: Path, stale: list, live: set):
+    # Files of the generation before the previous one: readers of the
+    # previous index had time to finish
+    for rel in stale:
+        if rel not in live:
+            (root / rel).unlink(missing_ok=True)
+
+
+def _write_file(df, full: Path, fmt: str):
+    if fmt == "npy":
+        return _write_npy(df, full)
+    tmp = _temp_path(full)
+    try:
+        if fmt == "csv":
+            df.to_csv(tmp, index=False)
+        else:
+            table = _to_table(df)
+            writer = _ArrowWriter(tmp, fmt, table.schema)
+            writer.write(table)
+            writer.close()
+        os.replace(tmp, full)
+    finally:
+        tmp.unlink(missing_ok=True)
+    return full
+
+
+# ---------------------------------------------------
+# PARTITIONED DATASETS
+# ---------------------------------------------------
+
+def _json_value(value):
+    if value != value:
+        return None
+    return value.item() if hasattr(value, "item") else value
+
+
+def _write_partition(root: Path, fmt: str, run_id: str, item):
+    values, part = item
+    subdir = Path(*(f"{quote(str(c), safe='')}={quote(str(v), safe='')}" for c, v in values.items()))
+    (root / subdir).mkdir(parents=True, exist_ok=True)
+    rel = with_format_suffix(subdir / f"part-{run_id}", fmt)
+    _write_file(part, root / rel, fmt)
+    return {"values": values, "path": rel.as_posix(), "rows": len(part)}
+
+
+def _read_manifest(root: Path):
+    return _read_json(root / MANIFEST)
+
+
+def _load_partitioned(df, root: Path, fmt: str, partition_by: list):
+    """
+    Write `df` as a directory dataset: one file per partition under
+    col=value/ subdirectories, written in parallel, then a manifest.
+    Files get a fresh run id, so the manifest swap is the commit point:
+    readers follow the manifest and never see a mix of two runs. Files of
+    the run before the previous one are removed afterwards, which leaves
+    readers of the previous manifest time to finish.
+    """
+    root.mkdir(parents=True, exist_ok=True)
+    run_id = uuid.uuid4().hex[:12]
+    previous = _read_manifest(root)
+
+    groups = (
+        ({c: _json_value(v) for c, v in zip(partition_by, key)}, part)
+        for key, part in df.groupby(partition_by, sort=True, observed=True, dropna=False)
+    )
+    partitions = list(map_chunks(partial(_write_partition, root, fmt, run_id), groups))
+
+    manifest = {
+        "run_id": run_id,
+        "format": fmt,
+        "partition_by": list(partition_by),
+        "columns": list(df.columns),
+        "rows": len(df),
+        "partitions": partitions,
+        "previous": [p["path"] for p in previous["partitions"]] if previous else [],
+    }
+    _write_json(root / MANIFEST, manifest)
+
+    if previous:
+        _remove_stale(root, previous["previous"], {p["path"] for p in partitions} | set(manifest["previous"]))
+    return root
+
+
+# ---------------------------------------------------
+# MEMORY-MAPPED LAYOUT
+# ---------------------------------------------------
+# fmt="npy" writes a directory with one .npy file per column (the header
+# is padded so the data starts 64-byte aligned) and a _schema.json that
+# lists them. extract.read_npy() maps the files instead of parsing them,
+# so every process reading the dataset shares the same page-cache pages.
+# Column files get a fresh run id and the schema swap is the commit point,
+# as with partitioned datasets; pages a reader has already mapped stay
+# valid even after their file is removed.
+
+def _npy_column(series: pd.Series):
+    """(fixed-width array, extra schema fields) for one column."""
+    if not isinstance(series.dtype, pd.CategoricalDtype) and (
+        series.dtype == object or pd.api.types.is_string_dtype(series)
+    ):
+        series = series.astype("category")
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        categories = [_json_value(c) for c in series.cat.categories]
+        return series.cat.codes.to_numpy(), {"categories": categories}
+    values = series.to_numpy()
+    if values.dtype == object:
+        raise ValueError(f"Column '{series.name}' ({series.dtype}) has no fixed-width NumPy dtype")
+    return values, {}
+
+
+def _write_npy(df, root: Path):
+    root.mkdir(parents=True, exist_ok=True)
+    run_id = uuid.uuid4().hex[:12]
+    previous = _read_json(root / NPY_SCHEMA)
+
+    columns = []
+    for i, col in enumerate(df.columns):
+        values, extra = _npy_column(df[col])
+        name = f"{i:04d}-{run_id}.npy"
+        with open(root / name, "wb") as f:
+            np.save(f, np.ascontiguousarray(values))
+        columns.append({"name": col, "file": name, "dtype": values.dtype.str, **extra})
+
+    schema = {
+        "run_id": run_id,
+        "rows": len(df),
+        "columns": columns,
+        "previous": [c["file"] for c in previous["columns"]] if previous else [],
+    }
+    _write_json(root / NPY_SCHEMA, schema)
+
+    if previous:
+        _remove_stale(root, previous["previous"], {c["file"] for c in columns} | set(schema["previous"]))
+    return root
+
+
+def load(df, path: str = None, fmt: str = None, partition_by: list = None):
+    """
+    Save the processed dataset as csv, parquet, feather (Arrow IPC) or npy
+    (memory-mappable columns, see _write_npy()). The format comes from
+    `fmt`, the suffix of `path`, or io.format in config.yaml; the output
+    suffix is adjusted to match it.
+
+    With `partition_by` (default io.partition_by; pass () to disable) the
+    output is a directory dataset next to the file path, see
+    _load_partitioned(). Either way the write is atomic.
+    """
+    full, fmt = _resolve_processed_path(path, fmt)
+    if partition_by is None:
+        partition_by = load_config().io.partition_by
+    if partition_by:
+        if fmt == "npy":
+            raise ValueError("The npy layout cannot be partitioned")
+        root = full.with_suffix("")
+        logger.info(f"Saving processed data to: {root} (partitioned by {list(partition_by)})")
+        _load_partitioned(df, root, fmt, list(partition_by))
+        logger.info("Saved processed dataset")
+        return root
+
     logger.info(f"Saving processed data to: {full}")
-    df.to_csv(full, index=False)
+    _write_file(df, full, fmt)
     logger.info("Saved processed dataset")
+    return full
+
+
+def load_chunks(chunks, path: str = None, fmt: str = None):
+    """
+    Write an iterable of DataFrame chunks to a single output file.
+    The first chunk defines the header (and the Arrow schema); later chunks
+    are appended with their columns aligned to it. Returns the number of
+    rows written.
+    """
+    full, fmt = _resolve_processed_path(path, fmt)
+    if fmt == "npy":
+        # .npy headers need the row count before the first row is written
+        raise ValueError("The npy layout cannot be streamed; use load()")
+    logger.info(f"Streaming processed data to: {full}")
+
+    # Chunks go to a temporary file that replaces `full` once complete
+    tmp = _temp_path(full)
+    columns = None
+    writer = None
+    rows = 0
+    try:
+        for chunk in chunks:
+            if columns is None:
+                columns = list(chunk.columns)
+                dtypes = chunk.dtypes
+                if fmt == "csv":
+                    chunk.to_csv(tmp, index=False)
+                else:
+                    table = _to_table(chunk)
+                    writer = _ArrowWriter(tmp, fmt, table.schema)
+                    writer.write(table)
+            else:
+                extra = [c for c in chunk.columns if c not in columns]
+                if extra:
+                    logger.warning(f"Dropping columns not present in first chunk: {extra}")
+                # Chunks may miss a dummy column (e.g. a category absent from the batch)
+                missing = [c for c in columns if c not in chunk.columns]
+                chunk = chunk.reindex(columns=columns, fill_value=0)
+                if missing:
+                    chunk = chunk.astype({c: dtypes[c] for c in missing})
+                if fmt == "csv":
+                    chunk.to_csv(tmp, mode="a", header=False, index=False)
+                else:
+                    writer.write(_to_table(chunk, schema=writer.schema))
+            rows += len(chunk)
+        if writer is not None:
+            writer.close()
+            writer = None
+        if columns is None:
+            raise ValueError("No chunks to save")
+        os.replace(tmp, full)
+    finally:
+        if writer is not None:
+            writer.close()
+        tmp.unlink(missing_ok=True)
+
+    logger.info(f"Saved processed dataset ({rows} rows)")
+    return rows
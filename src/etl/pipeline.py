@@ -1,13 +1,92 @@
-from ..etl.extract import extract
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from itertools import chain
+from pathlib import Path
+
+import pandas as pd
+
+from ..etl.cache import StepCache, source_key as cache_source_key
+from ..etl.extract import extract, extract_appended, iter_extract, read_npy
 from ..etl.transform import ImputeMedian, RemoveOutliersIQR, FeatureEngineering, Pipeline
-from ..etl.load import load
-from ..utils.logger import get_logger, load_config
+from ..etl.load import load, load_chunks
+from ..utils.config import load_config, resolve_path
+from ..utils.helpers import infer_format
+from ..utils.logger import get_logger
 from ..utils import validation
+from ..utils.parallel import count_outside, map_columns, nan_median
+from ..utils.sketch import ColumnSketches, sketch_columns
 
 logger = get_logger(__name__)
 
 
-def run_pipeline():
+def _numeric_cols(df):
+    return [
+        c for c in df.select_dtypes(include="number").columns
+        if c != "quality"
+    ]
+
+
+def _build_pipeline(numeric_cols: list, k: float, inplace: bool = True):
+    return Pipeline([
+        ImputeMedian(cols=numeric_cols),
+        RemoveOutliersIQR(cols=numeric_cols, k=k),
+        FeatureEngineering(),
+    ], inplace=inplace)
+
+
+def _validate(df, numeric_cols: list, cfg):
+    report = validation.validate_frame(
+        df,
+        required_columns=list(cfg.validation.required_columns),
+        numeric_cols=numeric_cols,
+        k=cfg.pipeline.outlier_k,
+        dtypes=cfg.validation.dtypes,
+        max_allowed_violations=cfg.validation.max_allowed_violations,
+    )
+    if not report.valid:
+        raise validation.ValidationError("; ".join(report.errors))
+    logger.info(f"Null counts: { {c: n for c, n in report.null_counts.items() if n} }")
+    return report
+
+
+def _filter_chunks(chunks, ranges: dict, pre, post):
+    """
+    Streaming pass 2: count the raw values outside `ranges` like _validate()
+    does, and yield each chunk with the fitted imputer and outlier steps
+    (`pre`) applied, feeding the kept rows into the `post` sketches. Raises
+    ValidationError after the last chunk if there are too many violations.
+    """
+    limit = load_config().validation.max_allowed_violations
+    totals = {c: [0, 0] for c in ranges}
+    for chunk in chunks:
+        cols = [c for c in ranges if c in chunk.columns]
+        for col, (below, above) in map_columns(count_outside, chunk, cols, per_column=ranges).items():
+            totals[col][0] += below
+            totals[col][1] += above
+        kept = pre.transform(chunk)
+        post.update(kept)
+        yield kept
+
+    violations = {c: {"below": b, "above": a} for c, (b, a) in totals.items() if b or a}
+    total = sum(v["below"] + v["above"] for v in violations.values())
+    logger.info(f"Numeric violations: {total}")
+    if total > limit:
+        logger.error(violations)
+        raise validation.ValidationError(f"Numeric violations exceeded limit: {total} > {limit}")
+
+
+def run_pipeline(raw_path: str = None, processed_path: str = None, inplace: bool = None, use_cache: bool = None):
+    """
+    Extract, validate, fit + transform and save the wine dataset.
+    With the step cache (cache.enabled, or `use_cache`), steps whose
+    input, parameters and code are unchanged since an earlier run are
+    loaded from disk; if the first step is cached, the raw file is not
+    read or validated again.
+    """
     logger.info("Starting Wine ETL pipeline")
 
     # -------------------------------------------------
@@ -15,66 +94,348 @@ def run_pipeline():
     # -------------------------------------------------
     cfg = load_config()
 
-    required = cfg.get("validation", {}).get("required_columns", [])
-    k = cfg.get("pipeline", {}).get("outlier_k", 3.0)
+    k = cfg.pipeline.outlier_k
+    if inplace is None:
+        inplace = cfg.pipeline.inplace
+    if use_cache is None:
+        use_cache = cfg.cache.enabled
+
+    cache = source_key = df = report = None
+    cached = 0
+    if use_cache:
+        # Step keys need only the raw file's stat and header; the read
+        # schema decides the dtypes every step sees. A cached first step
+        # skips validation, so every validation input is part of the key
+        cache = StepCache.from_config()
+        source_key = cache_source_key(resolve_path(raw_path or cfg.raw_path), cfg.validation, cfg.schema, k)
+        # Numeric columns of the full read, stored by the run that validated it
+        numeric_cols = cache.load_columns(source_key)
+        if numeric_cols is not None:
+            pipe = _build_pipeline(numeric_cols, k, inplace)
+            cached = pipe.cached_prefix(cache, source_key)
+
+    if cached:
+        logger.info(f"First {cached} step(s) cached: skipping extract and validation")
+    else:
+        # -------------------------------------------------
+        # 2) Extract
+        # -------------------------------------------------
+        df = extract(raw_path)
+        logger.info(f"Extracted dataframe shape: {df.shape}")
+
+        # -------------------------------------------------
+        # 3) Validation: one pass over the numeric block
+        # -------------------------------------------------
+        numeric_cols = _numeric_cols(df)
+        pipe = _build_pipeline(numeric_cols, k, inplace)
+        report = _validate(df, numeric_cols, cfg)
+        if cache is not None:
+            cache.put_columns(source_key, numeric_cols)
 
     # -------------------------------------------------
-    # 2) Extract
+    # 4) Feature engineering pipeline
     # -------------------------------------------------
-    df = extract()
-    logger.info(f"Extracted dataframe shape: {df.shape}")
+    # Imputer and outlier bounds are fitted from the report, not rescanned
+    df_processed = pipe.fit_transform(df, report=report, cache=cache, source_key=source_key)
+    del df
+    if cfg.pipeline.artifact_path:
+        # Serving applies the same fitted transforms to incoming rows
+        pipe.save(resolve_path(cfg.pipeline.artifact_path))
 
     # -------------------------------------------------
-    # 3) Row count validation
+    # 5) Load / Save processed dataset
     # -------------------------------------------------
-    rc = validation.validate_row_count(df, min_rows=1)
-    if not rc["valid"]:
-        raise validation.ValidationError(f"Row count too small: {rc['details']}")
+    load(df_processed, processed_path)
+    logger.info("Wine ETL pipeline completed successfully")
+
+    return df_processed
+
+
+def run_pipeline_streaming(chunksize: int = None, raw_path: str = None, processed_path: str = None):
+    """
+    Chunked variant of run_pipeline(): peak memory depends on chunksize,
+    not on the size of the raw file.
+
+    Pass 1 streams the raw file into per-column quantile sketches and fits
+    the imputer and outlier bounds from them. Pass 2 streams it again,
+    counts range violations like run_pipeline(), drops the outliers and
+    spills the kept rows to a temporary Parquet file while sketching them;
+    FeatureEngineering is fitted from those rows, as in run_pipeline().
+    The spill is then transformed and appended chunk by chunk. Returns the
+    number of processed rows written.
+    """
+    logger.info("Starting Wine ETL pipeline (streaming)")
+
+    cfg = load_config()
+
+    required = list(cfg.validation.required_columns)
+    k = cfg.pipeline.outlier_k
+    eps = cfg.pipeline.sketch_eps
 
     # -------------------------------------------------
-    # 4) Required column validation
+    # Pass 1: validate + sketch
     # -------------------------------------------------
-    rc2 = validation.validate_required_columns(df, required)
+    chunks = iter_extract(raw_path, chunksize=chunksize)
+    first = next(chunks, None)
+    if first is None:
+        raise validation.ValidationError("Row count too small: raw file is empty")
+
+    rc2 = validation.validate_required_columns(first, required)
     if not rc2["valid"]:
         raise validation.ValidationError(f"Missing required columns: {rc2['missing']}")
 
-    # -------------------------------------------------
-    # 5) Numeric range validations (non-blocking)
-    # -------------------------------------------------
-    numeric_cols = [
-        c for c in df.select_dtypes(include=["int64", "float64"]).columns
-        if c != "quality"
-    ]
+    numeric_cols = _numeric_cols(first)
+    # Distinct values feed the FeatureEngineering vocabulary (quality -> quality_label)
+    distinct_cols = first.select_dtypes(include=["object", "category"]).columns.tolist()
+    if "quality" in first.columns:
+        distinct_cols.append("quality")
+    sketches = sketch_columns(chain([first], chunks), numeric_cols, eps=eps)
+    del first
+    logger.info(f"Sketched {sketches.rows} rows (eps={eps})")
 
-    ranges = validation.compute_iqr_ranges(df, numeric_cols, k=k)
+    ranges = validation.compute_iqr_ranges_sketch(sketches, numeric_cols, k=k)
+    logger.info(f"Numeric ranges (sketch): {ranges}")
 
-    # FIXED: Do NOT stop pipeline for numeric violations
-    validation.validate_numeric_ranges(
-        df,
-        ranges,
-        max_allowed_violations=1000  # <-- UPDATED HERE
-    )
+    pipe = _build_pipeline(numeric_cols, k)
+    *pre, features = pipe.steps
+    for s in pre:
+        s.fit_sketches(sketches)
 
     # -------------------------------------------------
-    # 6) Feature engineering pipeline
+    # Pass 2: filter, spill, transform + load
     # -------------------------------------------------
-    imputer = ImputeMedian(cols=numeric_cols)
-    outlier_remover = RemoveOutliersIQR(cols=numeric_cols, k=k)
-    fe = FeatureEngineering()
+    # The outlier bounds need the whole first pass, so the vocabulary and
+    # alcohol range of the kept rows are only known after a second one
+    kept = ColumnSketches(["alcohol"] if "alcohol" in numeric_cols else [], eps=eps, distinct_cols=distinct_cols)
+    with tempfile.TemporaryDirectory(prefix="etl-stream-") as tmp:
+        spill = Path(tmp) / "kept.parquet"
+        chunks = iter_extract(raw_path, chunksize=chunksize)
+        # A violation error aborts the spill before anything is written to processed_path
+        # Chunks come straight from the reader, so the steps may modify them
+        load_chunks(_filter_chunks(chunks, ranges, Pipeline(pre, inplace=True), kept), str(spill))
+        features.fit_sketches(kept)
 
-    steps = [imputer, outlier_remover, fe]
-    pipe = Pipeline(steps)
-    pipe.fit(df)
-    df_processed = pipe.transform(df)
-
-    # -------------------------------------------------
-    # 7) Load / Save processed dataset
-    # -------------------------------------------------
-    load(df_processed)
+        chunks = iter_extract(str(spill), chunksize=chunksize)
+        out = Pipeline([features], inplace=True).transform_chunks(chunks)
+        first = next(out, None)
+        if first is not None:
+            # Serving orders features like the processed output
+            pipe.columns = list(first.columns)
+            out = chain([first], out)
+        if cfg.pipeline.artifact_path:
+            pipe.save(resolve_path(cfg.pipeline.artifact_path))
+        rows = load_chunks(out, processed_path)
     logger.info("Wine ETL pipeline completed successfully")
 
-    return df_processed
+    return rows
+
+
+# ---------------------------------------------------
+# INCREMENTAL MODE
+# ---------------------------------------------------
+
+WATERMARK = "_watermark.json"
+# Fitted pipeline of the history that starts at part n (first_part)
+PIPELINE_FILE = "_pipeline-{:05d}.joblib"
+# Bytes hashed at the start of the raw file to notice it being rewritten
+HEAD_BYTES = 64 * 1024
+
+
+def _head_hash(path, n: int):
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read(n)).hexdigest()
+
+
+def _read_watermark(parts_dir):
+    path = parts_dir / WATERMARK
+    return json.loads(path.read_text()) if path.exists() else None
+
+
+def _write_watermark(parts_dir, state: dict):
+    tmp = parts_dir / f"{WATERMARK}.tmp"
+    tmp.write_text(json.dumps(state, indent=2))
+    os.replace(tmp, parts_dir / WATERMARK)
+
+
+def _part_number(path):
+    # part-00003.csv, or the part-00003.npy directory
+    return int(path.name[len("part-"):len("part-") + 5])
+
+
+def _remove_superseded(parts_dir, state: dict):
+    """Delete the parts and pipelines of histories older than the watermark's."""
+    keep = PIPELINE_FILE.format(state["first_part"])
+    for old in parts_dir.glob("_pipeline*.joblib"):
+        if old.name != keep:
+            old.unlink()
+    for old in parts_dir.glob("part-*"):
+        if _part_number(old) < state["first_part"]:
+            # npy parts are directories
+            shutil.rmtree(old) if old.is_dir() else old.unlink()
+
+
+def _part_path(parts_dir, n: int):
+    # The format may have changed since the part was written
+    path = next(parts_dir.glob(f"part-{n:05d}.*"), None)
+    if path is None:
+        raise FileNotFoundError(f"Part {n} is missing from {parts_dir}")
+    return path
+
+
+def read_incremental(parts_dir: str = None, columns: list = None):
+    """
+    Read the processed history written by run_pipeline_incremental(): only
+    the parts its watermark covers (first_part up to parts - 1), never the
+    parts of a superseded history that are not deleted yet.
+    """
+    parts_dir = resolve_path(parts_dir or load_config().incremental.parts_dir)
+    state = _read_watermark(parts_dir)
+    if state is None or "first_part" not in state:
+        raise FileNotFoundError(f"No incremental watermark in {parts_dir}")
+
+    frames = []
+    for n in range(state["first_part"], state["parts"]):
+        path = _part_path(parts_dir, n)
+        if infer_format(path) == "npy":
+            frames.append(read_npy(path, columns=columns))
+        else:
+            # The raw read schema does not describe processed columns
+            frames.append(extract(str(path), columns=columns, schema=False))
+    logger.info(f"Read parts {state['first_part']}-{state['parts'] - 1} from: {parts_dir}")
+    return pd.concat(frames, ignore_index=True)
+
+
+def _median_drift(pipe, df):
+    """Per column |median(df) - fitted median|, in units of the fitted IQR."""
+    imputer = next(s for s in pipe.steps if isinstance(s, ImputeMedian))
+    remover = next(s for s in pipe.steps if isinstance(s, RemoveOutliersIQR))
+    # bounds are q1 - k * iqr and q3 + k * iqr
+    iqr = {c: (hi - lo) / (1 + 2 * remover.k) for c, (lo, hi) in remover.bounds.items()}
+    cols = [c for c in remover.fitted_cols if c in df.columns and c in imputer.medians]
+    medians = map_columns(nan_median, df, cols)
+    return {
+        c: abs(medians[c] - imputer.medians[c]) / (iqr[c] or 1.0)
+        for c in cols if medians[c] == medians[c]
+    }
+
+
+def _rebuild_incremental(raw_path, parts_dir, cfg, first_part: int):
+    """
+    Fit on the full history and write it as part `first_part`, with its
+    own pipeline file. Older parts stay until the watermark points at the
+    new ones, so a crash before that keeps the previous history intact.
+    """
+    df, offset = extract_appended(raw_path, 0)
+    columns = list(df.columns)
+    numeric_cols = _numeric_cols(df)
+    report = _validate(df, numeric_cols, cfg)
+    pipe = _build_pipeline(numeric_cols, cfg.pipeline.outlier_k, cfg.pipeline.inplace)
+
+    df_processed = pipe.fit_transform(df, report=report)
+    del df
+
+    load(df_processed, parts_dir / f"part-{first_part:05d}", partition_by=())
+    pipe.save(parts_dir / PIPELINE_FILE.format(first_part))
+    if cfg.pipeline.artifact_path:
+        pipe.save(resolve_path(cfg.pipeline.artifact_path))
+    return report.rows, offset, columns
+
+
+def run_pipeline_incremental(raw_path: str = None, parts_dir: str = None):
+    """
+    Process only the rows appended to the raw CSV since the last run.
+
+    A watermark (byte offset of the first unread row, plus a hash of the
+    start of the file) is kept next to the output parts. New complete rows
+    are transformed with the pipeline fitted earlier and written as one new
+    part. Everything is refitted and rewritten when there is no previous
+    run, the file was rewritten or its columns changed, or a column median
+    drifts by more than incremental.drift_threshold fitted IQRs. A rebuild
+    is written as a new part numbered after the existing ones; the
+    watermark's first_part marks where the current history starts, and
+    older parts are deleted only after the watermark is written;
+    read_incremental() reads just that history.
+    Returns the number of raw rows processed.
+    """
+    logger.info("Starting Wine ETL pipeline (incremental)")
+    cfg = load_config()
+    inc = cfg.incremental
+
+    full = resolve_path(raw_path or cfg.raw_path)
+    parts_dir = resolve_path(parts_dir or inc.parts_dir)
+    parts_dir.mkdir(parents=True, exist_ok=True)
+    state = _read_watermark(parts_dir)
+
+    reason = None
+    if state is None or "first_part" not in state:
+        reason = "no previous run"
+    elif not (parts_dir / PIPELINE_FILE.format(state["first_part"])).exists():
+        reason = "fitted pipeline is missing"
+    elif state["raw_path"] != str(full):
+        reason = "raw path changed"
+    elif full.stat().st_size < state["offset"] or _head_hash(full, state["head_bytes"]) != state["head_hash"]:
+        reason = "raw file was rewritten"
+    else:
+        df, offset = extract_appended(raw_path, state["offset"])
+        if df.empty:
+            logger.info("No new rows since the last run")
+            return 0
+        pipe = Pipeline.load(parts_dir / PIPELINE_FILE.format(state["first_part"]))
+        if list(df.columns) != state["columns"]:
+            reason = "columns changed"
+        elif len(df) >= inc.drift_min_rows:
+            drift = _median_drift(pipe, df)
+            logger.info(f"Median drift (IQRs): { {c: round(d, 3) for c, d in drift.items()} }")
+            worst = max(drift, key=drift.get, default=None)
+            if worst is not None and drift[worst] > inc.drift_threshold:
+                reason = f"drift in '{worst}' ({drift[worst]:.2f} IQR > {inc.drift_threshold})"
+
+    if reason:
+        logger.info(f"Full rebuild: {reason}")
+        # Numbered after the watermarked parts; a higher part can only be
+        # left over from a run that crashed, and is overwritten
+        if state is not None and "parts" in state:
+            first_part = state["parts"]
+        else:
+            first_part = max((_part_number(p) + 1 for p in parts_dir.glob("part-*")), default=0)
+        rows, offset, columns = _rebuild_incremental(raw_path, parts_dir, cfg, first_part)
+        total, part = rows, first_part + 1
+    else:
+        first_part = state["first_part"]
+        rows, columns = len(df), state["columns"]
+        _validate(df, _numeric_cols(df), cfg)
+        part = state["parts"]
+        load(pipe.transform(df), parts_dir / f"part-{part:05d}", partition_by=())
+        total, part = state["rows"] + rows, part + 1
+
+    head_bytes = min(offset, HEAD_BYTES)
+    state = {
+        "raw_path": str(full),
+        "offset": offset,
+        "head_bytes": head_bytes,
+        "head_hash": _head_hash(full, head_bytes),
+        "columns": columns,
+        "rows": total,
+        "first_part": first_part,
+        "parts": part,
+    }
+    # The watermark switches readers to the new history; only then is the
+    # old one removed
+    _write_watermark(parts_dir, state)
+    _remove_superseded(parts_dir, state)
+    logger.info(f"Incremental run processed {rows} rows ({total} in total, parts {first_part}-{part - 1})")
+    return rows
 
 
 if __name__ == "__main__":
-    run_pipeline()
+    parser = argparse.ArgumentParser(description="Run the wine ETL pipeline")
+    parser.add_argument("--no-cache", action="store_true", help="recompute every step, ignoring the step cache")
+    parser.add_argument("--incremental", action="store_true", help="only process rows appended since the last run")
+    args = parser.parse_args()
+
+    if args.incremental:
+        run_pipeline_incremental()
+    elif load_config().pipeline.chunksize:
+        run_pipeline_streaming()
+    else:
+        run_pipeline(use_cache=False if args.no_cache else None)
@@ -1,14 +1,29 @@
+import numpy as np
 import pandas as pd
-from dataclasses import dataclass
-from ..utils.logger import get_logger, load_config
-from sklearn.preprocessing import MinMaxScaler
+from dataclasses import dataclass, fields
+from pathlib import Path
+from ..utils.logger import get_logger
+from ..utils.parallel import map_chunks, map_columns, nan_median, nan_quantiles
+from .cache import chain_keys
 
 logger = get_logger(__name__)
 
 class Transformer:
+    """
+    Base step. transform() returns either `df` itself (only when `inplace`
+    is True) or a new frame that does not share buffers with `df`.
+    """
+    # Attributes set by fit(); every other dataclass field is a parameter
+    fitted_attrs = ()
+
+    def get_params(self):
+        return {f.name: getattr(self, f.name) for f in fields(self) if f.name not in self.fitted_attrs}
     def fit(self, df: pd.DataFrame):
         return self
-    def transform(self, df: pd.DataFrame):
+    def transform(self, df: pd.DataFrame, inplace: bool = False):
+        raise NotImplementedError
+    def transform_arrays(self, arrays: dict):
+        """Online path: same transform on {column: 1-D array} without building a DataFrame."""
         raise NotImplementedError
 
 
@@ -20,18 +35,43 @@ class ImputeMedian(Transformer):
     cols: list = None
     medians: dict = None
 
+    fitted_attrs = ("medians",)
+
     def fit(self, df: pd.DataFrame):
+        self.medians = map_columns(nan_median, df, [c for c in self.cols if c in df.columns])
+        logger.info(f"Imputer medians: {self.medians}")
+        return self
+
+    def fit_report(self, report):
+        """Fit from a ValidationReport instead of rescanning the frame."""
+        self.medians = {c: report.medians[c] for c in self.cols if c in report.medians}
+        logger.info(f"Imputer medians (report): {self.medians}")
+        return self
+
+    def fit_sketches(self, sketches):
+        """Fit from streaming ColumnSketches instead of an in-memory frame."""
         self.medians = {}
         for c in self.cols:
-            if c in df.columns:
-                self.medians[c] = float(df[c].median())
-        logger.info(f"Imputer medians: {self.medians}")
+            if c in sketches.sketches:
+                self.medians[c] = sketches.quantile(c, 0.5)
+                # Later steps see the imputed column, so feed the fills back in
+                sketches.fill_nulls(c, self.medians[c])
+        logger.info(f"Imputer medians (sketch): {self.medians}")
         return self
 
-    def transform(self, df: pd.DataFrame):
-        out = df.copy()
+    def transform(self, df: pd.DataFrame, inplace: bool = False):
+        fills = {c: m for c, m in self.medians.items() if c in df.columns}
+        if inplace:
+            df.fillna(value=fills, inplace=True)
+            return df
+        return df.fillna(value=fills)
+
+    def transform_arrays(self, arrays: dict):
+        out = dict(arrays)
         for c, m in self.medians.items():
-            out[c] = out[c].fillna(m)
+            if c in out:
+                values = np.asarray(out[c], dtype=float)
+                out[c] = np.where(np.isnan(values), m, values)
         return out
 
 
@@ -42,52 +82,203 @@ class ImputeMedian(Transformer):
 class RemoveOutliersIQR(Transformer):
     cols: list = None
     k: float = 3.0
+    fitted_cols: list = None
+    lower: np.ndarray = None
+    upper: np.ndarray = None
+    drop_counts: dict = None
 
-    def transform(self, df: pd.DataFrame):
-        out = df.copy()
-        for c in self.cols:
-            if c not in out.columns:
-                continue
-            q1 = out[c].quantile(0.25)
-            q3 = out[c].quantile(0.75)
-            iqr = q3 - q1
-            lower = q1 - self.k * iqr
-            upper = q3 + self.k * iqr
-            before = len(out)
-            out = out[(out[c] >= lower) & (out[c] <= upper)]
-            after = len(out)
-            logger.info(f"Outlier removal on {c}: removed {before - after} rows (bounds {lower:.4f}..{upper:.4f})")
-        return out
+    fitted_attrs = ("fitted_cols", "lower", "upper", "drop_counts")
+
+    def _set_bounds(self, cols: list, q1: np.ndarray, q3: np.ndarray):
+        iqr = q3 - q1
+        self.fitted_cols = list(cols)
+        self.lower = q1 - self.k * iqr
+        self.upper = q3 + self.k * iqr
+        logger.info(f"Outlier bounds: {self.bounds}")
+        return self
+
+    def fit(self, df: pd.DataFrame):
+        cols = [c for c in self.cols if c in df.columns]
+        q = np.array(list(map_columns(nan_quantiles, df, cols, [0.25, 0.75]).values())).reshape(-1, 2)
+        return self._set_bounds(cols, q[:, 0], q[:, 1])
+
+    def fit_report(self, report):
+        """
+        Bounds from the post-imputation quartiles of a ValidationReport;
+        only valid when the step runs right after ImputeMedian.
+        """
+        cols = [c for c in self.cols if c in report.imputed_quartiles]
+        q = np.array([report.imputed_quartiles[c] for c in cols]).reshape(-1, 2)
+        return self._set_bounds(cols, q[:, 0], q[:, 1])
+
+    def fit_sketches(self, sketches):
+        """Freeze per-column bounds from streaming ColumnSketches."""
+        cols = [c for c in self.cols if c in sketches.sketches]
+        q = np.array([sketches.sketches[c].quantiles([0.25, 0.75]) for c in cols]).reshape(-1, 2)
+        return self._set_bounds(cols, q[:, 0], q[:, 1])
+
+    @property
+    def bounds(self):
+        return {c: (float(lo), float(hi)) for c, lo, hi in zip(self.fitted_cols, self.lower, self.upper)}
+
+    def transform(self, df: pd.DataFrame, inplace: bool = False):
+        if self.fitted_cols is None:
+            raise RuntimeError("RemoveOutliersIQR must be fitted before transform")
+
+        # Column by column on the column's own buffer, so no (rows x cols)
+        # block is built; NaN counts as out of bounds
+        keep = np.ones(len(df), dtype=bool)
+        self.drop_counts = {}
+        for c, lo, hi in zip(self.fitted_cols, self.lower, self.upper):
+            col = df[c]
+            v = col.to_numpy() if col.dtype.kind in "fiu" else col.to_numpy(dtype=float, na_value=np.nan)
+            ok = (v >= lo) & (v <= hi)
+            self.drop_counts[c] = len(ok) - int(ok.sum())
+            keep &= ok
+        logger.info(
+            f"Outlier removal: removed {len(keep) - int(keep.sum())} rows "
+            f"(per column: { {c: n for c, n in self.drop_counts.items() if n} })"
+        )
+        if inplace and keep.all():
+            return df
+        return df[keep]
+
+    def transform_arrays(self, arrays: dict):
+        # Serving must answer every row, so outliers are passed through
+        return arrays
 
 
 # ------------------------------------------------------------------------------
 # FEATURE ENGINEERING + CATEGORICAL ENCODING
 # ------------------------------------------------------------------------------
+QUALITY_LABELS = ["high", "low", "medium"]
+
+
+def _quality_label(quality: pd.Series):
+    """low (<= 4), high (>= 7), else medium, as a Categorical (NaN -> medium)."""
+    q = quality.to_numpy(dtype=float, na_value=np.nan)
+    codes = np.select([q <= 4, q >= 7], [1, 0], default=2).astype(np.int8)
+    return pd.Series(pd.Categorical.from_codes(codes, QUALITY_LABELS), index=quality.index, name=quality.name)
+
+
+def _one_hot(values, categories: list):
+    """
+    Preallocated drop_first one-hot block: column j is True where the value
+    equals categories[j + 1]. Unseen values and NaN encode as all False.
+    """
+    index = pd.Index(categories)
+    if isinstance(getattr(values, "dtype", None), pd.CategoricalDtype):
+        # Recode the (few) categories instead of hashing every value; -1 stays -1
+        recode = np.append(index.get_indexer(values.cat.categories), -1)
+        codes = recode[values.cat.codes.to_numpy()]
+    else:
+        codes = index.get_indexer(values)
+    block = np.zeros((len(codes), max(len(categories) - 1, 0)), dtype=bool)
+    hit = np.flatnonzero(codes > 0)
+    block[hit, codes[hit] - 1] = True
+    return block
+
+
 @dataclass
 class FeatureEngineering(Transformer):
-    def transform(self, df: pd.DataFrame):
-        out = df.copy()
+    """
+    Derived features plus one-hot encoding. fit() freezes the alcohol range
+    and the category vocabularies, so every transform (full frame, chunk,
+    or online row) produces the same values and the same columns.
+    """
+    alcohol_range: tuple = None
+    categories: dict = None
+
+    fitted_attrs = ("alcohol_range", "categories")
+
+    def fit(self, df: pd.DataFrame):
+        if "alcohol" in df.columns:
+            self.alcohol_range = (float(df["alcohol"].min()), float(df["alcohol"].max()))
+        # Sorted like get_dummies sorts object columns
+        self.categories = {
+            c: sorted(df[c].dropna().unique())
+            for c in df.select_dtypes(include=["object", "category"]).columns
+        }
+        if "quality" in df.columns:
+            self.categories["quality_label"] = sorted(_quality_label(df["quality"]).unique())
+        logger.info(f"Feature engineering vocabulary: {self.categories}")
+        return self
+
+    def fit_sketches(self, sketches):
+        """Fit from ColumnSketches; categorical columns must be tracked as distinct_cols."""
+        if "alcohol" in sketches.sketches:
+            sk = sketches.sketches["alcohol"]
+            self.alcohol_range = (sk.min, sk.max)
+        self.categories = {}
+        for c, values in sketches.distinct.items():
+            if c == "quality":
+                self.categories["quality_label"] = sorted(_quality_label(pd.Series(sorted(values))).unique())
+            else:
+                self.categories[c] = sorted(values)
+        return self
+
+    def _check_fitted(self):
+        if self.categories is None:
+            raise RuntimeError("FeatureEngineering must be fitted before transform")
+
+    def _alcohol_norm(self, alcohol: np.ndarray):
+        lo, hi = self.alcohol_range
+        return (alcohol - lo) / ((hi - lo) or 1.0)
+
+    def transform_arrays(self, arrays: dict):
+        self._check_fitted()
+        out = dict(arrays)
+
+        if "fixed acidity" in out and "volatile acidity" in out:
+            out["acidity_ratio"] = np.asarray(out["fixed acidity"], dtype=float) / (
+                np.asarray(out["volatile acidity"], dtype=float) + 1e-6
+            )
+
+        if "alcohol" in out and self.alcohol_range is not None:
+            out["alcohol_norm"] = self._alcohol_norm(np.asarray(out["alcohol"], dtype=float))
+
+        for c, cats in self.categories.items():
+            if c not in out:
+                continue
+            block = _one_hot(np.asarray(out.pop(c), dtype=object), cats)
+            for j, cat in enumerate(cats[1:]):
+                out[f"{c}_{cat}"] = block[:, j]
+
+        return out
+
+    def transform(self, df: pd.DataFrame, inplace: bool = False):
+        self._check_fitted()
+        out = df if inplace else df.copy()
 
         # 1) ACIDITY RATIO
         if "fixed acidity" in out.columns and "volatile acidity" in out.columns:
             out["acidity_ratio"] = out["fixed acidity"] / (out["volatile acidity"] + 1e-6)
 
-        # 2) NORMALIZED ALCOHOL
-        if "alcohol" in out.columns:
-            scaler = MinMaxScaler()
-            out["alcohol_norm"] = scaler.fit_transform(out[["alcohol"]])
+        # 2) NORMALIZED ALCOHOL (fitted range, not the batch's)
+        if "alcohol" in out.columns and self.alcohol_range is not None:
+            out["alcohol_norm"] = self._alcohol_norm(out["alcohol"].to_numpy(dtype=float, na_value=np.nan))
 
         # 3) QUALITY LABEL
         if "quality" in out.columns:
-            out["quality_label"] = out["quality"].apply(
-                lambda q: "low" if q <= 4 else ("high" if q >= 7 else "medium")
-            )
+            out["quality_label"] = _quality_label(out["quality"])
 
-        # 4) CATEGORICAL ENCODING (Fix for 'type' column)
-        categorical_cols = out.select_dtypes(include=["object", "category"]).columns.tolist()
-        if categorical_cols:
-            logger.info(f"Encoding categorical columns: {categorical_cols}")
-            out = pd.get_dummies(out, columns=categorical_cols, drop_first=True)
+        # 4) CATEGORICAL ENCODING with the fitted vocabulary -> fixed output schema
+        encoded = [c for c in self.categories if c in out.columns]
+        unknown = [
+            c for c in out.select_dtypes(include=["object", "category"]).columns
+            if c not in self.categories
+        ]
+        if unknown:
+            logger.warning(f"Categorical columns not seen during fit are left unencoded: {unknown}")
+        if encoded:
+            logger.info(f"Encoding categorical columns: {encoded}")
+            dummies = {}
+            for c in encoded:
+                cats = self.categories[c]
+                block = _one_hot(out[c], cats)
+                for j, cat in enumerate(cats[1:]):
+                    dummies[f"{c}_{cat}"] = block[:, j]
+            out = pd.concat([out.drop(columns=encoded), pd.DataFrame(dummies, index=out.index)], axis=1)
 
         return out
 
@@ -96,17 +287,104 @@ class FeatureEngineering(Transformer):
 # PIPELINE WRAPPER
 # ------------------------------------------------------------------------------
 class Pipeline:
-    def __init__(self, steps: list):
+    """
+    Chains steps. With `inplace=True` each step may modify the frame it is
+    given, including the caller's, instead of copying it; use it only on
+    frames nothing else needs, such as a freshly extracted one.
+    `columns` is the output column order of the last fit.
+    """
+    def __init__(self, steps: list, inplace: bool = False):
         self.steps = steps
+        self.inplace = inplace
+        self.columns = None
 
     def fit(self, df: pd.DataFrame):
+        self.fit_transform(df)
+        return self
+
+    def _run(self, df: pd.DataFrame, fit: bool, report=None, cache=None, source_key=None):
+        out = df
+        keys = chain_keys(source_key, self.steps) if cache is not None else None
+        start = self.cached_prefix(cache, source_key) if cache is not None else 0
+        if start:
+            # Restore the fitted state in place, so references to the steps stay valid
+            for s, key in zip(self.steps[:start], keys):
+                vars(s).update(vars(cache.load_state(key)))
+            out = cache.load_output(keys[start - 1])
+            logger.info(f"Loaded {start} of {len(self.steps)} steps from cache")
+        elif out is None:
+            raise ValueError("No input frame and no cached steps to start from")
+
+        for i, s in enumerate(self.steps[start:], start):
+            if fit and report is not None and hasattr(s, "fit_report"):
+                s.fit_report(report)
+            elif fit and hasattr(s, "fit"):
+                s.fit(out)
+            out = s.transform(out, inplace=self.inplace)
+            if keys is not None:
+                cache.put(keys[i], s, out)
+        if fit:
+            self.columns = list(out.columns)
+        return out
+
+    def cached_prefix(self, cache, source_key: str):
+        """Number of leading steps whose fitted state and output are in `cache`."""
+        n = 0
+        for key in chain_keys(source_key, self.steps):
+            if not cache.has(key):
+                break
+            n += 1
+        return n
+
+    def fit_transform(self, df: pd.DataFrame, report=None, cache=None, source_key: str = None):
+        """
+        Fit each step on the output of the steps before it. Steps with a
+        fit_report() are fitted from `report` (a ValidationReport of `df`)
+        instead, without another scan of the data.
+
+        With a StepCache and the `source_key` of the input, the longest
+        cached prefix of steps is loaded instead of recomputed (`df` may
+        then be None) and every step that runs is stored.
+        """
+        return self._run(df, fit=True, report=report, cache=cache, source_key=source_key)
+
+    def fit_sketches(self, sketches):
+        """Fit every step that supports it from streaming ColumnSketches."""
         for s in self.steps:
-            if hasattr(s, "fit"):
-                s.fit(df)
+            if hasattr(s, "fit_sketches"):
+                s.fit_sketches(sketches)
         return self
 
     def transform(self, df: pd.DataFrame):
-        out = df
+        return self._run(df, fit=False)
+
+    def transform_arrays(self, arrays: dict):
+        """
+        Online path for single rows / small batches: {column: 1-D array} in,
+        {column: 1-D array} out, using the fitted state of every step.
+        """
         for s in self.steps:
-            out = s.transform(out)
-        return out
+            arrays = s.transform_arrays(arrays)
+        return arrays
+
+    def save(self, path):
+        import joblib
+
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        joblib.dump(self, path)
+        logger.info(f"Saved fitted pipeline to: {path}")
+        return path
+
+    @staticmethod
+    def load(path):
+        import joblib
+
+        return joblib.load(path)
+
+    def transform_chunks(self, chunks):
+        """
+        Lazily apply the fitted steps to each chunk of an iterable, in order.
+        Chunks are spread over the configured parallel backend.
+        """
+        return map_chunks(self.transform, chunks)
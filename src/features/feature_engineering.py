@@ -1,10 +1,19 @@
+import numpy as np
 import pandas as pd
 from dataclasses import dataclass
 
+PH_BINS = np.array([0, 3, 3.5, 4, 10])
+PH_LABELS = ["very_acidic", "acidic", "neutral", "basic"]
+
+
 @dataclass
 class PHBucket:
-    def transform(self, df: pd.DataFrame):
-        out = df.copy()
+    def transform(self, df: pd.DataFrame, inplace: bool = False):
+        out = df if inplace else df.copy()
         if "pH" in out.columns:
-            out["pH_bucket"] = pd.cut(out["pH"], bins=[0,3,3.5,4,10], labels=["very_acidic","acidic","neutral","basic"])
+            # Same right-closed bins as pd.cut; <= 0, > 10 and NaN get code -1 (NaN)
+            ph = out["pH"].to_numpy(dtype=float, na_value=np.nan)
+            codes = np.searchsorted(PH_BINS, ph, side="left") - 1
+            codes[(codes < 0) | (codes >= len(PH_LABELS))] = -1
+            out["pH_bucket"] = pd.Categorical.from_codes(codes, PH_LABELS, ordered=True)
         return out
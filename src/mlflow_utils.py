@@ -1,5 +1,16 @@
-import mlflow
+import atexit
+import os
+import queue
+import threading
+import time
 from pathlib import Path
+from urllib.parse import unquote, urlparse
+from urllib.request import url2pathname
+
+from .utils.config import load_config, resolve_path
+from .utils.logger import get_logger
+
+logger = get_logger(__name__)
 
 # Use raw string for Windows path (NO backslash escaping issues)
 MLFLOW_TRACKING_DIR = r"D:\ML_Services\ml_ETL_project\mlruns"
@@ -7,32 +18,311 @@ MLFLOW_TRACKING_DIR = r"D:\ML_Services\ml_ETL_project\mlruns"
 # Convert Windows path → MLflow URI
 MLFLOW_URI = "file:///" + MLFLOW_TRACKING_DIR.replace("\\", "/")
 
-# Set tracking URI once
-mlflow.set_tracking_uri(MLFLOW_URI)
+_mlflow = None
+_tracking_uri = None
+
+
+def get_mlflow():
+    """
+    Import mlflow on first use and point it at the tracking store
+    (mlflow.tracking_uri in config.yaml, else MLFLOW_URI), so importing
+    this module does not pay mlflow's import cost.
+    """
+    global _mlflow, _tracking_uri
+    if _mlflow is None:
+        import mlflow
+
+        _mlflow = mlflow
+    uri = load_config().mlflow.tracking_uri or MLFLOW_URI
+    if uri.startswith("file:"):
+        # Recent mlflow refuses file stores unless opted in; mlruns/ is one
+        os.environ.setdefault("MLFLOW_ALLOW_FILE_STORE", "true")
+    if uri != _tracking_uri:
+        _mlflow.set_tracking_uri(uri)
+        _tracking_uri = uri
+    return _mlflow
+
+
+def tracking_dir():
+    """Local directory of a file-based tracking store, or None for other stores."""
+    uri = load_config().mlflow.tracking_uri or MLFLOW_URI
+    parsed = urlparse(uri)
+    if parsed.scheme == "file":
+        return Path(url2pathname(unquote(parsed.path)))
+    if not parsed.scheme or len(parsed.scheme) == 1:
+        # Plain path (a one-letter scheme is a Windows drive)
+        return resolve_path(uri)
+    return None
+
+
+# ---------------------------------------------------
+# BATCHED LOGGING
+# ---------------------------------------------------
+# Every log_param / log_metric call is a file-store write or a REST call.
+# BatchLogger buffers them instead and a background thread writes them
+# with log_batch, so the training thread only appends to a queue.
+
+# Per-request limits of MlflowClient.log_batch
+MAX_PARAMS = 100
+MAX_TAGS = 100
+MAX_ENTITIES = 1000
+
+_STOP = object()
+
+
+class BatchLogger:
+    """
+    Buffers params, metrics (with step and timestamp) and tags for one run
+    and writes them with log_batch once `max_batch` entries are pending or
+    the oldest has waited `flush_interval` seconds. Logging never blocks;
+    flush() and close() wait for the writer and re-raise its last error.
+    """
+
+    def __init__(self, run_id: str, client=None, max_batch: int = None, flush_interval: float = None):
+        cfg = load_config().mlflow
+        self.run_id = run_id
+        self.max_batch = max_batch or cfg.max_batch
+        self.flush_interval = cfg.flush_interval if flush_interval is None else flush_interval
+        self._client = client
+        self._queue = queue.SimpleQueue()
+        self._error = None
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name=f"mlflow-batch-{run_id[:8]}", daemon=True)
+        self._thread.start()
+
+    # -- producer side (training thread) --------------
+
+    def log_param(self, key: str, value):
+        self._put(("param", key, value))
+
+    def log_params(self, params: dict):
+        for k, v in params.items():
+            self._put(("param", k, v))
+
+    def log_metric(self, key: str, value: float, step: int = None, timestamp: int = None):
+        timestamp = timestamp or int(time.time() * 1000)
+        self._put(("metric", key, float(value), step or 0, timestamp))
+
+    def log_metrics(self, metrics: dict, step: int = None):
+        timestamp = int(time.time() * 1000)
+        for k, v in metrics.items():
+            self._put(("metric", k, float(v), step or 0, timestamp))
+
+    def set_tag(self, key: str, value):
+        self._put(("tag", key, value))
+
+    def set_tags(self, tags: dict):
+        for k, v in tags.items():
+            self._put(("tag", k, v))
+
+    def _put(self, item):
+        if self._closed:
+            raise RuntimeError(f"BatchLogger for run {self.run_id} is closed")
+        self._queue.put(item)
+
+    def flush(self):
+        """Block until everything logged so far is written."""
+        done = threading.Event()
+        self._queue.put(("flush", done))
+        done.wait()
+        self._raise_error()
+
+    def close(self):
+        """Flush and stop the writer thread."""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(_STOP)
+        self._thread.join()
+        self._raise_error()
+
+    def _raise_error(self):
+        error, self._error = self._error, None
+        if error is not None:
+            raise RuntimeError(f"MLflow batch logging failed for run {self.run_id}") from error
+
+    # -- writer thread ----------------------------------
+
+    def _run(self):
+        params, tags, metrics = {}, {}, []
+        deadline = None
+        while True:
+            timeout = None if deadline is None else max(deadline - time.monotonic(), 0)
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                item = None
 
+            if item is not None and item is not _STOP:
+                kind = item[0]
+                if kind == "param":
+                    # MLflow rejects duplicate keys within one batch
+                    params[item[1]] = item[2]
+                elif kind == "tag":
+                    tags[item[1]] = item[2]
+                elif kind == "metric":
+                    metrics.append(item[1:])
+                if deadline is None and kind != "flush":
+                    deadline = time.monotonic() + self.flush_interval
 
-def start_run(run_name: str, experiment: str = "wine_quality"):
+            pending = len(params) + len(tags) + len(metrics)
+            due = item is None or item is _STOP or item[0] == "flush" or pending >= self.max_batch
+            if due and pending:
+                self._write(params, tags, metrics)
+                params, tags, metrics = {}, {}, []
+            if due:
+                deadline = None
+            if item is _STOP:
+                return
+            if item is not None and item[0] == "flush":
+                item[1].set()
+
+    def _write(self, params: dict, tags: dict, metrics: list):
+        try:
+            from mlflow.entities import Metric, Param, RunTag
+
+            if self._client is None:
+                self._client = get_mlflow().MlflowClient()
+            params = [Param(k, str(v)) for k, v in params.items()]
+            tags = [RunTag(k, str(v)) for k, v in tags.items()]
+            metrics = [Metric(k, v, ts, step) for k, v, step, ts in metrics]
+            while params or tags or metrics:
+                p, params = params[:MAX_PARAMS], params[MAX_PARAMS:]
+                t, tags = tags[:MAX_TAGS], tags[MAX_TAGS:]
+                n = MAX_ENTITIES - len(p) - len(t)
+                m, metrics = metrics[:n], metrics[n:]
+                self._client.log_batch(self.run_id, metrics=m, params=p, tags=t, synchronous=True)
+        except Exception as e:
+            # Keep the writer alive; the error surfaces on flush() / close()
+            logger.warning(f"MLflow log_batch failed for run {self.run_id}: {e}")
+            self._error = e
+
+
+_loggers = {}
+_loggers_lock = threading.Lock()
+
+
+def get_batch_logger(run_id: str = None):
+    """The BatchLogger of `run_id` (default: the active run), created on first use."""
+    if run_id is None:
+        run = get_mlflow().active_run()
+        if run is None:
+            raise RuntimeError("No active MLflow run")
+        run_id = run.info.run_id
+    with _loggers_lock:
+        batch = _loggers.get(run_id)
+        if batch is None:
+            batch = _loggers[run_id] = BatchLogger(run_id)
+    return batch
+
+
+def close_batch_loggers(run_id: str = None):
+    """Flush and stop the logger of `run_id`, or of every run."""
+    with _loggers_lock:
+        batches = [_loggers.pop(run_id, None)] if run_id else list(_loggers.values())
+        if not run_id:
+            _loggers.clear()
+    for batch in batches:
+        if batch is not None:
+            batch.close()
+
+
+atexit.register(close_batch_loggers)
+
+
+# ---------------------------------------------------
+# RUNS
+# ---------------------------------------------------
+
+class _LoggedRun:
+    """mlflow.ActiveRun whose exit flushes the run's batched logs first."""
+
+    def __init__(self, run):
+        self._run = run
+
+    def __getattr__(self, name):
+        return getattr(self._run, name)
+
+    def __enter__(self):
+        return self._run
+
+    def __exit__(self, exc_type, exc, tb):
+        # A flush error must not replace the exception raised in the body
+        end_run("FINISHED" if exc_type is None else "FAILED", raise_errors=exc_type is None)
+        return False
+
+
+def start_run(run_name: str, experiment: str = "wine_quality", **kwargs):
+    mlflow = get_mlflow()
     mlflow.set_experiment(experiment)
-    return mlflow.start_run(run_name=run_name)
+    return _LoggedRun(mlflow.start_run(run_name=run_name, **kwargs))
+
+
+def end_run(status: str = "FINISHED", raise_errors: bool = True):
+    """
+    Flush the active run's batched logs, then end it. The run is ended even
+    if the flush fails; the flush error is re-raised afterwards, or only
+    logged with raise_errors=False.
+    """
+    mlflow = get_mlflow()
+    run = mlflow.active_run()
+    try:
+        if run is not None:
+            close_batch_loggers(run.info.run_id)
+    except Exception as e:
+        if raise_errors:
+            raise
+        logger.error(f"Could not flush the logs of run {run.info.run_id}: {e}")
+    finally:
+        mlflow.end_run(status)
+
+
+def log_child_run(run_name: str, params: dict = None, metrics: dict = None, tags: dict = None):
+    """
+    Record a finished child of the active run (e.g. one search trial) with
+    a single log_batch; returns its run id.
+    """
+    from mlflow.entities import Metric, Param
+
+    mlflow = get_mlflow()
+    parent = mlflow.active_run()
+    if parent is None:
+        raise RuntimeError("No active MLflow run")
+    client = mlflow.MlflowClient()
+    child = client.create_run(
+        parent.info.experiment_id,
+        run_name=run_name,
+        tags={"mlflow.parentRunId": parent.info.run_id, **(tags or {})},
+    )
+    run_id = child.info.run_id
+    timestamp = int(time.time() * 1000)
+    params = [Param(k, str(v)) for k, v in (params or {}).items()]
+    metrics = [Metric(k, float(v), timestamp, 0) for k, v in (metrics or {}).items()]
+    for i in range(0, max(len(params), 1), MAX_PARAMS):
+        client.log_batch(run_id, metrics=metrics if i == 0 else [], params=params[i:i + MAX_PARAMS], synchronous=True)
+    client.set_terminated(run_id)
+    return run_id
 
 
 def log_params(params: dict):
-    for k, v in params.items():
-        mlflow.log_param(k, v)
+    get_batch_logger().log_params(params)
+
+
+def log_metrics(metrics: dict, step: int = None):
+    get_batch_logger().log_metrics(metrics, step=step)
 
 
-def log_metrics(metrics: dict):
-    for k, v in metrics.items():
-        mlflow.log_metric(k, v)
+def set_tags(tags: dict):
+    get_batch_logger().set_tags(tags)
 
 
 def log_file(filepath: str):
     p = Path(filepath)
     if p.exists():
-        mlflow.log_artifact(str(p))
+        get_mlflow().log_artifact(str(p))
 
 
 def log_directory(dirpath: str):
     p = Path(dirpath)
     if p.exists():
-        mlflow.log_artifacts(str(p))
+        get_mlflow().log_artifacts(str(p))
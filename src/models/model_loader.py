@@ -0,0 +1,59 @@
+from pathlib import Path
+from ..utils.config import find_config_dir, load_config, resolve_path
+from ..utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_MODEL_FILE = "random_forest.joblib"
+# TRAIN__CV__FOLDS=3 overrides cv.folds in train.yaml (values are YAML-parsed)
+TRAIN_ENV_PREFIX = "TRAIN__"
+
+
+def load_train_config():
+    """Return config/train.yaml as a (cached) Config; its sections are read via get()."""
+    config_dir = find_config_dir()
+    if config_dir is None:
+        raise FileNotFoundError("config directory not found in any parent directory")
+    return load_config(str(config_dir / "train.yaml"), env_prefix=TRAIN_ENV_PREFIX)
+
+
+def default_model_path():
+    """Model artifact location from config/train.yaml (paths.models / paths.model_file)."""
+    paths = load_train_config().get("paths", {})
+    return resolve_path(Path(paths.get("models", "models")) / paths.get("model_file", DEFAULT_MODEL_FILE))
+
+
+def load_model(path=None, mmap_mode: str = "r"):
+    """
+    Load a joblib model artifact. NumPy arrays inside it are memory-mapped
+    (read-only) by default, so worker processes share the same pages.
+    """
+    import joblib
+
+    path = Path(path) if path else default_model_path()
+    if not path.exists():
+        raise FileNotFoundError(f"Model file not found: {path}")
+
+    model = joblib.load(path, mmap_mode=mmap_mode)
+    logger.info(f"Loaded model {type(model).__name__} from {path}")
+    return model
+
+
+def load_pipeline(path=None):
+    """Load the fitted ETL Pipeline saved by run_pipeline() (pipeline.artifact_path)."""
+    from ..etl.transform import Pipeline
+
+    if path:
+        path = Path(path)
+    else:
+        configured = load_config().pipeline.artifact_path
+        if not configured:
+            # Callers such as the API treat this like a missing artifact
+            raise FileNotFoundError("Pipeline artifact disabled (pipeline.artifact_path is null)")
+        path = resolve_path(configured)
+    if not path.exists():
+        raise FileNotFoundError(f"Pipeline artifact not found: {path}")
+
+    pipeline = Pipeline.load(path)
+    logger.info(f"Loaded fitted pipeline from {path}")
+    return pipeline
@@ -0,0 +1,322 @@
+"""
+Train the RandomForestRegressor described in config/train.yaml.
+
+    python -m src.models.train [--data PATH] [--search grid|random|halving] [--workers 1,2,4] [--no-mlflow]
+
+The processed dataset (read_processed(): location and format from
+config.yaml, or --data) is split into train and holdout sets. A grid or
+random search over `search.param_grid` is scored with K-fold CV on the
+train set: every (candidate, fold) fit is a task on a process pool, and
+the feature matrix is shared with the workers as a memory-mapped .npy
+file instead of being pickled per task. The best candidate is refit on
+the whole train set, scored on the holdout set, saved to
+models/random_forest.joblib and reported in reports/report_<run_id>.json.
+With several --workers counts the search is repeated for each, and the
+wall-time scaling is added to the report.
+
+The halving strategy (successive halving) scores every candidate on a
+small budget (few trees or few rows), promotes the best 1/factor of them
+to a `factor` times larger budget, and so on up to the full budget. Every
+trial is logged as a nested MLflow run with its budget, scores and CPU
+time, so the CPU cost of the strategies can be compared.
+"""
+import argparse
+import json
+import math
+import os
+import tempfile
+import time
+import uuid
+from contextlib import nullcontext
+
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestRegressor
+from sklearn.metrics import mean_squared_error, r2_score
+from sklearn.model_selection import KFold, ParameterGrid, ParameterSampler, train_test_split
+
+from .. import mlflow_utils
+from ..etl.extract import processed_columns, read_processed
+from ..utils.config import resolve_path
+from ..utils.logger import get_logger
+from ..utils.parallel import map_chunks
+from .model_loader import default_model_path, load_train_config
+
+logger = get_logger(__name__)
+
+TARGET = "quality"
+
+# Derived from the target, so training on them would leak it
+LEAKY_PREFIXES = ("quality_label",)
+
+
+# ---------------------------------------------------
+# DATA
+# ---------------------------------------------------
+
+def feature_columns(df: pd.DataFrame):
+    return [
+        c for c in df.select_dtypes(include=["number", "bool"]).columns
+        if c != TARGET and not c.startswith(LEAKY_PREFIXES)
+    ]
+
+
+def load_training_data(path: str = None):
+    """(X float32 C-contiguous, y, feature names) from the processed dataset."""
+    # Project the read by name; dtypes are only known once it is loaded
+    wanted = [c for c in processed_columns(path) if c == TARGET or not c.startswith(LEAKY_PREFIXES)]
+    df = read_processed(columns=wanted, path=path)
+    cols = feature_columns(df)
+    # float32 is what the trees use internally, so fits do not convert X again
+    X = np.ascontiguousarray(df[cols].to_numpy(dtype=np.float32))
+    y = df[TARGET].to_numpy(dtype=np.float64)
+    logger.info(f"Training data: {X.shape[0]} rows, {X.shape[1]} features")
+    return X, y, cols
+
+
+# ---------------------------------------------------
+# CROSS-VALIDATED SEARCH
+# ---------------------------------------------------
+
+def candidates(training: dict, search: dict, strategy: str = None):
+    """Parameter sets to try: the training section, overridden by each grid point."""
+    base = {k: training[k] for k in ("n_estimators", "max_depth", "random_state") if k in training}
+    grid = dict(search.get("param_grid") or {})
+    strategy = strategy or search.get("strategy", "grid")
+    if strategy == "grid":
+        points = list(ParameterGrid(grid))
+    elif strategy == "random":
+        points = list(ParameterSampler(grid, n_iter=search.get("n_iter", 10), random_state=base.get("random_state")))
+    elif strategy == "halving":
+        # The budget sets the resource, so it is not searched over
+        grid.pop((search.get("halving") or {}).get("resource", "n_estimators"), None)
+        points = list(ParameterGrid(grid))
+    else:
+        raise ValueError(f"Unknown search strategy '{strategy}', expected 'grid', 'random' or 'halving'")
+    return [{**base, **p} for p in points]
+
+
+def _fit_fold(task):
+    # Runs in a pool worker: the arrays are mapped, not unpickled
+    x_path, y_path, folds_path, fold, params = task
+    X = np.load(x_path, mmap_mode="r")
+    y = np.load(y_path, mmap_mode="r")
+    test = np.load(folds_path, mmap_mode="r") == fold
+
+    start, cpu = time.perf_counter(), time.process_time()
+    # One core per fit: the pool provides the parallelism
+    model = RandomForestRegressor(**params, n_jobs=1).fit(X[~test], y[~test])
+    fit_s = time.perf_counter() - start
+    pred = model.predict(X[test])
+    return {
+        "rmse": float(np.sqrt(mean_squared_error(y[test], pred))),
+        "r2": float(r2_score(y[test], pred)),
+        "fit_s": fit_s,
+        # Single-threaded fit, so process time is the CPU it cost
+        "cpu_s": time.process_time() - cpu,
+    }
+
+
+def cross_validate(X: np.ndarray, y: np.ndarray, params_list: list, folds: int = 5,
+                   workers: int = None, seed: int = None):
+    """
+    K-fold CV of every parameter set. All (candidate, fold) fits are
+    spread over `workers` processes; results are in `params_list` order
+    and do not depend on the worker count.
+    """
+    fold_ids = np.empty(len(y), dtype=np.int8)
+    for k, (_, test) in enumerate(KFold(folds, shuffle=True, random_state=seed).split(X)):
+        fold_ids[test] = k
+
+    with tempfile.TemporaryDirectory(prefix="train-") as tmp:
+        paths = [os.path.join(tmp, f"{name}.npy") for name in ("X", "y", "folds")]
+        for path, values in zip(paths, (X, y, fold_ids)):
+            np.save(path, values)
+
+        tasks = [(*paths, k, params) for params in params_list for k in range(folds)]
+        scores = list(map_chunks(_fit_fold, tasks, backend="process", workers=workers))
+
+    results = []
+    for i, params in enumerate(params_list):
+        fold_scores = scores[i * folds:(i + 1) * folds]
+        rmse = [s["rmse"] for s in fold_scores]
+        r2 = [s["r2"] for s in fold_scores]
+        results.append({
+            "params": params,
+            "rmse_mean": float(np.mean(rmse)),
+            "rmse_std": float(np.std(rmse)),
+            "r2_mean": float(np.mean(r2)),
+            "r2_std": float(np.std(r2)),
+            "fit_s": float(sum(s["fit_s"] for s in fold_scores)),
+            "cpu_s": float(sum(s["cpu_s"] for s in fold_scores)),
+        })
+    return results
+
+
+def successive_halving(X: np.ndarray, y: np.ndarray, params_list: list, folds: int = 5,
+                       workers: int = None, seed: int = None, resource: str = "n_estimators",
+                       min_resource: int = 25, max_resource: int = None, factor: int = 3):
+    """
+    Successive halving over `params_list`: round i runs K-fold CV of the
+    surviving candidates with a budget of min_resource * factor**i trees
+    (resource="n_estimators") or training rows ("n_samples"), capped at
+    max_resource in the last round, and keeps the best 1/factor of them.
+    Returns (best trial, all trials); trials are CV results plus round,
+    resource and budget.
+    """
+    if resource not in ("n_estimators", "n_samples"):
+        raise ValueError(f"Unknown halving resource '{resource}', expected 'n_estimators' or 'n_samples'")
+    if max_resource is None:
+        max_resource = len(y) if resource == "n_samples" else params_list[0].get("n_estimators", 100)
+    min_resource = min(min_resource, max_resource)
+    rounds = 1 + int(math.floor(math.log(max_resource / min_resource, factor) + 1e-9))
+    # One fixed row order, so a larger row budget extends the smaller one
+    order = np.random.default_rng(seed).permutation(len(y))
+
+    alive, trials = list(params_list), []
+    for i in range(rounds):
+        last = i == rounds - 1 or len(alive) == 1
+        budget = max_resource if last else int(min_resource * factor ** i)
+        if resource == "n_estimators":
+            Xb, yb = X, y
+            tried = [{**p, "n_estimators": budget} for p in alive]
+        else:
+            rows = np.sort(order[:budget])
+            Xb, yb = X[rows], y[rows]
+            tried = alive
+        results = cross_validate(Xb, yb, tried, folds, workers=workers, seed=seed)
+        for r in results:
+            r.update({"round": i, "resource": resource, "budget": budget})
+        trials.extend(results)
+        logger.info(
+            f"Halving round {i}: {len(alive)} candidates at {resource}={budget}, "
+            f"best cv r2 {max(r['r2_mean'] for r in results):.4f}"
+        )
+        if last:
+            break
+        keep = max(1, math.ceil(len(alive) / factor))
+        ranked = sorted(range(len(alive)), key=lambda j: results[j]["r2_mean"], reverse=True)
+        alive = [alive[j] for j in ranked[:keep]]
+    return max(results, key=lambda r: r["r2_mean"]), trials
+
+
+def _search(X, y, params_list: list, strategy: str, folds: int, workers: int, seed: int, search: dict):
+    """(best trial, all trials) of one search pass."""
+    if strategy == "halving":
+        halving = search.get("halving") or {}
+        return successive_halving(
+            X, y, params_list, folds, workers=workers, seed=seed,
+            resource=halving.get("resource", "n_estimators"),
+            min_resource=halving.get("min_resource", 25),
+            max_resource=halving.get("max_resource"),
+            factor=halving.get("factor", 3),
+        )
+    results = cross_validate(X, y, params_list, folds, workers=workers, seed=seed)
+    for r in results:
+        r.update({"round": 0, "resource": "n_estimators", "budget": r["params"].get("n_estimators")})
+    return max(results, key=lambda r: r["r2_mean"]), results
+
+
+# ---------------------------------------------------
+# TRAINING RUN
+# ---------------------------------------------------
+
+def train(data_path: str = None, workers: list = None, strategy: str = None, use_mlflow: bool = True):
+    """Search, refit, evaluate, save and report; returns the report dict."""
+    cfg = load_train_config()
+    training = cfg.get("training", {})
+    cv_cfg = cfg.get("cv", {})
+    search = cfg.get("search", {})
+    seed = training.get("random_state")
+    folds = cv_cfg.get("folds", 5)
+    workers = workers or [cv_cfg.get("workers") or os.cpu_count() or 1]
+    strategy = strategy or search.get("strategy", "grid")
+
+    X, y, cols = load_training_data(data_path)
+    X_train, X_test, y_train, y_test = train_test_split(
+        X, y, test_size=training.get("test_size", 0.2), random_state=seed
+    )
+    params_list = candidates(training, search, strategy)
+    logger.info(f"{strategy} search: {len(params_list)} candidates x {folds} folds")
+
+    experiment = cfg.get("mlflow", {}).get("experiment_name", "wine_quality")
+    run = mlflow_utils.start_run("random_forest_cv", experiment=experiment) if use_mlflow else nullcontext()
+    with run as active:
+        run_id = active.info.run_id if use_mlflow else uuid.uuid4().hex
+
+        best, trials, scaling = None, None, []
+        for n in workers:
+            start = time.perf_counter()
+            best, trials = _search(X_train, y_train, params_list, strategy, folds, n, seed, search)
+            scaling.append({"workers": n, "seconds": round(time.perf_counter() - start, 3)})
+            logger.info(f"CV search with {n} worker(s): {scaling[-1]['seconds']}s")
+        for s in scaling:
+            s["speedup"] = round(scaling[0]["seconds"] / s["seconds"], 2)
+        cpu_s = sum(t["cpu_s"] for t in trials)
+
+        best_params = best["params"]
+        if best["resource"] == "n_estimators" and best["budget"]:
+            best_params = {**best_params, "n_estimators": best["budget"]}
+        logger.info(
+            f"Best parameters: {best_params} (cv r2 {best['r2_mean']:.4f}); "
+            f"{len(trials)} trials, {cpu_s / 3600:.4f} CPU-hours"
+        )
+
+        # Refit on the whole train split; a DataFrame keeps feature names for serving
+        model = RandomForestRegressor(**best_params, n_jobs=training.get("n_jobs", -1))
+        model.fit(pd.DataFrame(X_train, columns=cols), y_train)
+        pred = model.predict(pd.DataFrame(X_test, columns=cols))
+        rmse = float(np.sqrt(mean_squared_error(y_test, pred)))
+        r2 = float(r2_score(y_test, pred))
+        logger.info(f"Holdout rmse {rmse:.4f}, r2 {r2:.4f}")
+
+        model_path = default_model_path()
+        model_path.parent.mkdir(parents=True, exist_ok=True)
+        joblib.dump(model, model_path)
+        logger.info(f"Saved model to {model_path}")
+
+        report = {
+            "rmse": rmse,
+            "r2": r2,
+            "run_id": run_id,
+            "best_params": best_params,
+            "features": cols,
+            "cv": {"folds": folds, "strategy": strategy, "trials": trials},
+            "cpu_seconds": round(cpu_s, 3),
+            "scaling": scaling,
+        }
+        report_dir = resolve_path(cfg.get("paths", {}).get("reports", "reports"))
+        report_dir.mkdir(parents=True, exist_ok=True)
+        report_path = report_dir / f"report_{run_id}.json"
+        report_path.write_text(json.dumps(report, indent=2))
+        logger.info(f"Saved report to {report_path}")
+
+        if use_mlflow:
+            mlflow_utils.log_params({**best_params, "cv_folds": folds, "search": strategy,
+                                     "candidates": len(params_list)})
+            for i, t in enumerate(trials):
+                mlflow_utils.log_child_run(
+                    f"trial-{i:03d}",
+                    params={**t["params"], "round": t["round"], "resource": t["resource"], "budget": t["budget"]},
+                    metrics={"cv_rmse": t["rmse_mean"], "cv_r2": t["r2_mean"], "cpu_s": t["cpu_s"]},
+                )
+            for s in scaling:
+                mlflow_utils.log_metrics({"search_seconds": s["seconds"]}, step=s["workers"])
+            mlflow_utils.log_metrics({"rmse": rmse, "r2": r2, "cpu_hours": cpu_s / 3600, "trials": len(trials)})
+            mlflow_utils.log_file(str(report_path))
+    return report
+
+
+def _worker_counts(value: str):
+    return [int(v) for v in value.split(",")]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--data", help="processed dataset (default: from config.yaml)")
+    parser.add_argument("--search", choices=["grid", "random", "halving"])
+    parser.add_argument("--workers", type=_worker_counts, help="comma-separated process counts, e.g. 1,2,4")
+    parser.add_argument("--no-mlflow", action="store_true")
+    args = parser.parse_args()
+    train(args.data, workers=args.workers, strategy=args.search, use_mlflow=not args.no_mlflow)
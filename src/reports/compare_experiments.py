@@ -1,44 +1,56 @@
-import mlflow
+import argparse
+import threading
 import pandas as pd
-import matplotlib.pyplot as plt
 from pathlib import Path
-from src.mlflow_utils import MLFLOW_TRACKING_DIR
+from src.reports.run_index import RunIndex
 
-def compare_experiments(experiments, output_dir="reports"):
+
+def _render_chart(df, chart_path: Path):
+    # Object-oriented API on an Agg canvas: no pyplot global state, so it
+    # can run off the main thread and needs no display
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    fig = Figure(figsize=(8, 5))
+    FigureCanvasAgg(fig)
+    ax = fig.subplots()
+    df.plot(x="experiment", y=["r2", "rmse"], kind="bar", ax=ax)
+    ax.set_title("Experiment Performance Comparison")
+    ax.set_ylabel("Score")
+    ax.tick_params(axis="x", labelrotation=45)
+    fig.savefig(chart_path, bbox_inches="tight")
+    print(f"Saved comparison chart → {chart_path}")
+
+
+def compare_experiments(experiments, output_dir="reports", chart: bool = True):
     """
     Compares metrics from multiple MLflow experiments and produces:
       1. A combined CSV comparison table
-      2. A bar chart comparing metrics across experiments
+      2. A bar chart comparing metrics across experiments (unless `chart` is False)
     """
-    # Set fixed MLflow tracking path
-    mlflow.set_tracking_uri(f"file:///{MLFLOW_TRACKING_DIR.replace('\\', '/')}")
-
-    client = mlflow.tracking.MlflowClient()
+    # Best runs come from the local run index, synced incrementally
     records = []
 
     # Collect metrics for each experiment
-    for name in experiments:
-        exp = client.get_experiment_by_name(name)
+    with RunIndex.from_config() as index:
+        for name in experiments:
+            if not index.has_experiment(name):
+                print(f"[SKIP] Experiment '{name}' not found.")
+                continue
 
-        if not exp:
-            print(f"[SKIP] Experiment '{name}' not found.")
-            continue
+            # Pick the best run (highest R2)
+            best_run = index.best_run(name, metric="r2")
+            if best_run is None:
+                print(f"[SKIP] No runs found for experiment '{name}'")
+                continue
 
-        runs = client.search_runs(exp.experiment_id)
-        if not runs:
-            print(f"[SKIP] No runs found for experiment '{name}'")
-            continue
-
-        # Pick the best run (highest R2)
-        best_run = max(runs, key=lambda r: r.data.metrics.get("r2", -1))
-
-        records.append({
-            "experiment": name,
-            "run_id": best_run.info.run_id,
-            "r2": best_run.data.metrics.get("r2", None),
-            "rmse": best_run.data.metrics.get("rmse", None),
-            **best_run.data.params
-        })
+            records.append({
+                "experiment": name,
+                "run_id": best_run["run_id"],
+                "r2": best_run["metrics"].get("r2", None),
+                "rmse": best_run["metrics"].get("rmse", None),
+                **best_run["params"]
+            })
 
     # Convert to dataframe
     df = pd.DataFrame(records)
@@ -47,31 +59,26 @@ def compare_experiments(experiments, output_dir="reports"):
     out = Path(output_dir)
     out.mkdir(exist_ok=True)
 
+    # Generate comparison chart in the background while the CSV is written
+    renderer = None
+    if chart and not df.empty:
+        renderer = threading.Thread(target=_render_chart, args=(df, out / "experiment_comparison.png"))
+        renderer.start()
+
     # Save CSV report
     csv_path = out / "experiment_comparison.csv"
     df.to_csv(csv_path, index=False)
     print(f"Saved comparison table → {csv_path}")
 
-    # Generate comparison chart
-    if not df.empty:
-        plt.figure(figsize=(8, 5))
-        df.plot(x="experiment", y=["r2", "rmse"], kind="bar")
-        plt.title("Experiment Performance Comparison")
-        plt.ylabel("Score")
-        plt.xticks(rotation=45)
-
-        chart_path = out / "experiment_comparison.png"
-        plt.savefig(chart_path, bbox_inches="tight")
-        plt.close()
-        print(f"Saved comparison chart → {chart_path}")
-
+    if renderer is not None:
+        renderer.join()
     return df
 
 
 if __name__ == "__main__":
-    compare_experiments([
-        "wine_quality",
-        "rf_tuned",
-        "xgboost_exp",
-        "baseline"
-    ])
+    parser = argparse.ArgumentParser(description="Compare the best runs of MLflow experiments.")
+    parser.add_argument("experiments", nargs="*", default=["wine_quality", "rf_tuned", "xgboost_exp", "baseline"])
+    parser.add_argument("--output-dir", default="reports")
+    parser.add_argument("--no-chart", action="store_true", help="skip the bar chart (and the matplotlib import)")
+    args = parser.parse_args()
+    compare_experiments(args.experiments, output_dir=args.output_dir, chart=not args.no_chart)
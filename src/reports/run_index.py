@@ -0,0 +1,304 @@
+"""
+SQLite index of a file-based MLflow store (mlruns/), for the reports.
+
+Listing runs through MlflowClient.search_runs opens every meta.yaml,
+param, tag and metric file of every run on each call. The index keeps the
+latest value of each metric, plus params, tags and run attributes, in
+SQLite. sync() only stats the run files and re-reads the runs whose
+files changed since the last sync, so reports query it in milliseconds.
+"""
+import os
+import sqlite3
+import time
+from pathlib import Path
+
+import pandas as pd
+import yaml
+
+from ..mlflow_utils import tracking_dir
+from ..utils.config import load_config, resolve_path
+from ..utils.logger import get_logger
+from ..utils.parallel import map_chunks
+
+logger = get_logger(__name__)
+
+_Loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+# mlflow.entities.RunStatus, without importing mlflow
+_STATUS = {1: "RUNNING", 2: "SCHEDULED", 3: "FINISHED", 4: "FAILED", 5: "KILLED"}
+
+# Experiment subdirectories that are not runs
+_NOT_RUNS = {"tags", "models", "traces", "datasets"}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS experiments (
+    experiment_id TEXT PRIMARY KEY,
+    name TEXT,
+    lifecycle_stage TEXT
+);
+CREATE TABLE IF NOT EXISTS runs (
+    run_id TEXT PRIMARY KEY,
+    experiment_id TEXT,
+    run_name TEXT,
+    status TEXT,
+    start_time INTEGER,
+    end_time INTEGER,
+    lifecycle_stage TEXT,
+    signature TEXT
+);
+CREATE TABLE IF NOT EXISTS metrics (
+    run_id TEXT, key TEXT, value REAL, step INTEGER, timestamp INTEGER,
+    PRIMARY KEY (run_id, key)
+);
+CREATE TABLE IF NOT EXISTS params (run_id TEXT, key TEXT, value TEXT, PRIMARY KEY (run_id, key));
+CREATE TABLE IF NOT EXISTS tags (run_id TEXT, key TEXT, value TEXT, PRIMARY KEY (run_id, key));
+CREATE INDEX IF NOT EXISTS runs_by_experiment ON runs (experiment_id);
+CREATE INDEX IF NOT EXISTS metrics_by_key ON metrics (key, value);
+"""
+
+
+# ---------------------------------------------------
+# FILE STORE SCANNING
+# ---------------------------------------------------
+
+def _read_yaml(path: Path):
+    with open(path) as f:
+        return yaml.load(f, Loader=_Loader) or {}
+
+
+def _walk(root: Path, prefix: str = ""):
+    """(key, DirEntry) for every file under root; subdirectories are '/' in keys."""
+    try:
+        entries = list(os.scandir(root))
+    except FileNotFoundError:
+        return
+    for entry in entries:
+        key = prefix + entry.name
+        if entry.is_dir():
+            yield from _walk(Path(entry.path), key + "/")
+        else:
+            yield key, entry
+
+
+def _signature(run_dir: Path):
+    """File count, total size and newest mtime of a run's metadata; stat only, no reads."""
+    st = os.stat(run_dir / "meta.yaml")
+    count, size, newest = 1, st.st_size, st.st_mtime_ns
+    for sub in ("metrics", "params", "tags"):
+        for _, entry in _walk(run_dir / sub):
+            st = entry.stat()
+            count += 1
+            size += st.st_size
+            newest = max(newest, st.st_mtime_ns)
+    # Size catches metric appends within the mtime resolution of the filesystem
+    return f"{count}:{size}:{newest}"
+
+
+def _latest_metric(path: str):
+    # Lines are "timestamp value step"; latest = highest step, then timestamp
+    best = None
+    with open(path) as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) < 2:
+                continue
+            ts, value = int(parts[0]), float(parts[1])
+            step = int(parts[2]) if len(parts) > 2 else 0
+            if best is None or (step, ts) >= (best[2], best[0]):
+                best = (ts, value, step)
+    return best
+
+
+def _read_text(path: str):
+    with open(path) as f:
+        return f.read()
+
+
+def _parse_run(run_dir: Path, meta: dict):
+    run_id = meta.get("run_id") or meta.get("run_uuid")
+    tags = {k: _read_text(e.path) for k, e in _walk(run_dir / "tags")}
+    params = {k: _read_text(e.path) for k, e in _walk(run_dir / "params")}
+    metrics = {}
+    for key, entry in _walk(run_dir / "metrics"):
+        latest = _latest_metric(entry.path)
+        if latest is not None:
+            metrics[key] = latest
+    run = (
+        run_id,
+        str(meta.get("experiment_id")),
+        meta.get("run_name") or tags.get("mlflow.runName"),
+        _STATUS.get(meta.get("status"), str(meta.get("status"))),
+        meta.get("start_time"),
+        meta.get("end_time"),
+        meta.get("lifecycle_stage", "active"),
+    )
+    return run, params, tags, metrics
+
+
+def _read_run(item):
+    run_dir, signature = item
+    meta = _read_yaml(run_dir / "meta.yaml")
+    if not (meta.get("run_id") or meta.get("run_uuid")):
+        return None
+    return (*_parse_run(run_dir, meta), signature)
+
+
+# ---------------------------------------------------
+# INDEX
+# ---------------------------------------------------
+
+class RunIndex:
+    """
+    Run catalog of the file store at `mlruns`, stored in the SQLite file
+    `path`. Call sync() to pick up new and changed runs; the store is
+    read with up to `workers` threads.
+    """
+
+    def __init__(self, path, mlruns, workers: int = 8):
+        self.path = Path(path)
+        self.mlruns = Path(mlruns)
+        self.workers = workers
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.path)
+        self._conn.executescript(_SCHEMA)
+
+    @classmethod
+    def from_config(cls, sync: bool = True):
+        mlruns = tracking_dir()
+        if mlruns is None:
+            raise ValueError("The run index needs a file-based MLflow tracking store")
+        cfg = load_config().mlflow
+        index = cls(resolve_path(cfg.index_path), mlruns, workers=cfg.fetch_workers)
+        if sync:
+            index.sync()
+        return index
+
+    def close(self):
+        self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def sync(self):
+        """
+        Bring the index up to date with the store. Runs whose files are
+        unchanged since the last sync are only stat-ed; runs that are no
+        longer in the store are dropped. Returns counts of what was done.
+        """
+        start = time.perf_counter()
+        known = dict(self._conn.execute("SELECT run_id, signature FROM runs"))
+        experiments, run_dirs = [], []
+
+        exp_dirs = [e for e in os.scandir(self.mlruns) if e.is_dir()] if self.mlruns.exists() else []
+        for exp_entry in exp_dirs:
+            exp_dir = Path(exp_entry.path)
+            if exp_entry.name.startswith(".") or not (exp_dir / "meta.yaml").exists():
+                continue
+            meta = _read_yaml(exp_dir / "meta.yaml")
+            experiments.append((str(meta.get("experiment_id")), meta.get("name"), meta.get("lifecycle_stage", "active")))
+            run_dirs.extend(
+                Path(e.path) for e in os.scandir(exp_dir)
+                if e.name not in _NOT_RUNS and e.is_dir() and os.path.exists(os.path.join(e.path, "meta.yaml"))
+            )
+
+        # Stat-ing and reading runs is I/O bound: spread it over a bounded
+        # thread pool, while this thread alone writes to SQLite
+        signatures = map_chunks(_signature, run_dirs, backend="thread", workers=self.workers)
+        seen, changed = set(), []
+        for run_dir, signature in zip(run_dirs, signatures):
+            seen.add(run_dir.name)
+            if known.get(run_dir.name) != signature:
+                changed.append((run_dir, signature))
+
+        removed = [r for r in known if r not in seen]
+        with self._conn:
+            self._conn.execute("DELETE FROM experiments")
+            self._conn.executemany("INSERT INTO experiments VALUES (?, ?, ?)", experiments)
+            for run_id in removed:
+                self._delete_run(run_id)
+            for parsed in map_chunks(_read_run, changed, backend="thread", workers=self.workers):
+                if parsed is None:
+                    continue
+                run, params, tags, metrics, signature = parsed
+                self._delete_run(run[0])
+                self._conn.execute("INSERT INTO runs VALUES (?, ?, ?, ?, ?, ?, ?, ?)", (*run, signature))
+                self._conn.executemany("INSERT INTO params VALUES (?, ?, ?)", [(run[0], k, v) for k, v in params.items()])
+                self._conn.executemany("INSERT INTO tags VALUES (?, ?, ?)", [(run[0], k, v) for k, v in tags.items()])
+                self._conn.executemany(
+                    "INSERT INTO metrics VALUES (?, ?, ?, ?, ?)",
+                    [(run[0], k, value, step, ts) for k, (ts, value, step) in metrics.items()],
+                )
+
+        stats = {"runs": len(seen), "updated": len(changed), "removed": len(removed)}
+        logger.info(f"Run index synced in {time.perf_counter() - start:.3f}s: {stats}")
+        return stats
+
+    def _delete_run(self, run_id: str):
+        for table in ("runs", "metrics", "params", "tags"):
+            self._conn.execute(f"DELETE FROM {table} WHERE run_id = ?", (run_id,))
+
+    # -- queries ------------------------------------------
+
+    def _experiment_id(self, name: str):
+        row = self._conn.execute(
+            "SELECT experiment_id FROM experiments WHERE name = ? AND lifecycle_stage = 'active'", (name,)
+        ).fetchone()
+        return row[0] if row else None
+
+    def has_experiment(self, name: str):
+        return self._experiment_id(name) is not None
+
+    def _values(self, table: str, run_ids: list):
+        marks = ",".join("?" * len(run_ids))
+        return self._conn.execute(
+            f"SELECT run_id, key, value FROM {table} WHERE run_id IN ({marks})", run_ids
+        ).fetchall()
+
+    def best_run(self, experiment: str, metric: str = "r2"):
+        """
+        Active run of `experiment` with the highest latest `metric` (runs
+        without it rank as -1), as {run_id, status, params, metrics}; None
+        if the experiment has no runs.
+        """
+        row = self._conn.execute(
+            """
+            SELECT r.run_id, r.status FROM runs r
+            JOIN experiments e ON e.experiment_id = r.experiment_id
+            LEFT JOIN metrics m ON m.run_id = r.run_id AND m.key = ?
+            WHERE e.name = ? AND e.lifecycle_stage = 'active' AND r.lifecycle_stage = 'active'
+            ORDER BY COALESCE(m.value, -1) DESC, r.start_time DESC
+            LIMIT 1
+            """,
+            (metric, experiment),
+        ).fetchone()
+        if row is None:
+            return None
+        run_id, status = row
+        return {
+            "run_id": run_id,
+            "status": status,
+            "params": {k: v for _, k, v in self._values("params", [run_id])},
+            "metrics": {k: v for _, k, v in self._values("metrics", [run_id])},
+        }
+
+    def runs_frame(self, experiment: str):
+        """One row per active run of `experiment`: run_id, status, params, then latest metrics."""
+        exp_id = self._experiment_id(experiment)
+        if exp_id is None:
+            return pd.DataFrame()
+        runs = self._conn.execute(
+            "SELECT run_id, status FROM runs WHERE experiment_id = ? AND lifecycle_stage = 'active' "
+            "ORDER BY start_time DESC",
+            (exp_id,),
+        ).fetchall()
+        if not runs:
+            return pd.DataFrame()
+        run_ids = [r for r, _ in runs]
+        records = {r: {"run_id": r, "status": s} for r, s in runs}
+        for table in ("params", "metrics"):
+            for run_id, key, value in self._values(table, run_ids):
+                records[run_id][key] = value
+        return pd.DataFrame(list(records.values()))
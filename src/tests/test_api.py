@@ -1,16 +1,118 @@
+import warnings
+
+import numpy as np
+import pandas as pd
+import pytest
 from fastapi.testclient import TestClient
+from sklearn.ensemble import RandomForestRegressor
 from src.api.app import app
+from src.etl.transform import FeatureEngineering, ImputeMedian, Pipeline
+from src.utils.config import clear_config_cache
 from src.utils.validation import validate_row_count
 
 
-client = TestClient(app)
+@pytest.fixture(scope="module")
+def model():
+    rng = np.random.default_rng(0)
+    X = pd.DataFrame({"alcohol": rng.normal(10.5, 1.2, 200), "pH": rng.normal(3.2, 0.16, 200)})
+    y = (X["alcohol"] > 10.5).astype(float) + 5
+    return RandomForestRegressor(n_estimators=10, random_state=0).fit(X, y)
+
+
+@pytest.fixture
+def client(model):
+    with TestClient(app) as c:
+        app.state.model = model
+        app.state.pipeline = None
+        yield c
+
 
-def test_root():
+def test_root(client):
     r = client.get("/")
     assert r.status_code == 200
     assert r.json()["status"] == "ok"
 
-def test_predict():
-    r = client.post("/predict", json={"name": "abc", "value": 5})
+def test_predict(client, model):
+    r = client.post("/predict", json={"features": {"pH": 3.2, "alcohol": 12.0}})
+    assert r.status_code == 200
+    expected = model.predict(pd.DataFrame({"alcohol": [12.0], "pH": [3.2]}))[0]
+    assert r.json()["prediction"] == pytest.approx(expected)
+
+
+def test_predict_batch_matches_row_by_row(client, model):
+    cols = {"alcohol": [9.0, 11.0, 12.5], "pH": [3.0, 3.3, 3.1]}
+    r = client.post("/predict/batch", json={"columns": cols})
+    assert r.status_code == 200
+    assert r.json()["predictions"] == pytest.approx(model.predict(pd.DataFrame(cols)).tolist())
+
+
+def test_predict_rejects_missing_features(client):
+    r = client.post("/predict/batch", json={"columns": {"alcohol": [10.0]}})
+    assert r.status_code == 422
+
+
+def test_predict_without_model():
+    with TestClient(app) as c:
+        app.state.model = None
+        r = c.post("/predict", json={"features": {"alcohol": 10.0}})
+    assert r.status_code == 503
+
+
+def test_app_starts_with_pipeline_artifact_disabled(monkeypatch):
+    monkeypatch.setenv("ETL__PIPELINE__ARTIFACT_PATH", "null")
+    clear_config_cache()
+    try:
+        with TestClient(app) as c:
+            assert app.state.pipeline is None
+            assert c.get("/").status_code == 200
+    finally:
+        clear_config_cache()
+
+
+def test_predict_applies_fitted_pipeline(client):
+    raw = pd.DataFrame({
+        "fixed acidity": [7.0, 6.3, 8.1, 7.2],
+        "volatile acidity": [0.27, 0.30, 0.28, 0.23],
+        "alcohol": [8.8, 9.5, 10.1, 9.9],
+        "type": ["white", "red", "white", "red"],
+    })
+    pipe = Pipeline([ImputeMedian(cols=["alcohol"]), FeatureEngineering()])
+    features = pipe.fit_transform(raw)
+    model = RandomForestRegressor(n_estimators=5, random_state=0).fit(features, [5, 6, 7, 6])
+    app.state.model, app.state.pipeline = model, pipe
+
+    row = {"fixed acidity": 7.0, "volatile acidity": 0.27, "alcohol": None, "type": "white"}
+    r = client.post("/predict", json={"features": row})
+
+    # Row 0 with alcohol imputed by the fitted median and scaled by the fitted range
+    median = raw["alcohol"].median()
+    expected = model.predict(features.iloc[[0]].assign(alcohol=median, alcohol_norm=(median - 8.8) / (10.1 - 8.8)))
+    assert r.status_code == 200
+    assert r.json()["prediction"] == pytest.approx(expected[0])
+
+
+def test_predict_passes_feature_names_to_the_model(client):
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        r = client.post("/predict/batch", json={"columns": {"pH": [3.0, 3.3], "alcohol": [9.0, 11.0]}})
+    assert r.status_code == 200
+
+
+def test_predict_orders_features_by_fitted_pipeline_for_unnamed_model(client):
+    raw = pd.DataFrame({
+        "fixed acidity": [7.0, 6.3, 8.1, 7.2],
+        "volatile acidity": [0.27, 0.30, 0.28, 0.23],
+        "alcohol": [8.8, 9.5, 10.1, 9.9],
+    })
+    pipe = Pipeline([FeatureEngineering()])
+    features = pipe.fit_transform(raw)
+    # Fitted on a bare array: the model has no feature_names_in_
+    model = RandomForestRegressor(n_estimators=5, random_state=0).fit(features.to_numpy(), [5, 6, 7, 6])
+    app.state.model, app.state.pipeline = model, pipe
+
+    row = {"alcohol": 10.1, "volatile acidity": 0.28, "fixed acidity": 8.1}
+    r = client.post("/predict", json={"features": row})
+
+    assert pipe.columns == list(features.columns)
     assert r.status_code == 200
-    assert r.json()["result"] == 10
+    assert r.json()["prediction"] == pytest.approx(model.predict(features.to_numpy()[[2]])[0])
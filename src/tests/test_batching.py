@@ -0,0 +1,80 @@
+import asyncio
+
+import numpy as np
+from src.api.batching import MicroBatcher
+
+
+def test_concurrent_requests_share_one_batch():
+    sizes = []
+
+    def predict(X):
+        sizes.append(len(X))
+        return X[:, 0] * 2
+
+    async def run():
+        batcher = await MicroBatcher(predict, max_batch_size=8, max_wait_ms=50).start()
+        try:
+            return await asyncio.gather(*(batcher.submit(np.array([float(i)])) for i in range(10)))
+        finally:
+            await batcher.stop()
+
+    results = asyncio.run(run())
+
+    assert results == [2.0 * i for i in range(10)]
+    assert sizes == [8, 2]
+
+
+def test_predict_errors_reach_every_caller():
+    def predict(X):
+        raise ValueError("boom")
+
+    async def run():
+        batcher = await MicroBatcher(predict, max_wait_ms=10).start()
+        try:
+            return await asyncio.gather(*(batcher.submit(np.zeros(1)) for _ in range(3)), return_exceptions=True)
+        finally:
+            await batcher.stop()
+
+    assert all(isinstance(r, ValueError) for r in asyncio.run(run()))
+
+
+def test_malformed_batch_does_not_stop_the_batcher():
+    async def run():
+        batcher = await MicroBatcher(lambda X: X.sum(axis=1), max_batch_size=2, max_wait_ms=50).start()
+        try:
+            # Rows of different lengths cannot be stacked into one batch
+            bad = await asyncio.wait_for(asyncio.gather(
+                batcher.submit(np.zeros(2)), batcher.submit(np.zeros(3)), return_exceptions=True
+            ), timeout=5)
+            good = await asyncio.wait_for(batcher.submit(np.ones(2)), timeout=5)
+            return bad, good
+        finally:
+            await batcher.stop()
+
+    bad, good = asyncio.run(run())
+
+    assert all(isinstance(r, ValueError) for r in bad)
+    assert good == 2.0
+
+
+def test_malformed_row_fails_only_its_own_request():
+    sizes = []
+
+    def predict(X):
+        sizes.append(len(X))
+        return X.sum(axis=1)
+
+    async def run():
+        batcher = await MicroBatcher(predict, max_batch_size=4, max_wait_ms=50, n_features=2).start()
+        try:
+            return await asyncio.wait_for(asyncio.gather(
+                batcher.submit(np.zeros(3)), batcher.submit(np.ones(2)), return_exceptions=True
+            ), timeout=5)
+        finally:
+            await batcher.stop()
+
+    bad, good = asyncio.run(run())
+
+    assert isinstance(bad, ValueError) and "Expected 2 features" in str(bad)
+    assert good == 2.0
+    assert sizes == [1]
@@ -0,0 +1,71 @@
+import pandas as pd
+from src.etl import cache as step_cache
+from src.etl.cache import StepCache, source_key
+from src.etl.transform import ImputeMedian, Pipeline, RemoveOutliersIQR
+
+
+def _pipe(k=1.5):
+    return Pipeline([ImputeMedian(cols=["a"]), RemoveOutliersIQR(cols=["a"], k=k)])
+
+
+def _source(tmp_path):
+    raw = tmp_path / "raw.csv"
+    raw.write_text("a\n1\n")
+    return source_key(raw)
+
+
+def test_cached_pipeline_resumes_without_input(tmp_path):
+    cache = StepCache(tmp_path / "cache")
+    key = _source(tmp_path)
+    df = pd.DataFrame({"a": [1.0, None, 3, 4, 100]})
+
+    first = _pipe()
+    expected = first.fit_transform(df, cache=cache, source_key=key)
+
+    second = _pipe()
+    assert second.cached_prefix(cache, key) == 2
+    out = second.fit_transform(None, cache=cache, source_key=key)
+
+    pd.testing.assert_frame_equal(out, expected)
+    assert second.steps[0].medians == first.steps[0].medians
+    assert second.steps[1].bounds == first.steps[1].bounds
+
+
+def test_changed_parameter_only_invalidates_later_steps(tmp_path):
+    cache = StepCache(tmp_path / "cache")
+    key = _source(tmp_path)
+    df = pd.DataFrame({"a": [1.0, None, 3, 4, 100]})
+    _pipe(k=1.5).fit_transform(df, cache=cache, source_key=key)
+
+    assert _pipe(k=3.0).cached_prefix(cache, key) == 1
+    out = _pipe(k=3.0).fit_transform(None, cache=cache, source_key=key)
+    pd.testing.assert_frame_equal(out, _pipe(k=3.0).fit_transform(df))
+
+
+def test_source_key_tracks_file_changes(tmp_path):
+    raw = tmp_path / "raw.csv"
+    raw.write_text("a\n1\n")
+    before = source_key(raw)
+    raw.write_text("a\n1\n2\n")
+
+    assert source_key(raw) != before
+
+
+def test_source_key_tracks_shared_code(tmp_path, monkeypatch):
+    raw = tmp_path / "raw.csv"
+    raw.write_text("a\n1\n")
+    before = source_key(raw)
+    # As if src/utils/validation.py had been edited
+    monkeypatch.setitem(step_cache._code_hashes, "src.utils.validation", "edited")
+
+    assert source_key(raw) != before
+
+
+def test_evicts_least_recently_used(tmp_path):
+    cache = StepCache(tmp_path / "cache", max_bytes=0)
+    df = pd.DataFrame({"a": [1.0, 2.0]})
+    cache.put("k1", ImputeMedian(cols=["a"]), df)
+    cache.put("k2", ImputeMedian(cols=["a"]), df)
+
+    assert not cache.has("k1")
+    assert cache.has("k2")
@@ -0,0 +1,69 @@
+import pytest
+from src.models.model_loader import load_train_config
+from src.utils.config import clear_config_cache, load_config, reload_config
+
+
+@pytest.fixture(autouse=True)
+def fresh_cache():
+    clear_config_cache()
+    yield
+    clear_config_cache()
+
+
+def test_load_config_is_cached_and_typed():
+    cfg = load_config()
+    assert load_config() is cfg
+    assert isinstance(cfg.pipeline.outlier_k, float)
+    assert "quality" in cfg.validation.required_columns
+
+
+def test_env_overrides_apply_on_reload(monkeypatch):
+    k = load_config().pipeline.outlier_k
+    monkeypatch.setenv("ETL__PIPELINE__OUTLIER_K", "1.5")
+    monkeypatch.setenv("ETL__IO__FORMAT", "parquet")
+
+    assert load_config().pipeline.outlier_k == k
+    cfg = reload_config()
+    assert cfg.pipeline.outlier_k == 1.5
+    assert cfg.io.format == "parquet"
+
+
+def test_config_file_from_env(monkeypatch, tmp_path):
+    path = tmp_path / "config.yaml"
+    path.write_text("raw_path: other.csv\nextra:\n  key: 1\n")
+    monkeypatch.setenv("ETL_CONFIG", str(path))
+
+    cfg = load_config()
+    assert cfg.raw_path == "other.csv"
+    assert cfg.get("extra") == {"key": 1}
+    assert cfg.pipeline.outlier_k == 3.0
+
+
+def test_env_overrides_are_checked_against_field_types(monkeypatch):
+    monkeypatch.setenv("ETL__PIPELINE__OUTLIER_K", "2")
+    monkeypatch.setenv("ETL__PIPELINE__CHUNKSIZE", "null")
+    monkeypatch.setenv("ETL__CACHE__DIR", "2024")
+    cfg = load_config()
+    assert cfg.pipeline.outlier_k == 2.0 and isinstance(cfg.pipeline.outlier_k, float)
+    assert cfg.pipeline.chunksize is None
+    assert cfg.cache.dir == "2024"
+
+    monkeypatch.setenv("ETL__VALIDATION__MAX_ALLOWED_VIOLATIONS", "lots")
+    with pytest.raises(ValueError, match="ETL__VALIDATION__MAX_ALLOWED_VIOLATIONS='lots': expected int"):
+        reload_config()
+    monkeypatch.delenv("ETL__VALIDATION__MAX_ALLOWED_VIOLATIONS")
+    monkeypatch.setenv("ETL__PIPELINE__OUTLIER", "2")
+    with pytest.raises(ValueError, match="unknown key 'outlier' in section 'pipeline'"):
+        reload_config()
+
+
+def test_etl_env_overrides_do_not_reach_train_config(monkeypatch):
+    folds = load_train_config().get("cv")["folds"]
+    monkeypatch.setenv("ETL__CV__FOLDS", "2")
+    monkeypatch.setenv("ETL__PATHS__MODELS", "elsewhere")
+    clear_config_cache()
+    assert load_train_config().get("cv")["folds"] == folds
+
+    monkeypatch.setenv("TRAIN__CV__FOLDS", "2")
+    clear_config_cache()
+    assert load_train_config().get("cv")["folds"] == 2
@@ -1,3 +1,4 @@
+import numpy as np
 import pandas as pd
 import pytest
 from src.utils import validation
@@ -11,3 +12,61 @@ def test_numeric_ranges_violation():
 
     with pytest.raises(validation.ValidationError):
         validation.validate_numeric_ranges(df, ranges, strict=True)
+
+
+def test_validate_frame_collects_all_errors():
+    df = pd.DataFrame({"alcohol": [9.0, 10, 11, 1000], "pH": ["a", "b", "c", "d"]})
+    report = validation.validate_frame(
+        df, required_columns=["alcohol", "quality"], numeric_cols=["alcohol"],
+        dtypes={"pH": "number"}, k=1.5,
+    )
+
+    assert not report.valid
+    assert report.missing_columns == ["quality"]
+    assert list(report.dtype_errors) == ["pH"]
+    assert report.violations == {"alcohol": {"below": 0, "above": 1}}
+    assert len(report.errors) == 3
+
+
+def test_validate_frame_matches_per_column_checks():
+    df = pd.DataFrame({"a": [1.0, None, 3, 4, 50], "b": [2.0, 2, None, None, 9]})
+    report = validation.validate_frame(df, k=1.5, max_allowed_violations=10)
+
+    assert report.valid
+    assert report.null_counts == {"a": 1, "b": 2}
+    assert report.ranges == validation.compute_iqr_ranges(df, ["a", "b"], k=1.5)
+    assert report.total_violations == validation.validate_numeric_ranges(
+        df, report.ranges, max_allowed_violations=10
+    )["total_violations"]
+
+
+def test_pipeline_fitted_from_report_matches_fit():
+    from src.etl.transform import ImputeMedian, Pipeline, RemoveOutliersIQR
+
+    df = pd.DataFrame({"a": [1.0, None, 3, 4, 50, None], "b": [2.0, 2, None, 7, 9, 1]})
+    report = validation.validate_frame(df, k=1.5)
+
+    fitted = Pipeline([ImputeMedian(cols=["a", "b"]), RemoveOutliersIQR(cols=["a", "b"], k=1.5)])
+    from_report = Pipeline([ImputeMedian(cols=["a", "b"]), RemoveOutliersIQR(cols=["a", "b"], k=1.5)])
+
+    pd.testing.assert_frame_equal(fitted.fit_transform(df), from_report.fit_transform(df, report=report))
+    assert fitted.steps[0].medians == from_report.steps[0].medians
+    assert fitted.steps[1].bounds == from_report.steps[1].bounds
+
+
+def test_validate_frame_block_stats_match_numpy_per_column():
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame(rng.normal(size=(101, 4)).round(1), columns=list("abcd"))
+    df.loc[rng.random(101) < 0.3, "b"] = np.nan
+    df["d"] = np.nan
+    report = validation.validate_frame(df, k=1.5, max_allowed_violations=101)
+
+    ranges = validation.compute_iqr_ranges(df, list("abc"), k=1.5)
+    for col in "abc":
+        values = df[col].to_numpy()
+        median = np.nanmedian(values)
+        imputed = np.where(np.isnan(values), median, values)
+        assert report.medians[col] == median
+        assert report.ranges[col] == ranges[col]
+        assert report.imputed_quartiles[col] == tuple(np.quantile(imputed, [0.25, 0.75]))
+    assert report.null_counts["d"] == 101 and np.isnan(report.medians["d"])
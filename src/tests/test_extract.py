@@ -1,5 +1,5 @@
 import pandas as pd
-from src.etl.extract import extract
+from src.etl.extract import extract, iter_extract
 from src.utils.validation import validate_row_count
 
 
@@ -7,3 +7,41 @@ def test_extract_loads_dataframe():
     df = extract()
     assert isinstance(df, pd.DataFrame)
     assert len(df) > 0
+
+
+def test_iter_extract_yields_chunks(tmp_path):
+    raw = tmp_path / "raw.csv"
+    pd.DataFrame({"a": range(10), "b": range(10)}).to_csv(raw, index=False)
+
+    chunks = list(iter_extract(str(raw), chunksize=4))
+    assert [len(c) for c in chunks] == [4, 4, 2]
+    assert pd.concat(chunks)["a"].tolist() == list(range(10))
+
+
+def test_extract_applies_read_schema(tmp_path):
+    raw = tmp_path / "raw.csv"
+    pd.DataFrame({
+        "type": ["red", "white", "red"],
+        "alcohol": [9.5, 10.0, 11.2],
+        "quality": [5, 6, 7],
+        "extra": [1.5, 2.5, 3.5],
+    }).to_csv(raw, index=False)
+
+    df = extract(str(raw))
+    assert isinstance(df["type"].dtype, pd.CategoricalDtype)
+    assert df["alcohol"].dtype == "float32"
+    assert df["quality"].dtype == "int8"
+    # Not in the schema: downcast
+    assert df["extra"].dtype == "float32"
+
+    # Projection with dtypes for columns that are not read
+    assert list(extract(str(raw), columns=["alcohol"]).columns) == ["alcohol"]
+
+
+def test_iter_extract_keeps_integer_dtype_across_chunks(tmp_path):
+    raw = tmp_path / "raw.csv"
+    pd.DataFrame({"a": [1, 2, 3, 100_000], "b": [0.5] * 4}).to_csv(raw, index=False)
+
+    chunks = list(iter_extract(str(raw), chunksize=2))
+    assert {str(c["a"].dtype) for c in chunks} == {"int64"}
+    assert all(c["b"].dtype == "float32" for c in chunks)
@@ -0,0 +1,12 @@
+import numpy as np
+import pandas as pd
+from src.features.feature_engineering import PHBucket
+
+
+def test_ph_bucket_matches_pd_cut():
+    df = pd.DataFrame({"pH": [-1.0, 0, 0.5, 3, 3.2, 3.5, 4, 7, 10, 11, np.nan]})
+    out = PHBucket().transform(df)
+
+    expected = pd.cut(df["pH"], bins=[0, 3, 3.5, 4, 10], labels=["very_acidic", "acidic", "neutral", "basic"])
+    pd.testing.assert_series_equal(out["pH_bucket"], expected, check_names=False)
+    assert "pH_bucket" not in df.columns
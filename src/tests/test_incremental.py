@@ -0,0 +1,134 @@
+import json
+
+import pandas as pd
+import pytest
+from src.etl import pipeline
+from src.etl.pipeline import read_incremental, run_pipeline_incremental
+from src.utils.config import clear_config_cache
+
+HEADER = "type,fixed acidity,volatile acidity,citric acid,residual sugar,chlorides,free sulfur dioxide," \
+         "total sulfur dioxide,density,pH,sulphates,alcohol,quality\n"
+
+
+def _rows(n, alcohol=10.0, start=0):
+    return "".join(
+        f"{'white' if i % 3 else 'red'},7.0,0.3,0.3,{5 + i % 7},0.05,30,115,0.995,3.2,0.5,{alcohol + (i % 5) / 10},{5 + i % 3}\n"
+        for i in range(start, start + n)
+    )
+
+
+@pytest.fixture(autouse=True)
+def config(monkeypatch):
+    monkeypatch.setenv("ETL__PIPELINE__ARTIFACT_PATH", "null")
+    monkeypatch.setenv("ETL__INCREMENTAL__DRIFT_MIN_ROWS", "1")
+    clear_config_cache()
+    yield
+    clear_config_cache()
+
+
+def _parts(parts_dir):
+    return sorted(p.name for p in parts_dir.glob("part-*"))
+
+
+def test_incremental_processes_only_new_complete_rows(tmp_path):
+    raw, parts = tmp_path / "raw.csv", tmp_path / "parts"
+    raw.write_text(HEADER + _rows(20))
+
+    assert run_pipeline_incremental(str(raw), str(parts)) == 20
+    assert run_pipeline_incremental(str(raw), str(parts)) == 0
+
+    # The last line is still being written
+    with open(raw, "a") as f:
+        f.write(_rows(10, start=20) + "white,7.0,0.3")
+    assert run_pipeline_incremental(str(raw), str(parts)) == 10
+    assert _parts(parts) == ["part-00000.csv", "part-00001.csv"]
+
+    first = pd.read_csv(parts / "part-00000.csv")
+    second = pd.read_csv(parts / "part-00001.csv")
+    assert list(second.columns) == list(first.columns)
+    assert len(second) == 10
+
+
+def test_incremental_refits_on_drift(tmp_path):
+    raw, parts = tmp_path / "raw.csv", tmp_path / "parts"
+    raw.write_text(HEADER + _rows(20))
+    run_pipeline_incremental(str(raw), str(parts))
+
+    with open(raw, "a") as f:
+        f.write(_rows(20, alcohol=14.0))
+
+    assert run_pipeline_incremental(str(raw), str(parts)) == 40
+    assert _parts(parts) == ["part-00001.csv"]
+
+
+def test_incremental_rebuilds_when_file_is_rewritten(tmp_path):
+    raw, parts = tmp_path / "raw.csv", tmp_path / "parts"
+    raw.write_text(HEADER + _rows(20))
+    run_pipeline_incremental(str(raw), str(parts))
+
+    raw.write_text(HEADER + _rows(5, alcohol=11.0))
+
+    assert run_pipeline_incremental(str(raw), str(parts)) == 5
+    assert _parts(parts) == ["part-00001.csv"]
+
+
+def test_rebuild_keeps_previous_history_until_watermark_is_written(tmp_path, monkeypatch):
+    raw, parts = tmp_path / "raw.csv", tmp_path / "parts"
+    raw.write_text(HEADER + _rows(20))
+    run_pipeline_incremental(str(raw), str(parts))
+    watermark = (parts / "_watermark.json").read_text()
+
+    def crash(parts_dir, state):
+        raise OSError("disk full")
+
+    raw.write_text(HEADER + _rows(5, alcohol=11.0))
+    monkeypatch.setattr(pipeline, "_write_watermark", crash)
+    with pytest.raises(OSError):
+        run_pipeline_incremental(str(raw), str(parts))
+
+    # The old history and its watermark are untouched
+    assert (parts / "_watermark.json").read_text() == watermark
+    assert len(pd.read_csv(parts / "part-00000.csv")) == 20
+
+    monkeypatch.undo()
+    assert run_pipeline_incremental(str(raw), str(parts)) == 5
+    assert _parts(parts) == ["part-00001.csv"]
+
+
+def test_rebuild_replaces_npy_parts(tmp_path, monkeypatch):
+    monkeypatch.setenv("ETL__IO__FORMAT", "npy")
+    clear_config_cache()
+    raw, parts = tmp_path / "raw.csv", tmp_path / "parts"
+    raw.write_text(HEADER + _rows(20))
+    run_pipeline_incremental(str(raw), str(parts))
+    with open(raw, "a") as f:
+        f.write(_rows(10))
+    run_pipeline_incremental(str(raw), str(parts))
+
+    raw.write_text(HEADER + _rows(5, alcohol=11.0))
+    assert run_pipeline_incremental(str(raw), str(parts)) == 5
+    assert _parts(parts) == ["part-00002.npy"]
+    assert json.loads((parts / "_watermark.json").read_text())["first_part"] == 2
+
+
+@pytest.mark.parametrize("fmt", ["csv", "npy"])
+def test_read_incremental_reads_only_the_watermarked_history(tmp_path, monkeypatch, fmt):
+    monkeypatch.setenv("ETL__IO__FORMAT", fmt)
+    clear_config_cache()
+    raw, parts = tmp_path / "raw.csv", tmp_path / "parts"
+    raw.write_text(HEADER + _rows(20))
+    run_pipeline_incremental(str(raw), str(parts))
+    with open(raw, "a") as f:
+        f.write(_rows(10, start=20))
+    run_pipeline_incremental(str(raw), str(parts))
+    assert len(read_incremental(str(parts))) == 30
+
+    # Rebuild, as if the run stopped right after writing the watermark
+    monkeypatch.setattr(pipeline, "_remove_superseded", lambda parts_dir, state: None)
+    raw.write_text(HEADER + _rows(5, alcohol=11.0))
+    run_pipeline_incremental(str(raw), str(parts))
+
+    assert len(_parts(parts)) == 3
+    df = read_incremental(str(parts), columns=["alcohol"])
+    assert list(df.columns) == ["alcohol"]
+    assert len(df) == 5
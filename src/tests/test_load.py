@@ -0,0 +1,129 @@
+import pandas as pd
+import pytest
+import numpy as np
+from src.etl.extract import extract, iter_extract, processed_columns, read_npy, read_processed
+from src.etl.load import load, load_chunks
+
+
+def test_load_chunks_appends_aligned(tmp_path):
+    out = tmp_path / "out.csv"
+    chunks = [
+        pd.DataFrame({"a": [1, 2], "type_white": [1, 0]}),
+        pd.DataFrame({"a": [3]}),
+    ]
+
+    rows = load_chunks(iter(chunks), str(out))
+
+    df = pd.read_csv(out)
+    assert rows == 3
+    assert df.columns.tolist() == ["a", "type_white"]
+    assert df["type_white"].tolist() == [1, 0, 0]
+
+
+@pytest.mark.parametrize("fmt", ["parquet", "feather", "npy"])
+def test_columnar_roundtrip_with_projection_and_filter(tmp_path, fmt):
+    if fmt != "npy":
+        pytest.importorskip("pyarrow")
+    df = pd.DataFrame({"alcohol": [9.5, 11.0, 12.5], "quality": [5, 6, 7], "type_white": [True, False, True]})
+
+    full = load(df, str(tmp_path / "out.csv"), fmt=fmt)
+    assert full.suffix == f".{fmt}"
+
+    out = extract(str(full), columns=["alcohol"], filters=[("quality", ">=", 6)])
+    assert out.columns.tolist() == ["alcohol"]
+    assert out["alcohol"].tolist() == [11.0, 12.5]
+
+
+@pytest.mark.parametrize("fmt", ["csv", "parquet", "feather", "npy"])
+def test_processed_columns_without_reading_rows(tmp_path, fmt):
+    if fmt in ("parquet", "feather"):
+        pytest.importorskip("pyarrow")
+    df = pd.DataFrame({"alcohol": [9.5, 11.0], "quality": [5, 6], "type_white": [True, False]})
+    full = load(df, str(tmp_path / "out.csv"), fmt=fmt, partition_by=())
+
+    assert processed_columns(str(full)) == ["alcohol", "quality", "type_white"]
+
+
+def test_load_chunks_parquet_keeps_schema(tmp_path):
+    pytest.importorskip("pyarrow")
+    chunks = [
+        pd.DataFrame({"a": [1.0, 2.0], "type_white": [True, False]}),
+        pd.DataFrame({"a": [3.0]}),
+    ]
+
+    load_chunks(iter(chunks), str(tmp_path / "out.parquet"))
+
+    df = extract(str(tmp_path / "out.parquet"))
+    assert df["type_white"].tolist() == [True, False, False]
+    assert [len(c) for c in iter_extract(str(tmp_path / "out.parquet"), chunksize=2)] == [2, 1]
+
+
+def test_writes_are_atomic(tmp_path):
+    def failing_chunks():
+        yield pd.DataFrame({"a": [1, 2]})
+        raise RuntimeError("transform failed")
+
+    load(pd.DataFrame({"a": [0]}), str(tmp_path / "out.csv"))
+    with pytest.raises(RuntimeError):
+        load_chunks(failing_chunks(), str(tmp_path / "out.csv"))
+
+    # The previous output is untouched and no temporary file is left behind
+    assert pd.read_csv(tmp_path / "out.csv")["a"].tolist() == [0]
+    assert [p.name for p in tmp_path.iterdir()] == ["out.csv"]
+
+
+@pytest.mark.parametrize("fmt", ["csv", "parquet"])
+def test_partitioned_dataset_prunes_partitions(tmp_path, fmt):
+    df = pd.DataFrame({"type_white": [True, False, True], "quality": [5, 6, 7], "alcohol": [9.5, 11.0, 12.5]})
+
+    root = load(df, str(tmp_path / "out.csv"), fmt=fmt, partition_by=["type_white"])
+    assert root == tmp_path / "out"
+    assert (root / "_manifest.json").exists()
+
+    # Pruned partitions are never opened
+    next((root / "type_white=False").iterdir()).write_text("corrupt")
+    out = read_processed(
+        columns=["alcohol"], filters=[("type_white", "==", True), ("quality", ">=", 6)],
+        path=str(tmp_path / f"out.{fmt}"),
+    )
+    assert out["alcohol"].tolist() == [12.5]
+
+
+def test_partitioned_rewrite_keeps_previous_generation(tmp_path):
+    import json
+
+    df = pd.DataFrame({"type_white": [True, False], "alcohol": [9.5, 11.0]})
+    runs = []
+    for _ in range(3):
+        root = load(df, str(tmp_path / "out.csv"), partition_by=["type_white"])
+        manifest = json.loads((root / "_manifest.json").read_text())
+        runs.append({root / p["path"] for p in manifest["partitions"]})
+
+    # Readers of the previous manifest can still finish; older files are gone
+    assert set(root.rglob("part-*")) == runs[1] | runs[2]
+    assert len(read_processed(path=str(tmp_path / "out.csv"))) == 2
+
+
+def test_npy_layout_is_memory_mapped(tmp_path):
+    df = pd.DataFrame({
+        "alcohol": np.array([9.5, 11.0, 12.5], dtype=np.float32),
+        "type": pd.Categorical(["red", "white", "red"]),
+        "label": ["a", "b", "a"],
+    })
+    root = load(df, str(tmp_path / "out.npy"))
+
+    out = read_npy(root)
+    values = out["alcohol"].to_numpy()
+    while values.base is not None and not isinstance(values, np.memmap):
+        values = values.base
+    assert isinstance(values, np.memmap)
+    assert out["alcohol"].dtype == np.float32
+    assert out["type"].tolist() == ["red", "white", "red"]
+    assert out["label"].tolist() == ["a", "b", "a"]
+
+    # Rewrites keep the previous generation for readers that still map it
+    load(df.assign(alcohol=np.float32(1.0)), str(root))
+    assert out["alcohol"].tolist() == [9.5, 11.0, 12.5]
+    assert read_npy(root)["alcohol"].tolist() == [1.0, 1.0, 1.0]
+    load(df, str(root))
+    assert len(list(root.glob("*.npy"))) == 2 * df.shape[1]
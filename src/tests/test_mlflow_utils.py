@@ -0,0 +1,118 @@
+import time
+
+import pytest
+
+pytest.importorskip("mlflow")
+
+from src import mlflow_utils
+from src.mlflow_utils import BatchLogger
+from src.utils.config import clear_config_cache
+
+
+class FakeClient:
+    def __init__(self, fail: bool = False):
+        self.batches = []
+        self.fail = fail
+
+    def log_batch(self, run_id, metrics=(), params=(), tags=(), synchronous=None):
+        if self.fail:
+            raise ValueError("store unavailable")
+        self.batches.append((list(metrics), list(params), list(tags)))
+
+
+def test_batch_logger_groups_calls_by_size():
+    client = FakeClient()
+    batch = BatchLogger("run", client=client, max_batch=10, flush_interval=60)
+
+    batch.log_params({f"p{i}": i for i in range(3)})
+    for step in range(25):
+        batch.log_metric("loss", 1.0 / (step + 1), step=step)
+    batch.close()
+
+    # 28 entries: two full batches of 10 and the rest at close
+    assert [sum(map(len, b)) for b in client.batches] == [10, 10, 8]
+    metrics = [m for b in client.batches for m in b[0]]
+    assert [m.step for m in metrics] == list(range(25))
+
+
+def test_batch_logger_flushes_on_interval_and_reports_errors():
+    client = FakeClient()
+    batch = BatchLogger("run", client=client, max_batch=1000, flush_interval=0.05)
+    batch.set_tag("stage", "cv")
+    deadline = time.monotonic() + 2
+    while not client.batches and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert client.batches and client.batches[0][2][0].value == "cv"
+    batch.close()
+
+    batch = BatchLogger("run", client=FakeClient(fail=True), max_batch=1000, flush_interval=60)
+    batch.log_metric("auc", 0.9)
+    with pytest.raises(RuntimeError, match="batch logging failed"):
+        batch.flush()
+    batch.close()
+
+
+def test_run_logs_reach_the_tracking_store(tmp_path, monkeypatch):
+    monkeypatch.setenv("ETL__MLFLOW__TRACKING_URI", (tmp_path / "mlruns").as_uri())
+    clear_config_cache()
+    try:
+        with mlflow_utils.start_run("batched", experiment="test") as run:
+            mlflow_utils.log_params({"n_estimators": 100, "max_depth": 8})
+            for fold in range(3):
+                mlflow_utils.log_metrics({"rmse": 0.5 + fold}, step=fold)
+
+        client = mlflow_utils.get_mlflow().MlflowClient()
+        data = client.get_run(run.info.run_id).data
+        assert data.params == {"n_estimators": "100", "max_depth": "8"}
+        history = client.get_metric_history(run.info.run_id, "rmse")
+        assert [(m.step, m.value) for m in history] == [(0, 0.5), (1, 1.5), (2, 2.5)]
+    finally:
+        clear_config_cache()
+
+
+def test_failed_flush_still_ends_the_run(tmp_path, monkeypatch):
+    monkeypatch.setenv("ETL__MLFLOW__TRACKING_URI", (tmp_path / "mlruns").as_uri())
+    clear_config_cache()
+    mlflow = mlflow_utils.get_mlflow()
+
+    def failing_logger(run_id):
+        batch = BatchLogger(run_id, client=FakeClient(fail=True), max_batch=1000, flush_interval=60)
+        mlflow_utils._loggers[run_id] = batch
+        batch.log_metric("rmse", 0.5)
+
+    try:
+        # The body's exception wins over the flush error
+        with pytest.raises(KeyError):
+            with mlflow_utils.start_run("body-error", experiment="test") as run:
+                failing_logger(run.info.run_id)
+                raise KeyError("body")
+        assert mlflow.active_run() is None
+
+        # Without one, the flush error surfaces after the run has ended
+        with pytest.raises(RuntimeError, match="batch logging failed"):
+            with mlflow_utils.start_run("flush-error", experiment="test") as run:
+                failing_logger(run.info.run_id)
+        assert mlflow.active_run() is None
+
+        with mlflow_utils.start_run("next", experiment="test"):
+            pass
+    finally:
+        mlflow.end_run()
+        clear_config_cache()
+
+
+def test_child_runs_are_nested_under_the_active_run(tmp_path, monkeypatch):
+    monkeypatch.setenv("ETL__MLFLOW__TRACKING_URI", (tmp_path / "mlruns").as_uri())
+    clear_config_cache()
+    try:
+        with mlflow_utils.start_run("search", experiment="test") as parent:
+            child_id = mlflow_utils.log_child_run(
+                "trial_0", params={"max_depth": 8}, metrics={"r2_mean": 0.4}, tags={"round": 0}
+            )
+
+        child = mlflow_utils.get_mlflow().MlflowClient().get_run(child_id)
+        assert child.data.tags["mlflow.parentRunId"] == parent.info.run_id
+        assert child.data.params == {"max_depth": "8"} and child.data.metrics == {"r2_mean": 0.4}
+        assert child.info.status == "FINISHED"
+    finally:
+        clear_config_cache()
@@ -1,6 +1,8 @@
 import joblib
+import pytest
 from pathlib import Path
-from src.models.model_loader import load_model
+from src.models.model_loader import load_model, load_pipeline
+from src.utils.config import clear_config_cache
 
 def test_load_model(tmp_path):
     model_path = tmp_path / "dummy.pkl"
@@ -8,3 +10,13 @@ def test_load_model(tmp_path):
 
     model = load_model(model_path)
     assert model["a"] == 1
+
+
+def test_load_pipeline_without_artifact_path(monkeypatch):
+    monkeypatch.setenv("ETL__PIPELINE__ARTIFACT_PATH", "null")
+    clear_config_cache()
+    try:
+        with pytest.raises(FileNotFoundError, match="artifact_path"):
+            load_pipeline()
+    finally:
+        clear_config_cache()
@@ -0,0 +1,52 @@
+import numpy as np
+import pandas as pd
+import pytest
+from src.utils.config import clear_config_cache
+from src.utils.parallel import count_outside, map_chunks, map_columns, nan_quantiles
+
+
+@pytest.fixture(autouse=True)
+def no_min_rows(monkeypatch):
+    # Let the pools handle toy frames
+    monkeypatch.setenv("ETL__PARALLEL__MIN_ROWS", "0")
+    clear_config_cache()
+    yield
+    clear_config_cache()
+
+
+def _frame():
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame(rng.normal(size=(1000, 4)), columns=list("abcd"))
+    df.loc[::7, "b"] = np.nan
+    return df
+
+
+@pytest.mark.parametrize("backend", ["thread", "process"])
+def test_map_columns_matches_serial(backend):
+    df = _frame()
+    serial = map_columns(nan_quantiles, df, df.columns, [0.25, 0.75], backend="serial")
+    result = map_columns(nan_quantiles, df, df.columns, [0.25, 0.75], backend=backend, workers=2)
+
+    assert list(result) == list(df.columns)
+    for c in df.columns:
+        np.testing.assert_array_equal(result[c], serial[c])
+
+
+def test_map_columns_per_column_args():
+    df = pd.DataFrame({"a": [1.0, 5, 10], "b": [0.0, None, 3]})
+    counts = map_columns(count_outside, df, ["a", "b"], per_column={"a": (2, 8), "b": (1, 2)},
+                         backend="thread", workers=2)
+
+    assert counts == {"a": (1, 1), "b": (1, 1)}
+
+
+def test_map_chunks_keeps_order():
+    chunks = [pd.DataFrame({"a": [i] * 3}) for i in range(10)]
+    out = list(map_chunks(lambda c: c["a"].sum(), chunks, backend="thread", workers=3))
+
+    assert out == [3 * i for i in range(10)]
+
+
+def test_unknown_backend_raises():
+    with pytest.raises(ValueError):
+        map_columns(nan_quantiles, _frame(), ["a"], [0.5], backend="gpu")
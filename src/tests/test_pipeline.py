@@ -0,0 +1,114 @@
+import pandas as pd
+import pytest
+from src.etl.pipeline import run_pipeline, run_pipeline_streaming
+from src.utils.config import clear_config_cache
+from src.utils.validation import ValidationError
+
+HEADER = "type,fixed acidity,volatile acidity,citric acid,residual sugar,chlorides,free sulfur dioxide," \
+         "total sulfur dioxide,density,pH,sulphates,alcohol,quality\n"
+
+
+def _rows(n, outliers=0):
+    return "".join(
+        f"{'white' if i % 3 else 'red'},{7 + i % 4 / 10},0.3,0.3,{5 + i % 7},0.05,{30 + i % 9},115,0.995,"
+        f"3.2,0.5,{(40 if i < outliers else 10) + (i % 5) / 10},{5 + i % 3}\n"
+        for i in range(n)
+    )
+
+
+@pytest.fixture(autouse=True)
+def config(monkeypatch):
+    monkeypatch.setenv("ETL__PIPELINE__ARTIFACT_PATH", "null")
+    monkeypatch.setenv("ETL__CACHE__ENABLED", "false")
+    monkeypatch.setenv("ETL__VALIDATION__MAX_ALLOWED_VIOLATIONS", "2")
+    clear_config_cache()
+    yield
+    clear_config_cache()
+
+
+def test_streaming_matches_in_memory_pipeline(tmp_path):
+    raw = tmp_path / "raw.csv"
+    raw.write_text(HEADER + _rows(60, outliers=2))
+
+    expected = run_pipeline(str(raw), str(tmp_path / "full.csv"))
+    rows = run_pipeline_streaming(chunksize=7, raw_path=str(raw), processed_path=str(tmp_path / "stream.csv"))
+
+    streamed = pd.read_csv(tmp_path / "stream.csv")
+    assert rows == len(expected) == 58
+    pd.testing.assert_frame_equal(
+        streamed, pd.read_csv(tmp_path / "full.csv"), check_dtype=False, check_exact=False
+    )
+
+
+def test_streaming_rejects_too_many_violations_like_in_memory_pipeline(tmp_path):
+    raw = tmp_path / "raw.csv"
+    raw.write_text(HEADER + _rows(60, outliers=3))
+
+    with pytest.raises(ValidationError, match="3 > 2"):
+        run_pipeline(str(raw), str(tmp_path / "full.csv"))
+    with pytest.raises(ValidationError, match="3 > 2"):
+        run_pipeline_streaming(chunksize=7, raw_path=str(raw), processed_path=str(tmp_path / "stream.csv"))
+    assert not (tmp_path / "stream.csv").exists()
+
+
+def test_streaming_fits_categories_on_rows_kept_by_outlier_removal(tmp_path):
+    raw = tmp_path / "raw.csv"
+    # The only 'rose' row is an outlier, so neither mode may encode it
+    raw.write_text(HEADER + _rows(60, outliers=2).replace("red,", "rose,", 1))
+
+    run_pipeline(str(raw), str(tmp_path / "full.csv"))
+    run_pipeline_streaming(chunksize=7, raw_path=str(raw), processed_path=str(tmp_path / "stream.csv"))
+
+    full = pd.read_csv(tmp_path / "full.csv")
+    streamed = pd.read_csv(tmp_path / "stream.csv")
+    assert "type_rose" not in full.columns
+    assert list(streamed.columns) == list(full.columns)
+    assert streamed["alcohol_norm"].max() == pytest.approx(full["alcohol_norm"].max())
+
+
+def test_schema_change_misses_the_step_cache(tmp_path, monkeypatch):
+    raw = tmp_path / "raw.csv"
+    raw.write_text(HEADER + _rows(60))
+    monkeypatch.setenv("ETL__CACHE__DIR", str(tmp_path / "cache"))
+    clear_config_cache()
+
+    first = run_pipeline(str(raw), str(tmp_path / "out.csv"), use_cache=True)
+    monkeypatch.setenv("ETL__SCHEMA__DTYPES", '{"type": "category"}')
+    monkeypatch.setenv("ETL__SCHEMA__DOWNCAST", "false")
+    clear_config_cache()
+    second = run_pipeline(str(raw), str(tmp_path / "out.csv"), use_cache=True)
+
+    assert first["alcohol"].dtype == "float32"
+    assert second["alcohol"].dtype == "float64"
+
+
+def test_validation_settings_are_part_of_the_cache_key(tmp_path, monkeypatch):
+    raw = tmp_path / "raw.csv"
+    raw.write_text(HEADER + _rows(200))
+    monkeypatch.setenv("ETL__CACHE__DIR", str(tmp_path / "cache"))
+    monkeypatch.setenv("ETL__VALIDATION__MAX_ALLOWED_VIOLATIONS", "10")
+    monkeypatch.setenv("ETL__PIPELINE__OUTLIER_K", "3.0")
+    clear_config_cache()
+    run_pipeline(str(raw), str(tmp_path / "out.csv"), use_cache=True)
+
+    # Far tighter ranges: the cached imputer must not let the rows skip validation
+    monkeypatch.setenv("ETL__PIPELINE__OUTLIER_K", "0.01")
+    clear_config_cache()
+    with pytest.raises(ValidationError, match="> 10"):
+        run_pipeline(str(raw), str(tmp_path / "out.csv"), use_cache=True)
+
+
+def test_cached_run_takes_numeric_columns_from_the_full_read(tmp_path, monkeypatch):
+    raw = tmp_path / "raw.csv"
+    # 'batch' looks numeric in the first 1000 rows only
+    rows = [f"{line},{'x' if i == 1100 else i % 3}" for i, line in enumerate(_rows(1200).splitlines())]
+    raw.write_text(HEADER.replace("\n", ",batch\n") + "\n".join(rows) + "\n")
+    monkeypatch.setenv("ETL__CACHE__DIR", str(tmp_path / "cache"))
+    clear_config_cache()
+
+    first = run_pipeline(str(raw), str(tmp_path / "out.csv"), use_cache=True)
+    second = run_pipeline(str(raw), str(tmp_path / "out.csv"), use_cache=True)
+
+    # Read as text, so it is one-hot encoded rather than imputed
+    assert "batch_x" in first.columns
+    pd.testing.assert_frame_equal(first, second)
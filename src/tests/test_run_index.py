@@ -0,0 +1,76 @@
+import shutil
+
+import pytest
+
+pytest.importorskip("mlflow")
+
+from src import mlflow_utils
+from src.reports.compare_experiments import compare_experiments
+from src.reports.generate_run_comparison import generate_report
+from src.reports.run_index import RunIndex
+from src.utils.config import clear_config_cache
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    monkeypatch.setenv("ETL__MLFLOW__TRACKING_URI", (tmp_path / "mlruns").as_uri())
+    monkeypatch.setenv("ETL__MLFLOW__INDEX_PATH", str(tmp_path / "index.sqlite"))
+    clear_config_cache()
+    yield tmp_path
+    clear_config_cache()
+
+
+def _log_run(name, r2, **params):
+    with mlflow_utils.start_run(name, experiment="wine_quality") as run:
+        mlflow_utils.log_params(params)
+        mlflow_utils.log_metrics({"r2": r2 - 0.1}, step=0)
+        mlflow_utils.log_metrics({"r2": r2, "rmse": 1 - r2}, step=1)
+    return run.info.run_id
+
+
+def test_index_picks_best_run_from_latest_metrics(store):
+    _log_run("a", 0.6, max_depth=4)
+    best = _log_run("b", 0.8, max_depth=8)
+
+    with RunIndex.from_config() as index:
+        run = index.best_run("wine_quality")
+        assert run["run_id"] == best
+        assert run["metrics"]["r2"] == pytest.approx(0.8)
+        assert run["params"] == {"max_depth": "8"}
+        assert index.best_run("missing") is None
+
+    out = store / "runs.csv"
+    generate_report("wine_quality", output=str(out))
+    assert out.read_text().count("\n") == 3
+
+
+def test_sync_rereads_only_changed_runs(store):
+    first = _log_run("a", 0.6)
+    second = _log_run("b", 0.7)
+
+    with RunIndex.from_config(sync=False) as index:
+        assert index.sync() == {"runs": 2, "updated": 2, "removed": 0}
+        assert index.sync() == {"runs": 2, "updated": 0, "removed": 0}
+
+        client = mlflow_utils.get_mlflow().MlflowClient()
+        client.log_metric(first, "r2", 0.9, step=2)
+        assert index.sync()["updated"] == 1
+        assert index.best_run("wine_quality")["run_id"] == first
+
+        run_dir = next((store / "mlruns").glob(f"*/{second}"))
+        shutil.rmtree(run_dir)
+        assert index.sync() == {"runs": 1, "updated": 0, "removed": 1}
+        assert index.runs_frame("wine_quality")["run_id"].tolist() == [first]
+
+
+def test_compare_experiments_with_and_without_chart(store):
+    pytest.importorskip("matplotlib")
+    best = _log_run("b", 0.8, max_depth=8)
+    _log_run("a", 0.6, max_depth=4)
+
+    df = compare_experiments(["wine_quality", "missing"], output_dir=str(store / "no_chart"), chart=False)
+    assert df["run_id"].tolist() == [best]
+    assert not (store / "no_chart" / "experiment_comparison.png").exists()
+
+    compare_experiments(["wine_quality"], output_dir=str(store / "chart"))
+    assert (store / "chart" / "experiment_comparison.png").stat().st_size > 0
@@ -0,0 +1,77 @@
+import numpy as np
+import pandas as pd
+import pytest
+from src.etl.extract import extract
+from src.etl.transform import ImputeMedian, RemoveOutliersIQR
+from src.utils.sketch import QuantileSketch, sketch_columns
+
+EPS = 0.005
+
+
+def _rank_error(values, estimate, q):
+    """Distance between q and the range of ranks `estimate` occupies in `values`."""
+    values = np.sort(values[~np.isnan(values)])
+    lo = np.searchsorted(values, estimate, side="left") / len(values)
+    hi = np.searchsorted(values, estimate, side="right") / len(values)
+    return 0.0 if lo <= q <= hi else min(abs(lo - q), abs(hi - q))
+
+
+def _wine_like(n=200_000, seed=0):
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        "fixed acidity": rng.normal(7.2, 1.3, n),
+        "residual sugar": rng.lognormal(1.3, 0.8, n),
+        "pH": rng.normal(3.22, 0.16, n),
+        "quality": rng.integers(3, 10, n).astype(float),
+    })
+    df.loc[rng.random(n) < 0.01, "pH"] = np.nan
+    return df
+
+
+def _assert_matches_pandas(df, cols):
+    chunks = [df.iloc[i:i + 10_000] for i in range(0, len(df), 10_000)]
+    sketches = sketch_columns(chunks, cols, eps=EPS)
+
+    for c in cols:
+        exact = df[c].quantile([0.25, 0.5, 0.75])
+        for q in (0.25, 0.5, 0.75):
+            approx = sketches.quantile(c, q)
+            assert _rank_error(df[c].to_numpy(dtype=float), approx, q) <= EPS
+            assert approx == pytest.approx(exact[q], rel=0.05)
+
+
+def test_sketch_matches_pandas_on_wine_like_data():
+    df = _wine_like()
+    _assert_matches_pandas(df, list(df.columns))
+
+
+def test_sketch_matches_pandas_on_wine_dataset():
+    try:
+        df = extract()
+    except FileNotFoundError:
+        pytest.skip("wine dataset not available")
+    cols = list(df.select_dtypes("number").columns)
+    _assert_matches_pandas(df, cols)
+
+
+def test_sketch_merge_across_workers():
+    x = np.random.default_rng(1).lognormal(size=100_000)
+    merged = QuantileSketch(eps=EPS)
+    for part in np.array_split(x, 4):
+        merged.merge(QuantileSketch(eps=EPS).update(part))
+
+    assert merged.n == len(x)
+    for q in (0.25, 0.5, 0.75):
+        assert _rank_error(x, merged.quantile(q), q) <= EPS
+
+
+def test_fit_sketches_close_to_exact_fit():
+    df = _wine_like()
+    sketches = sketch_columns([df], ["pH"], eps=EPS)
+
+    imputer = ImputeMedian(cols=["pH"]).fit_sketches(sketches)
+    remover = RemoveOutliersIQR(cols=["pH"], k=1.5).fit_sketches(sketches)
+
+    assert imputer.medians["pH"] == pytest.approx(df["pH"].median(), rel=0.01)
+    low, high = remover.bounds["pH"]
+    assert low < df["pH"].median() < high
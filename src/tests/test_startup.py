@@ -0,0 +1,41 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+
+# Cumulative import budget per module; override on slow CI machines
+BUDGET_MS = float(os.environ.get("ETL_IMPORT_BUDGET_MS", 3000))
+HEAVY = ("sklearn", "mlflow", "matplotlib")
+
+
+def _importtime(module: str):
+    """Return {module: cumulative_us} from `python -X importtime -c 'import <module>'`."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=PROJECT_ROOT, capture_output=True, text=True, check=True,
+    )
+    times = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+@pytest.mark.parametrize("module", [
+    "src.etl.pipeline",
+    "src.api.app",
+    "src.mlflow_utils",
+    "src.reports.compare_experiments",
+])
+def test_import_is_lazy_and_within_budget(module):
+    times = _importtime(module)
+
+    heavy = sorted({name.split(".")[0] for name in times} & set(HEAVY))
+    assert not heavy, f"{module} eagerly imports {heavy}"
+    assert times[module] / 1000 < BUDGET_MS
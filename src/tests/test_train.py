@@ -0,0 +1,90 @@
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+from src.models.train import cross_validate, feature_columns, load_training_data, successive_halving, train
+from src.utils.config import clear_config_cache
+
+PARAMS = [
+    {"n_estimators": 5, "max_depth": 3, "random_state": 0},
+    {"n_estimators": 5, "max_depth": 6, "random_state": 0},
+]
+
+
+def _processed(n=300, seed=0):
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        "alcohol": rng.normal(10.5, 1.2, n),
+        "pH": rng.normal(3.2, 0.16, n),
+        "type_white": rng.random(n) < 0.75,
+    })
+    df["quality"] = (3 + df["alcohol"] / 3 + rng.normal(0, 0.3, n)).round()
+    df["quality_label_high"] = df["quality"] >= 7
+    return df
+
+
+def test_feature_columns_drop_target_and_derived_labels():
+    assert feature_columns(_processed(10)) == ["alcohol", "pH", "type_white"]
+
+
+def test_load_training_data_skips_leaky_columns(tmp_path):
+    data = tmp_path / "processed.csv"
+    _processed(10).to_csv(data, index=False)
+
+    X, y, cols = load_training_data(str(data))
+
+    assert cols == ["alcohol", "pH", "type_white"]
+    assert X.shape == (10, 3) and X.dtype == np.float32 and len(y) == 10
+
+
+def test_cross_validate_is_independent_of_worker_count():
+    df = _processed()
+    X = df[["alcohol", "pH"]].to_numpy(dtype=np.float32)
+    y = df["quality"].to_numpy()
+
+    serial = cross_validate(X, y, PARAMS, folds=3, workers=1, seed=0)
+    pooled = cross_validate(X, y, PARAMS, folds=3, workers=2, seed=0)
+
+    assert [r["params"] for r in serial] == PARAMS
+    for a, b in zip(serial, pooled):
+        assert a["rmse_mean"] == b["rmse_mean"] and a["r2_mean"] == b["r2_mean"]
+
+
+def test_successive_halving_promotes_best_candidates():
+    df = _processed()
+    X = df[["alcohol", "pH"]].to_numpy(dtype=np.float32)
+    y = df["quality"].to_numpy()
+    params = [{"max_depth": d, "random_state": 0} for d in (1, 2, 4, 8)]
+
+    best, trials = successive_halving(X, y, params, folds=3, workers=1, seed=0,
+                                      min_resource=2, max_resource=8, factor=2)
+
+    assert [(t["round"], t["budget"]) for t in trials] == [(0, 2)] * 4 + [(1, 4)] * 2 + [(2, 8)]
+    assert best is trials[-1] and best["params"]["n_estimators"] == 8
+    # Survivors are the best of the previous round
+    round0 = sorted(trials[:4], key=lambda t: t["r2_mean"], reverse=True)
+    assert [t["params"]["max_depth"] for t in trials[4:6]] == [t["params"]["max_depth"] for t in round0[:2]]
+    assert all(t["cpu_s"] > 0 for t in trials)
+
+
+def test_train_saves_model_and_report(tmp_path, monkeypatch):
+    data = tmp_path / "processed.csv"
+    _processed().to_csv(data, index=False)
+    monkeypatch.setenv("TRAIN__SEARCH__PARAM_GRID", '{"n_estimators": [5], "max_depth": [3, 6]}')
+    monkeypatch.setenv("TRAIN__CV__FOLDS", "3")
+    monkeypatch.setenv("TRAIN__PATHS__MODELS", str(tmp_path / "models"))
+    monkeypatch.setenv("TRAIN__PATHS__REPORTS", str(tmp_path / "reports"))
+    clear_config_cache()
+    try:
+        report = train(str(data), workers=[1, 2], use_mlflow=False)
+    finally:
+        clear_config_cache()
+
+    assert (tmp_path / "models" / "random_forest.joblib").exists()
+    saved = json.loads((tmp_path / "reports" / f"report_{report['run_id']}.json").read_text())
+    assert saved["features"] == ["alcohol", "pH", "type_white"]
+    assert len(saved["cv"]["trials"]) == 2
+    assert saved["cpu_seconds"] > 0
+    assert [s["workers"] for s in saved["scaling"]] == [1, 2]
+    assert saved["r2"] == pytest.approx(report["r2"])
@@ -1,5 +1,6 @@
+import numpy as np
 import pandas as pd
-from src.etl.transform import ImputeMedian
+from src.etl.transform import FeatureEngineering, ImputeMedian, Pipeline, RemoveOutliersIQR
 
 def test_impute_median():
     df = pd.DataFrame({
@@ -11,3 +12,104 @@ def test_impute_median():
     df2 = imputer.transform(df)
 
     assert df2["a"].isna().sum() == 0
+
+
+def test_pipeline_transform_chunks_matches_transform():
+    df = pd.DataFrame({"a": [1, None, 3, None, 5]})
+    pipe = Pipeline([ImputeMedian(cols=["a"])]).fit(df)
+
+    chunks = [df.iloc[:2], df.iloc[2:]]
+    streamed = pd.concat(pipe.transform_chunks(chunks))
+
+    pd.testing.assert_frame_equal(streamed, pipe.transform(df))
+
+
+def test_remove_outliers_uses_fitted_bounds():
+    train = pd.DataFrame({"a": [1.0, 2, 3, 4, 5], "b": [10.0, 20, 30, 40, 50]})
+    remover = RemoveOutliersIQR(cols=["a", "b"], k=1.5).fit(train)
+
+    batch = pd.DataFrame({"a": [3.0, 100, 3, None], "b": [30.0, 30, 500, 30]})
+    out = remover.transform(batch)
+
+    assert out.index.tolist() == [0]
+    assert remover.drop_counts == {"a": 2, "b": 1}
+    # Bounds are frozen at fit time, not recomputed from the batch
+    assert remover.bounds["a"] == (-1.0, 7.0)
+
+
+def test_remove_outliers_matches_across_column_dtypes():
+    train = pd.DataFrame({"a": [1.0, 2, 3, 4, 5], "b": [10.0, 20, 30, 40, 50]})
+    remover = RemoveOutliersIQR(cols=["a", "b"], k=1.5).fit(train)
+
+    batch = pd.DataFrame({"a": [3.0, 100, 3, None], "b": [30.0, 30, 500, 30]})
+    expected = remover.transform(batch).index.tolist()
+    narrow = batch.astype({"a": "float32", "b": "Int64"})
+
+    assert remover.transform(narrow).index.tolist() == expected
+    assert remover.drop_counts == {"a": 2, "b": 1}
+
+
+def test_remove_outliers_independent_of_column_order():
+    df = pd.DataFrame({"a": [1.0, 2, 3, 50, 4, 5], "b": [1.0, 90, 2, 3, 4, 5]})
+    ab = RemoveOutliersIQR(cols=["a", "b"], k=1.5).fit(df).transform(df)
+    ba = RemoveOutliersIQR(cols=["b", "a"], k=1.5).fit(df).transform(df)
+
+    pd.testing.assert_frame_equal(ab, ba)
+
+
+def test_pipeline_does_not_mutate_callers_frame():
+    df = pd.DataFrame({"a": [1.0, None, 3.0]})
+    pipe = Pipeline([ImputeMedian(cols=["a"])]).fit(df)
+
+    out = pipe.transform(df)
+    assert df["a"].isna().sum() == 1
+    assert out["a"].isna().sum() == 0
+
+    # An in-place pipeline imputes the frame it is given rather than a copy
+    pipe.inplace = True
+    assert pipe.transform(df) is df
+    assert df["a"].isna().sum() == 0
+
+
+def test_transform_arrays_matches_dataframe_path():
+    df = pd.DataFrame({
+        "fixed acidity": [7.0, 6.3, 8.1],
+        "volatile acidity": [0.27, None, 0.28],
+        "alcohol": [8.8, 9.5, 10.1],
+        "type": ["white", "red", "white"],
+    })
+    pipe = Pipeline([ImputeMedian(cols=["volatile acidity"]), FeatureEngineering()])
+    expected = pipe.fit_transform(df)
+
+    arrays = {c: df[c].to_numpy() for c in df.columns}
+    out = pipe.transform_arrays(arrays)
+
+    assert sorted(out) == sorted(expected.columns)
+    for c in expected.columns:
+        np.testing.assert_allclose(out[c].astype(float), expected[c].to_numpy(dtype=float))
+
+
+def test_feature_engineering_is_consistent_across_chunks():
+    df = pd.DataFrame({
+        "alcohol": [8.0, 10.0, 12.0, 9.0],
+        "quality": [3, 5, 8, 6],
+        "type": ["red", "white", "white", "white"],
+    })
+    fe = FeatureEngineering().fit(df)
+    full = fe.transform(df)
+
+    # A chunk with a single category and a narrower alcohol range
+    chunk = fe.transform(df.iloc[1:3])
+
+    assert chunk.columns.tolist() == full.columns.tolist()
+    pd.testing.assert_frame_equal(chunk, full.iloc[1:3])
+
+
+def test_quality_label_is_categorical():
+    df = pd.DataFrame({"quality": [3, 4, 5, 7, 9, None]})
+    fe = FeatureEngineering().fit(df)
+
+    assert fe.categories["quality_label"] == ["high", "low", "medium"]
+    out = fe.transform(df)
+    assert out["quality_label_low"].tolist() == [True, True, False, False, False, False]
+    assert out["quality_label_medium"].tolist() == [False, False, True, False, False, True]
@@ -0,0 +1,301 @@
+import logging
+import os
+import threading
+import yaml
+from dataclasses import dataclass, field, fields, is_dataclass
+from pathlib import Path
+from typing import Optional, Union, get_args, get_origin
+
+logger = logging.getLogger(__name__)
+
+# ETL_CONFIG=/path/to/config.yaml picks another file;
+# ETL__PIPELINE__OUTLIER_K=2.5 overrides pipeline.outlier_k in that file only
+# (values are YAML-parsed, then checked against the field's type)
+CONFIG_ENV = "ETL_CONFIG"
+ENV_PREFIX = "ETL__"
+
+
+# ---------------------------------------------------
+# TYPED SECTIONS
+# ---------------------------------------------------
+
+@dataclass(frozen=True)
+class ValidationConfig:
+    required_columns: tuple = ()
+    # {column: dtype name, or "number" for any numeric dtype}
+    dtypes: Optional[dict] = None
+    max_allowed_violations: int = 1000
+
+
+@dataclass(frozen=True)
+class SchemaConfig:
+    engine: str = "pyarrow"
+    usecols: tuple = ()
+    dtypes: Optional[dict] = None
+    parse_dates: tuple = ()
+    downcast: bool = True
+
+
+@dataclass(frozen=True)
+class PipelineConfig:
+    outlier_k: float = 3.0
+    chunksize: Optional[int] = None
+    sketch_eps: float = 0.001
+    inplace: bool = True
+    artifact_path: Optional[str] = "models/etl_pipeline.joblib"
+
+
+@dataclass(frozen=True)
+class IOConfig:
+    format: str = "csv"
+    compression: str = "zstd"
+    row_group_size: int = 100_000
+    partition_by: tuple = ()
+
+
+@dataclass(frozen=True)
+class ServingConfig:
+    micro_batching: bool = True
+    max_batch_size: int = 64
+    max_wait_ms: float = 10.0
+
+
+@dataclass(frozen=True)
+class ParallelConfig:
+    backend: str = "serial"
+    workers: Optional[int] = None
+    min_rows: int = 100_000
+
+
+@dataclass(frozen=True)
+class CacheConfig:
+    enabled: bool = False
+    dir: str = ".cache/etl"
+    max_bytes: int = 2 * 1024 ** 3
+
+
+@dataclass(frozen=True)
+class IncrementalConfig:
+    parts_dir: str = "data/processed/wine_processed_parts"
+    drift_threshold: float = 0.5
+    drift_min_rows: int = 1000
+
+
+@dataclass(frozen=True)
+class MlflowConfig:
+    tracking_uri: Optional[str] = None
+    max_batch: int = 1000
+    flush_interval: float = 2.0
+    index_path: str = ".cache/mlflow_runs.sqlite"
+    fetch_workers: int = 8
+
+
+@dataclass(frozen=True)
+class LoggingConfig:
+    level: str = "INFO"
+
+
+def _section(cls, values):
+    values = values or {}
+    kwargs = {}
+    for f in fields(cls):
+        if f.name in values:
+            v = values[f.name]
+            kwargs[f.name] = tuple(v) if isinstance(v, list) else v
+    return cls(**kwargs)
+
+
+@dataclass(frozen=True)
+class Config:
+    """
+    Typed, read-only view of config.yaml. Known keys are exposed as
+    attributes; `get()` keeps dict-style access to anything else.
+    """
+    raw_path: Optional[str] = None
+    processed_path: Optional[str] = None
+    log_path: Optional[str] = None
+    validation: ValidationConfig = field(default_factory=ValidationConfig)
+    schema: SchemaConfig = field(default_factory=SchemaConfig)
+    pipeline: PipelineConfig = field(default_factory=PipelineConfig)
+    io: IOConfig = field(default_factory=IOConfig)
+    serving: ServingConfig = field(default_factory=ServingConfig)
+    parallel: ParallelConfig = field(default_factory=ParallelConfig)
+    cache: CacheConfig = field(default_factory=CacheConfig)
+    incremental: IncrementalConfig = field(default_factory=IncrementalConfig)
+    mlflow: MlflowConfig = field(default_factory=MlflowConfig)
+    logging: LoggingConfig = field(default_factory=LoggingConfig)
+    path: Optional[Path] = None
+    data: dict = field(default_factory=dict, repr=False)
+
+    @classmethod
+    def from_dict(cls, data: dict, path: Path = None):
+        return cls(
+            raw_path=data.get("raw_path"),
+            processed_path=data.get("processed_path"),
+            log_path=data.get("log_path"),
+            validation=_section(ValidationConfig, data.get("validation")),
+            schema=_section(SchemaConfig, data.get("schema")),
+            pipeline=_section(PipelineConfig, data.get("pipeline")),
+            io=_section(IOConfig, data.get("io")),
+            serving=_section(ServingConfig, data.get("serving")),
+            parallel=_section(ParallelConfig, data.get("parallel")),
+            cache=_section(CacheConfig, data.get("cache")),
+            incremental=_section(IncrementalConfig, data.get("incremental")),
+            mlflow=_section(MlflowConfig, data.get("mlflow")),
+            logging=_section(LoggingConfig, data.get("logging")),
+            path=path,
+            data=data,
+        )
+
+    def get(self, key: str, default=None):
+        return self.data.get(key, default)
+
+
+# ---------------------------------------------------
+# LOADING
+# ---------------------------------------------------
+
+def find_config_dir():
+    """Walk upward from this file until a folder containing config/config.yaml is found."""
+    current = Path(__file__).resolve()
+    while current != current.parent:
+        if (current / "config" / "config.yaml").exists():
+            return current / "config"
+        current = current.parent
+    return None
+
+
+def project_root():
+    """Directory that holds config/; relative paths in the config are resolved against it."""
+    config_dir = find_config_dir()
+    return config_dir.parent if config_dir else Path.cwd()
+
+
+def resolve_path(path):
+    """Absolute path for a config-relative (or already absolute) path."""
+    return (project_root() / path).resolve()
+
+
+def _field_types(cls):
+    return {f.name: f.type for f in fields(cls)}
+
+
+def _coerce(key: str, raw: str, value, tp):
+    """
+    Check the YAML-parsed override `value` (env text `raw`) against a field
+    type. Ints widen to float, lists become tuples, and scalars given for a
+    string field keep their text (e.g. dir: 2024).
+    """
+    optional = get_origin(tp) is Union and type(None) in get_args(tp)
+    if optional:
+        tp = next(a for a in get_args(tp) if a is not type(None))
+    if value is None and optional:
+        return None
+    if tp is float and isinstance(value, int) and not isinstance(value, bool):
+        return float(value)
+    if tp is tuple and isinstance(value, list):
+        return tuple(value)
+    if tp is str and isinstance(value, (int, float)):
+        return raw
+    if isinstance(value, tp) and not (tp is int and isinstance(value, bool)):
+        return value
+    expected = f"{tp.__name__} or null" if optional else tp.__name__
+    raise ValueError(f"{key}={value!r}: expected {expected}, got {type(value).__name__}")
+
+
+def _typed_override(key: str, parts: list, raw: str):
+    """Validate an override of a typed Config field; untyped sections pass through."""
+    value = yaml.safe_load(raw)
+    tp = _field_types(Config).get(parts[0])
+    if tp is None or parts[0] in ("path", "data"):
+        return value
+    if is_dataclass(tp):
+        if len(parts) == 1:
+            raise ValueError(f"{key}: '{parts[0]}' is a section; override one of its keys")
+        section = _field_types(tp)
+        if parts[1] not in section:
+            raise ValueError(f"{key}: unknown key '{parts[1]}' in section '{parts[0]}'")
+        tp = section[parts[1]]
+        if len(parts) > 2:
+            if dict not in (tp, *get_args(tp)):
+                raise ValueError(f"{key}: '{parts[0]}.{parts[1]}' is not a mapping")
+            # Entries of a mapping field (e.g. schema.dtypes) are not typed
+            return value
+        return _coerce(key, raw, value, tp)
+    if len(parts) > 1:
+        raise ValueError(f"{key}: '{parts[0]}' is not a section")
+    return _coerce(key, raw, value, tp)
+
+
+def _apply_env_overrides(data: dict, prefix: str, typed: bool = True):
+    """
+    Apply PREFIX + SECTION__KEY environment variables to `data`. With
+    `typed`, values for Config fields must match the field's type.
+    """
+    for key, value in os.environ.items():
+        if not key.startswith(prefix):
+            continue
+        parts = key[len(prefix):].lower().split("__")
+        value = _typed_override(key, parts, value) if typed else yaml.safe_load(value)
+        node = data
+        for part in parts[:-1]:
+            if not isinstance(node.get(part), dict):
+                node[part] = {}
+            node = node[part]
+        node[parts[-1]] = value
+    return data
+
+
+_cache = {}
+_lock = threading.Lock()
+
+
+def _read(path: Optional[Path], env_prefix: Optional[str]):
+    data = {}
+    if path is None:
+        logger.warning("config.yaml not found in any parent directory")
+    else:
+        with open(path, "r") as f:
+            data = yaml.safe_load(f) or {}
+    if env_prefix:
+        data = _apply_env_overrides(data, env_prefix, typed=env_prefix == ENV_PREFIX)
+    return Config.from_dict(data, path=path)
+
+
+def load_config(path: str = None, env_prefix: str = None):
+    """
+    Return the process-wide Config, parsing the YAML only on first use.
+    ETL__ environment overrides apply to the main config (config.yaml or
+    ETL_CONFIG) only; another file takes untyped overrides from
+    `env_prefix`, if given. Overrides are applied at load time; call
+    reload_config() after changing them.
+    """
+    if path is None:
+        path = os.environ.get(CONFIG_ENV)
+        env_prefix = ENV_PREFIX
+
+    # Keyed by the requested path so a cache hit needs no filesystem access
+    key = (path, env_prefix)
+    cfg = _cache.get(key)
+    if cfg is None:
+        with _lock:
+            cfg = _cache.get(key)
+            if cfg is None:
+                if path is None:
+                    config_dir = find_config_dir()
+                    full = config_dir / "config.yaml" if config_dir else None
+                else:
+                    full = Path(path).resolve()
+                cfg = _cache[key] = _read(full, env_prefix)
+    return cfg
+
+
+def clear_config_cache():
+    """Forget every loaded config; the next load_config() re-reads the file."""
+    with _lock:
+        _cache.clear()
+
+
+def reload_config(path: str = None):
+    clear_config_cache()
+    return load_config(path)
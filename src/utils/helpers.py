@@ -0,0 +1,97 @@
+import numpy as np
+import pandas as pd
+from pathlib import Path
+
+# ---------------------------------------------------
+# FILE FORMATS
+# ---------------------------------------------------
+
+FORMAT_SUFFIXES = {
+    "csv": ".csv",
+    "parquet": ".parquet",
+    "feather": ".feather",
+    # Directory with one memory-mappable .npy file per column
+    "npy": ".npy",
+}
+
+# Index file of a partitioned directory dataset written by load()
+MANIFEST = "_manifest.json"
+
+# Index file of an npy directory written by load()
+NPY_SCHEMA = "_schema.json"
+
+_SUFFIX_FORMATS = {
+    ".csv": "csv",
+    ".parquet": "parquet",
+    ".pq": "parquet",
+    ".feather": "feather",
+    ".arrow": "feather",
+    ".ipc": "feather",
+    ".npy": "npy",
+}
+
+
+def infer_format(path, default: str = "csv"):
+    """Guess the file format from the path suffix."""
+    return _SUFFIX_FORMATS.get(Path(path).suffix.lower(), default)
+
+
+def with_format_suffix(path, fmt: str):
+    """Return `path` with the suffix that matches `fmt`."""
+    if fmt not in FORMAT_SUFFIXES:
+        raise ValueError(f"Unsupported format '{fmt}', expected one of {list(FORMAT_SUFFIXES)}")
+    return Path(path).with_suffix(FORMAT_SUFFIXES[fmt])
+
+
+# ---------------------------------------------------
+# ROW FILTERS
+# ---------------------------------------------------
+
+_OPS = {
+    "==": np.equal,
+    "=": np.equal,
+    "!=": np.not_equal,
+    "<": np.less,
+    "<=": np.less_equal,
+    ">": np.greater,
+    ">=": np.greater_equal,
+}
+
+
+def filter_mask(df, filters: list):
+    """
+    Evaluate pyarrow-style filters [(col, op, value), ...] (AND-ed) on a
+    DataFrame. Used where the reader cannot push the predicate down.
+    """
+    mask = np.ones(len(df), dtype=bool)
+    for col, op, value in filters:
+        values = df[col]
+        if op == "in":
+            mask &= values.isin(value).to_numpy()
+        elif op == "not in":
+            mask &= ~values.isin(value).to_numpy()
+        elif op in _OPS:
+            mask &= _OPS[op](values.to_numpy(), value)
+        else:
+            raise ValueError(f"Unsupported filter operator '{op}'")
+    return mask
+
+
+# ---------------------------------------------------
+# DTYPES
+# ---------------------------------------------------
+
+def downcast(df, integers: bool = True):
+    """
+    Shrink numeric columns in place: float64 -> float32, and (if
+    `integers`) ints to the smallest type that holds their range. Integer
+    downcasting depends on the data, so chunked readers skip it to keep
+    every chunk on the same dtypes.
+    """
+    for col in df.columns:
+        dtype = df[col].dtype
+        if dtype.kind == "f" and dtype.itemsize > 4:
+            df[col] = df[col].astype(np.float32)
+        elif integers and dtype.kind in "iu" and dtype.itemsize > 1:
+            df[col] = pd.to_numeric(df[col], downcast="integer" if dtype.kind == "i" else "unsigned")
+    return df
@@ -1,37 +1,11 @@
-import logging, sys, yaml
-from pathlib import Path
+import logging, sys
 
-def load_config(path: str = None):
-    """
-    Load config.yaml reliably from project root.
-    Works regardless of nesting level.
-    """
-    # Start from the directory where logger.py lives
-    current = Path(__file__).resolve()
-
-    # Walk upward until we find folder that contains "config/config.yaml"
-    while current != current.parent:
-        cfg_path = current / "config" / "config.yaml"
-        if cfg_path.exists():
-            break
-        current = current.parent
-    else:
-        print("CONFIG NOT FOUND IN ANY PARENT DIRECTORY")
-        return {}
-
-    if path:
-        cfg_path = Path(path)
-
-    print("USING CONFIG:", cfg_path)
-
-    with open(cfg_path, "r") as f:
-        return yaml.safe_load(f)
+# Re-exported for modules that still import it from here
+from .config import load_config
 
 
 def get_logger(name: str, level: str = None):
-    cfg = load_config()
-
-    level = level or cfg.get("logging", {}).get("level", "INFO")
+    level = level or load_config().logging.level
 
     logger = logging.getLogger(name)
 
@@ -0,0 +1,166 @@
+import atexit
+import os
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+
+from .config import load_config
+
+# serial:  plain loop in the calling thread
+# thread:  ThreadPoolExecutor; the NumPy kernels below release the GIL
+# process: ProcessPoolExecutor; columns are copied once into a shared memory
+#          block that the workers attach to, instead of pickling each column
+BACKENDS = ("serial", "thread", "process")
+
+
+# ---------------------------------------------------
+# COLUMN KERNELS
+# ---------------------------------------------------
+# Module-level so the process backend can pickle them. Every backend runs
+# the same kernel on the same float64 column, so results do not depend on
+# the backend or the number of workers.
+
+def nan_median(values: np.ndarray):
+    return float(np.nanmedian(values))
+
+
+def nan_quantiles(values: np.ndarray, qs):
+    return np.nanquantile(values, qs)
+
+
+def count_outside(values: np.ndarray, low: float, high: float):
+    """(values below low, values above high); NaN counts as neither."""
+    return int((values < low).sum()), int((values > high).sum())
+
+
+# ---------------------------------------------------
+# POOLS
+# ---------------------------------------------------
+
+_pools = {}
+_lock = threading.Lock()
+
+
+def _settings(backend: str = None, workers: int = None):
+    cfg = load_config().parallel
+    backend = backend or cfg.backend
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown parallel backend '{backend}', expected one of {list(BACKENDS)}")
+    workers = workers or cfg.workers or os.cpu_count() or 1
+    return backend, workers, cfg.min_rows
+
+
+def _get_pool(backend: str, workers: int, purpose: str):
+    # Column and chunk work use separate pools, so a chunk task that computes
+    # column statistics cannot deadlock waiting on its own pool
+    key = (backend, workers, purpose)
+    with _lock:
+        pool = _pools.get(key)
+        if pool is None:
+            cls = ThreadPoolExecutor if backend == "thread" else ProcessPoolExecutor
+            pool = _pools[key] = cls(max_workers=workers)
+    return pool
+
+
+def shutdown_pools():
+    """Stop every pool started by this module."""
+    with _lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+atexit.register(shutdown_pools)
+
+
+# ---------------------------------------------------
+# PER-COLUMN MAP
+# ---------------------------------------------------
+
+def _column(df: pd.DataFrame, col: str):
+    return df[col].to_numpy(dtype=float, na_value=np.nan)
+
+
+def _shared_call(name: str, shape: tuple, i: int, fn, args: tuple):
+    shm = shared_memory.SharedMemory(name=name)
+    try:
+        block = np.ndarray(shape, dtype=np.float64, buffer=shm.buf)
+        result = fn(block[i], *args)
+        del block
+        return result
+    finally:
+        shm.close()
+
+
+def _map_shared(fn, df: pd.DataFrame, cols: list, args: list, pool):
+    shape = (len(cols), len(df))
+    shm = shared_memory.SharedMemory(create=True, size=max(shape[0] * shape[1] * 8, 1))
+    block = None
+    try:
+        # Row i holds column i, contiguous, so workers read it without copying
+        block = np.ndarray(shape, dtype=np.float64, buffer=shm.buf)
+        for i, c in enumerate(cols):
+            block[i] = _column(df, c)
+        futures = [pool.submit(_shared_call, shm.name, shape, i, fn, a) for i, a in enumerate(args)]
+        return [f.result() for f in futures]
+    finally:
+        del block
+        shm.close()
+        shm.unlink()
+
+
+def map_columns(fn, df: pd.DataFrame, cols: list, *args, per_column: dict = None,
+                backend: str = None, workers: int = None):
+    """
+    Apply fn(values, *per_column[col], *args) to each column as a float64
+    array. Returns {col: result} in `cols` order. Backend and pool size
+    default to the `parallel` section of config.yaml; frames with fewer
+    than `parallel.min_rows` rows are always processed serially.
+    """
+    cols = list(cols)
+    per_column = per_column or {}
+    col_args = [tuple(per_column.get(c, ())) + args for c in cols]
+    backend, workers, min_rows = _settings(backend, workers)
+
+    if backend == "serial" or workers == 1 or len(cols) < 2 or len(df) < min_rows:
+        results = [fn(_column(df, c), *a) for c, a in zip(cols, col_args)]
+    elif backend == "thread":
+        pool = _get_pool(backend, workers, "columns")
+        futures = [pool.submit(fn, _column(df, c), *a) for c, a in zip(cols, col_args)]
+        results = [f.result() for f in futures]
+    else:
+        results = _map_shared(fn, df, cols, col_args, _get_pool(backend, workers, "columns"))
+    return dict(zip(cols, results))
+
+
+# ---------------------------------------------------
+# PER-CHUNK MAP
+# ---------------------------------------------------
+
+def map_chunks(fn, chunks, backend: str = None, workers: int = None):
+    """
+    Lazily yield fn(chunk) for each chunk, in input order. At most
+    2 * workers chunks are in flight, so memory stays bounded. With the
+    process backend fn and each chunk are pickled, so fn must not rely on
+    mutating shared state.
+    """
+    backend, workers, _ = _settings(backend, workers)
+    if backend == "serial" or workers == 1:
+        for chunk in chunks:
+            yield fn(chunk)
+        return
+
+    pool = _get_pool(backend, workers, "chunks")
+    pending = deque()
+    for chunk in chunks:
+        pending.append(pool.submit(fn, chunk))
+        del chunk
+        if len(pending) >= 2 * workers:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
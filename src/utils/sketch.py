@@ -0,0 +1,174 @@
+import numpy as np
+import pandas as pd
+
+
+# ---------------------------------------------------
+# KLL-STYLE QUANTILE SKETCH
+# ---------------------------------------------------
+
+class QuantileSketch:
+    """
+    Mergeable streaming quantile sketch (KLL style).
+
+    Values are kept in levels of compactors; an item at level h stands for
+    2**h original values. When a level overflows it is sorted and every
+    other item is promoted to the next level. Memory is O(k log(n / k))
+    and the rank error of `quantile()` stays within roughly `eps * n`.
+    """
+
+    def __init__(self, eps: float = 0.001, seed: int = 0):
+        if not 0 < eps < 1:
+            raise ValueError(f"eps must be in (0, 1), got {eps}")
+        self.eps = eps
+        self.k = max(16, int(np.ceil(3.0 / eps)))
+        self.n = 0
+        self.min = np.inf
+        self.max = -np.inf
+        self.levels = [np.empty(0)]
+        self._rng = np.random.default_rng(seed)
+
+    def _capacity(self, h: int):
+        depth = len(self.levels) - 1 - h
+        return max(2, int(np.ceil(self.k * (2 / 3) ** depth)))
+
+    def _compact(self, h: int):
+        buf = np.sort(self.levels[h])
+        # An odd item out stays at this level so total weight is preserved
+        keep, buf = buf[len(buf) - len(buf) % 2:], buf[:len(buf) - len(buf) % 2]
+        if h + 1 == len(self.levels):
+            self.levels.append(np.empty(0))
+        offset = int(self._rng.integers(2))
+        self.levels[h + 1] = np.concatenate([self.levels[h + 1], buf[offset::2]])
+        self.levels[h] = keep
+
+    def _compress(self):
+        while True:
+            over = [h for h, lvl in enumerate(self.levels) if len(lvl) > self._capacity(h)]
+            if not over:
+                return
+            self._compact(over[0])
+
+    def update(self, values):
+        """Add an array of values; NaNs are ignored."""
+        values = np.asarray(values, dtype=float).ravel()
+        values = values[~np.isnan(values)]
+        if not len(values):
+            return self
+        self.n += len(values)
+        self.min = min(self.min, float(values.min()))
+        self.max = max(self.max, float(values.max()))
+        self.levels[0] = np.concatenate([self.levels[0], values])
+        self._compress()
+        return self
+
+    def add_repeated(self, value: float, count: int):
+        """Add `count` copies of `value` exactly (binary decomposition over levels)."""
+        count = int(count)
+        if count <= 0:
+            return self
+        self.n += count
+        self.min = min(self.min, float(value))
+        self.max = max(self.max, float(value))
+        h = 0
+        while count:
+            if count & 1:
+                while h >= len(self.levels):
+                    self.levels.append(np.empty(0))
+                self.levels[h] = np.append(self.levels[h], value)
+            count >>= 1
+            h += 1
+        self._compress()
+        return self
+
+    def merge(self, other: "QuantileSketch"):
+        """Merge another sketch (e.g. from another chunk or worker) into this one."""
+        while len(self.levels) < len(other.levels):
+            self.levels.append(np.empty(0))
+        for h, lvl in enumerate(other.levels):
+            self.levels[h] = np.concatenate([self.levels[h], lvl])
+        self.n += other.n
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self._compress()
+        return self
+
+    def quantiles(self, qs):
+        """Approximate quantiles for an array of probabilities in [0, 1]."""
+        qs = np.asarray(qs, dtype=float)
+        if self.n == 0:
+            return np.full(qs.shape, np.nan)
+        values = np.concatenate(self.levels)
+        weights = np.concatenate([np.full(len(lvl), 2 ** h) for h, lvl in enumerate(self.levels)])
+        order = np.argsort(values, kind="stable")
+        values, cum = values[order], np.cumsum(weights[order])
+        idx = np.searchsorted(cum, qs * (self.n - 1) + 1, side="left")
+        out = values[np.clip(idx, 0, len(values) - 1)]
+        out = np.where(qs <= 0, self.min, out)
+        return np.where(qs >= 1, self.max, out)
+
+    def quantile(self, q: float):
+        return float(self.quantiles([q])[0])
+
+
+# ---------------------------------------------------
+# PER-COLUMN SKETCHES
+# ---------------------------------------------------
+
+class ColumnSketches:
+    """
+    One QuantileSketch per column plus null counts, fed chunk by chunk.
+    Low-cardinality columns listed in `distinct_cols` (e.g. categoricals)
+    keep their exact set of distinct values instead.
+    Mergeable, so chunks can be sketched by separate workers.
+    """
+
+    def __init__(self, cols: list, eps: float = 0.001, distinct_cols: list = None):
+        self.cols = list(cols)
+        self.eps = eps
+        self.rows = 0
+        self.sketches = {c: QuantileSketch(eps=eps) for c in self.cols}
+        self.nulls = {c: 0 for c in self.cols}
+        self.distinct = {c: set() for c in distinct_cols or []}
+
+    def update(self, df: pd.DataFrame):
+        self.rows += len(df)
+        for c, values in self.distinct.items():
+            if c in df.columns:
+                values.update(df[c].dropna().unique().tolist())
+        for c in self.cols:
+            if c not in df.columns:
+                continue
+            values = df[c].to_numpy(dtype=float, na_value=np.nan)
+            self.nulls[c] += int(np.isnan(values).sum())
+            self.sketches[c].update(values)
+        return self
+
+    def merge(self, other: "ColumnSketches"):
+        self.rows += other.rows
+        for c in other.cols:
+            if c not in self.sketches:
+                self.cols.append(c)
+                self.sketches[c] = QuantileSketch(eps=self.eps)
+                self.nulls[c] = 0
+            self.sketches[c].merge(other.sketches[c])
+            self.nulls[c] += other.nulls[c]
+        for c, values in other.distinct.items():
+            self.distinct.setdefault(c, set()).update(values)
+        return self
+
+    def quantile(self, col: str, q: float):
+        return self.sketches[col].quantile(q)
+
+    def fill_nulls(self, col: str, value: float):
+        """Account for nulls imputed with `value`, as a downstream step would see them."""
+        self.sketches[col].add_repeated(value, self.nulls[col])
+        self.nulls[col] = 0
+        return self
+
+
+def sketch_columns(chunks, cols: list, eps: float = 0.001, distinct_cols: list = None):
+    """Build ColumnSketches for `cols` in a single pass over an iterable of chunks."""
+    sketches = ColumnSketches(cols, eps=eps, distinct_cols=distinct_cols)
+    for chunk in chunks:
+        sketches.update(chunk)
+    return sketches
@@ -1,6 +1,8 @@
 import numpy as np
 import pandas as pd
 import logging
+from dataclasses import dataclass, field
+from .parallel import count_outside, map_columns, nan_quantiles
 
 logger = logging.getLogger(__name__)
 
@@ -58,13 +60,9 @@ def compute_iqr_ranges(df: pd.DataFrame, cols: list, k: float = 1.5):
     Returns dict {col: (low, high)}
     """
     ranges = {}
+    cols = [c for c in cols if c in df.columns]
 
-    for col in cols:
-        if col not in df.columns:
-            continue
-
-        q1 = df[col].quantile(0.25)
-        q3 = df[col].quantile(0.75)
+    for col, (q1, q3) in map_columns(nan_quantiles, df, cols, [0.25, 0.75]).items():
         iqr = q3 - q1
 
         low = q1 - k * iqr
@@ -75,6 +73,27 @@ def compute_iqr_ranges(df: pd.DataFrame, cols: list, k: float = 1.5):
     return ranges
 
 
+def compute_iqr_ranges_sketch(sketches, cols: list, k: float = 1.5):
+    """
+    Same as compute_iqr_ranges() but from streaming ColumnSketches,
+    so the data never has to be held in memory.
+    Returns dict {col: (low, high)}
+    """
+    ranges = {}
+
+    for col in cols:
+        if col not in sketches.sketches:
+            continue
+
+        q1 = sketches.quantile(col, 0.25)
+        q3 = sketches.quantile(col, 0.75)
+        iqr = q3 - q1
+
+        ranges[col] = (q1 - k * iqr, q3 + k * iqr)
+
+    return ranges
+
+
 # ---------------------------------------------------
 # NUMERIC RANGE VALIDATION
 # ---------------------------------------------------
@@ -93,13 +112,10 @@ def validate_numeric_ranges(
     total_violations = 0
     details = {}
 
-    for col, (low, high) in ranges.items():
-        if col not in df.columns:
-            continue
-
-        below = (df[col] < low).sum()
-        above = (df[col] > high).sum()
+    cols = [c for c in ranges if c in df.columns]
+    counts = map_columns(count_outside, df, cols, per_column=ranges)
 
+    for col, (below, above) in counts.items():
         violations = below + above
         total_violations += violations
 
@@ -122,3 +138,164 @@ def validate_numeric_ranges(
         "total_violations": total_violations,
         "details": details
     }
+
+
+# ---------------------------------------------------
+# SINGLE-PASS VALIDATION ENGINE
+# ---------------------------------------------------
+
+@dataclass
+class ValidationReport:
+    """
+    Everything validate_frame() learned about a frame. Per-column stats are
+    keyed by column name; `violations` only lists columns with violations.
+    """
+    rows: int = 0
+    missing_columns: list = field(default_factory=list)
+    dtype_errors: dict = field(default_factory=dict)
+    null_counts: dict = field(default_factory=dict)
+    medians: dict = field(default_factory=dict)
+    ranges: dict = field(default_factory=dict)
+    violations: dict = field(default_factory=dict)
+    # (q1, q3) of each column after median imputation, for RemoveOutliersIQR
+    imputed_quartiles: dict = field(default_factory=dict)
+    errors: list = field(default_factory=list)
+
+    @property
+    def valid(self):
+        return not self.errors
+
+    @property
+    def total_violations(self):
+        return sum(v["below"] + v["above"] for v in self.violations.values())
+
+
+def _dtype_matches(dtype, expected: str):
+    if expected == "number":
+        return pd.api.types.is_numeric_dtype(dtype)
+    return str(dtype) == expected
+
+
+def _lerp_quantiles(take, n: np.ndarray, qs):
+    """
+    np.quantile's default (linear) method, per column, for columns whose
+    first n[j] sorted values are read through take(rows) -> values.
+    Index and interpolation arithmetic follow NumPy, so results match it.
+    """
+    qs = np.asarray(qs, dtype=float)[:, None]
+    virtual = n * qs + (1 + qs * -1) - 1
+    prev = np.floor(virtual)
+    gamma = virtual - prev
+    prev = np.clip(prev, 0, n - 1).astype(np.intp)
+    nxt = np.clip(prev + 1, 0, n - 1)
+    a, b = take(prev), take(nxt)
+    diff = b - a
+    return np.where(gamma >= 0.5, b - diff * (1 - gamma), a + diff * gamma)
+
+
+def _profile_block(block: np.ndarray, k: float):
+    """
+    validate_frame() kernel for a 2-D float block (rows x columns): nulls,
+    medians, IQR ranges, violations and the quartiles after median
+    imputation, each computed for every column at once. The block is
+    sorted once along the rows; NaN sorts last, so column j holds its
+    n[j] non-null values first. Results match np.nanmedian / np.nanquantile.
+    """
+    block = np.sort(block, axis=0)
+    rows = len(block)
+    nulls = np.isnan(block).sum(axis=0)
+    n = rows - nulls
+    empty = n == 0
+    n = np.maximum(n, 1)
+
+    def take(idx):
+        return np.take_along_axis(block, idx, axis=0)
+
+    # np.median averages the two middle values
+    mid = np.stack([(n - 1) // 2, n // 2])
+    middle = take(mid)
+    median = (middle[0] + middle[1]) / 2
+    q1, q3 = _lerp_quantiles(take, n, [0.25, 0.75])
+    iqr = q3 - q1
+    low = q1 - k * iqr
+    high = q3 + k * iqr
+    # NaN compares False on both sides
+    below = (block < low).sum(axis=0)
+    above = (block > high).sum(axis=0)
+
+    # Imputed column, sorted: the values below the median, `nulls` copies
+    # of the median, then the rest; read without building it
+    ins = (block < median).sum(axis=0)
+
+    def take_imputed(idx):
+        shifted = take(np.clip(idx - nulls, 0, n - 1))
+        out = np.where(idx < ins + nulls, median, shifted)
+        return np.where(idx < ins, take(np.minimum(idx, n - 1)), out)
+
+    imputed = _lerp_quantiles(take_imputed, np.full_like(n, rows), [0.25, 0.75])
+    imputed = np.where(nulls > 0, imputed, np.stack([q1, q3]))
+
+    median, low, high, imputed = (np.where(empty, np.nan, x) for x in (median, low, high, imputed))
+    return nulls, median, low, high, below, above, imputed
+
+
+def validate_frame(
+    df: pd.DataFrame,
+    required_columns: list = (),
+    numeric_cols: list = None,
+    k: float = 1.5,
+    dtypes: dict = None,
+    min_rows: int = 1,
+    max_allowed_violations: int = 0
+):
+    """
+    Run every check in a single pass over the data: row count, required
+    columns, dtypes ({col: dtype name or "number"}), and per column of
+    `numeric_cols` (default: all numeric columns) null counts, IQR ranges
+    and range violations. Also collects the medians and the
+    post-imputation quartiles that ImputeMedian / RemoveOutliersIQR would
+    compute, so the pipeline can be fitted from the report.
+    Never raises; failed checks are listed in `report.errors`.
+    """
+    report = ValidationReport(rows=len(df))
+
+    if report.rows < min_rows:
+        report.errors.append(f"Row count {report.rows} is less than required minimum {min_rows}")
+
+    report.missing_columns = [c for c in required_columns if c not in df.columns]
+    if report.missing_columns:
+        report.errors.append(f"Missing required columns: {report.missing_columns}")
+
+    for col, expected in (dtypes or {}).items():
+        if col in df.columns and not _dtype_matches(df[col].dtype, expected):
+            report.dtype_errors[col] = (expected, str(df[col].dtype))
+    if report.dtype_errors:
+        report.errors.append(f"Unexpected dtypes (expected, actual): {report.dtype_errors}")
+
+    if numeric_cols is None:
+        numeric_cols = df.select_dtypes(include="number").columns
+    cols = [c for c in numeric_cols if c in df.columns]
+    if not cols or not report.rows:
+        return report
+
+    # One float64 block for all numeric columns, profiled column-wise at once
+    block = df[cols].to_numpy(dtype=np.float64, na_value=np.nan)
+    nulls, medians, low, high, below, above, imputed = _profile_block(block, k)
+    del block
+    for j, col in enumerate(cols):
+        report.null_counts[col] = int(nulls[j])
+        report.medians[col] = float(medians[j])
+        report.ranges[col] = (float(low[j]), float(high[j]))
+        report.imputed_quartiles[col] = (float(imputed[0, j]), float(imputed[1, j]))
+        if below[j] or above[j]:
+            report.violations[col] = {"below": int(below[j]), "above": int(above[j])}
+
+    logger.info(f"Numeric violations: {report.total_violations}")
+    if report.total_violations > max_allowed_violations:
+        report.errors.append(
+            f"Numeric violations exceeded limit: "
+            f"{report.total_violations} > {max_allowed_violations}"
+        )
+        logger.error(report.violations)
+
+    return report